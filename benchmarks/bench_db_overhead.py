@@ -0,0 +1,65 @@
+"""
+bench_db_overhead.py
+
+Misst den Overhead pro Abfrage:
+- Vorher: config.get_db_name(), sqlite3.connect() und close() bei jeder Abfrage.
+- Nachher: database.fetch_query() mit dauerhafter Verbindung pro Thread.
+
+Verwendung:
+    python benchmarks/bench_db_overhead.py [--queries 5000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Eigene temporäre Datenbank verwenden, damit keine Benutzerdaten angefasst werden
+_temp_dir = tempfile.TemporaryDirectory()
+config.DB_FOLDER = _temp_dir.name
+config.CURRENT_PLAYER_NAME = "bench_player"
+
+import database
+
+QUERY = "SELECT last_offset FROM file_positions WHERE file_path = ?"
+
+def fetch_before(query, params):
+    """Bisheriger Ablauf von database.execute_query."""
+    db_path = config.get_db_name()
+    with database.db_lock:
+        conn = sqlite3.connect(db_path, timeout=30)
+        c = conn.cursor()
+        c.execute(query, params)
+        result = None
+        if query.strip().lower().startswith("select"):
+            result = c.fetchall()
+        conn.commit()
+        conn.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=5000, help="Anzahl Abfragen")
+    args = parser.parse_args()
+
+    database.init_db()
+    database.execute_query("INSERT INTO file_positions (file_path, last_offset) VALUES (?, ?)", ("Game.log", 42))
+
+    for name, func in (("before", fetch_before), ("after", database.fetch_query)):
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            func(QUERY, ("Game.log",))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>6}: {elapsed / args.queries * 1e6:8.1f} µs pro Abfrage ({args.queries} Abfragen)")
+
+    database.close_db()
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+bench_dedup.py
+
+Vergleicht die Deduplizierung der kills-Tabelle:
+- Vorher: UNIQUE über sieben Textspalten, INSERT OR IGNORE (Schema-Version 8).
+- Nachher: Dedup-Schlüssel event_hash mit Integer-Index (Migration 9) und
+  log_processor.INSERT_KILL_QUERY.
+
+Gemessen werden das Einfügen neuer Events und das erneute Einfügen derselben Events
+(wie beim Neueinlesen eines Backups) in Blöcken von IMPORT_BATCH_SIZE, danach die
+DB-Größe nach VACUUM und die Größe des Dedup-Index. Zum Schluss wird die alte DB
+migriert und ihre Größe erneut gemessen.
+
+Verwendung:
+    python benchmarks/bench_dedup.py [--events 500000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Eigene temporäre Datenbank verwenden, damit keine Benutzerdaten angefasst werden
+_temp_dir = tempfile.TemporaryDirectory()
+config.DB_FOLDER = _temp_dir.name
+config.CURRENT_PLAYER_NAME = "bench_player"
+
+import database
+import log_processor
+
+# Bisherige INSERT-Anweisung: Duplikate verwirft die UNIQUE-Bedingung
+LEGACY_INSERT_KILL_QUERY = """\
+    INSERT OR IGNORE INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type,
+                                 direction, opponent_name, opponent_category)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def make_rows(count):
+    """Erzeugt Zeilen wie von log_processor.resolve_event_opponents(), inkl. Dedup-Schlüssel."""
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        npc = f"PU_Human_Enemy_GroundCombat_NPC_Grunt_{rng.randrange(10**6)}"
+        event = (
+            f"2025-{1 + i * 12 // count:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 59:02d}.{i % 1000:03d}Z",
+            npc, "bench_player", "OOC_Stanton_1_Hurston",
+            "behr_rifle_ballistic_01", "behr_rifle_ballistic_01", "Bullet"
+        )
+        rows.append(event + ("kill", npc, "npc_ground") + (database.event_hash(*event),))
+    return rows
+
+def insert_rows(query, rows):
+    """Fügt rows in Blöcken von IMPORT_BATCH_SIZE ein, gibt (Sekunden, neu gespeichert) zurück."""
+    inserted = 0
+    start = time.perf_counter()
+    for i in range(0, len(rows), log_processor.IMPORT_BATCH_SIZE):
+        with database.transaction() as cursor:
+            cursor.executemany(query, rows[i:i + log_processor.IMPORT_BATCH_SIZE])
+            inserted += cursor.rowcount
+    return time.perf_counter() - start, inserted
+
+def measure_size(db_path, index_name):
+    """DB-Größe nach VACUUM und Größe des Dedup-Index (ohne dbstat-Unterstützung: None), in MB."""
+    database.close_db()
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    try:
+        index_size = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (index_name,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        index_size = None
+    conn.close()
+    db_size = os.path.getsize(db_path) / 2**20
+    return db_size, index_size / 2**20 if index_size is not None else None
+
+def run(name, query, index_name, rows):
+    """Misst Einfügen, erneutes Einfügen und Größe für die DB des aktuellen Spielers."""
+    first, inserted = insert_rows(query, rows)
+    again, duplicates = insert_rows(query, rows)
+    db_size, index_size = measure_size(config.get_db_name(), index_name)
+    index_text = f"{index_size:7.1f} MB" if index_size is not None else "      n/a"
+    print(f"{name:>6}: neu {len(rows) / first:9,.0f} Events/s ({inserted} gespeichert), "
+          f"erneut {len(rows) / again:9,.0f} Events/s ({duplicates} gespeichert), "
+          f"DB {db_size:7.1f} MB, Dedup-Index {index_text}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=500_000, help="Anzahl Events")
+    args = parser.parse_args()
+
+    rows = make_rows(args.events)
+
+    # Vorher: Migrationen bis einschließlich Version 8
+    config.CURRENT_PLAYER_NAME = "bench_before"
+    migrations = database.MIGRATIONS
+    database.MIGRATIONS = [migration for migration in migrations if migration[0] < 9]
+    try:
+        database.init_db()
+    finally:
+        database.MIGRATIONS = migrations
+    run("before", LEGACY_INSERT_KILL_QUERY, "sqlite_autoindex_kills_1", [row[:10] for row in rows])
+
+    config.CURRENT_PLAYER_NAME = "bench_after"
+    database.init_db()
+    run("after", log_processor.INSERT_KILL_QUERY, "idx_kills_event_hash", rows)
+
+    # Bestehende DB migrieren
+    config.CURRENT_PLAYER_NAME = "bench_before"
+    start = time.perf_counter()
+    database.init_db()
+    elapsed = time.perf_counter() - start
+    db_size, _ = measure_size(config.get_db_name(), "idx_kills_event_hash")
+    print(f"Migration der alten DB: {elapsed:.2f} s, danach DB {db_size:.1f} MB")
+
+    database.close_db()
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
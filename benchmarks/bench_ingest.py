@@ -0,0 +1,145 @@
+"""
+bench_ingest.py
+
+Vergleicht das Speichern eines Event-Blocks:
+- Vorher: Der Ablauf der Ausgangsversion, hier eingefroren: altes Schema mit UNIQUE über
+  sieben Spalten, pro NPC-Feld eines Events Abfrage, INSERT OR IGNORE und anschließende
+  Neukategorisierung, dann execute_many für die Kills und ein separates Offset-Update,
+  jede Anweisung mit eigener Verbindung und eigenem Commit.
+- Nachher: log_processor.commit_ingest_batch() in einer einzigen Transaktion.
+
+Beide Varianten speichern den Block zweimal; der zweite Durchlauf prüft die Deduplizierung.
+
+Verwendung:
+    python benchmarks/bench_ingest.py [--events 5000] [--npcs 500]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Eigene temporäre Datenbank verwenden, damit keine Benutzerdaten angefasst werden
+_temp_dir = tempfile.TemporaryDirectory()
+config.DB_FOLDER = _temp_dir.name
+config.CURRENT_PLAYER_NAME = "bench_player"
+
+import database
+import log_processor
+from benchmarks.legacy_npc_categories import legacy_auto_categorize_npc, legacy_clean_npc_name
+
+def make_events(count, npc_count):
+    """Erzeugt Kill-Events gegen npc_count verschiedene NPCs."""
+    events = []
+    for i in range(count):
+        npc = f"PU_Human_Enemy_GroundCombat_NPC_Grunt{i % npc_count}_{100000 + i}"
+        events.append((
+            f"2025-03-01T12:{i // 3600 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z",
+            npc, "bench_player", "OOC_Stanton_1_Hurston",
+            "behr_rifle_ballistic_01", "behr_rifle_ballistic_01", "Bullet"
+        ))
+    return events
+
+# Schema und Anweisungen der Ausgangsversion
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS kills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        killed_player TEXT,
+        killer TEXT,
+        zone TEXT,
+        weapon TEXT,
+        damage_class TEXT,
+        damage_type TEXT,
+        UNIQUE(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS file_positions (file_path TEXT PRIMARY KEY, last_offset INTEGER)",
+    "CREATE TABLE IF NOT EXISTS npc_categories (npc_name TEXT PRIMARY KEY, category TEXT)",
+]
+LEGACY_INSERT_KILL_QUERY = """\
+    INSERT OR IGNORE INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+LEGACY_NPC_PREFIXES = ("pu_", "vlk_", "kopion_", "quasigrazer_")
+
+def legacy_execute(db_path, query, params=(), many=False):
+    """Wie database.execute_query()/execute_many() der Ausgangsversion: eigene Verbindung je Aufruf."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    c = conn.cursor()
+    if many:
+        c.executemany(query, params)
+    else:
+        c.execute(query, params)
+    result = c.fetchall() if query.strip().lower().startswith("select") else None
+    conn.commit()
+    conn.close()
+    return result
+
+def legacy_save_npc_category(db_path, npc_name):
+    """npc_handler.save_npc_category() der Ausgangsversion, inkl. recategorize_uncategorized()."""
+    cleaned = legacy_clean_npc_name(npc_name)
+    if legacy_execute(db_path, "SELECT category FROM npc_categories WHERE npc_name=?", (cleaned,)):
+        return
+    legacy_execute(db_path, "INSERT OR IGNORE INTO npc_categories (npc_name, category) VALUES (?, ?)",
+                   (cleaned, legacy_auto_categorize_npc(cleaned)))
+    for npc, _ in legacy_execute(
+        db_path, "SELECT npc_name, category FROM npc_categories WHERE category='uncategorized'"
+    ):
+        category = legacy_auto_categorize_npc(npc)
+        if category != "uncategorized":
+            legacy_execute(db_path, "UPDATE npc_categories SET category=? WHERE npc_name=?", (category, npc))
+
+def run_before(events, file_path):
+    """Bisheriger Ablauf der Ausgangsversion mit einzelnen Verbindungen und Commits."""
+    db_path = os.path.join(_temp_dir.name, "bench_before.db")
+    if not os.path.exists(db_path):
+        for statement in LEGACY_SCHEMA:
+            legacy_execute(db_path, statement)
+    for event in events:
+        for val in (event[1], event[2]):
+            val = val.strip().lower()
+            if val.startswith(LEGACY_NPC_PREFIXES):
+                legacy_save_npc_category(db_path, val)
+    legacy_execute(db_path, LEGACY_INSERT_KILL_QUERY, events, many=True)
+    legacy_execute(db_path, "INSERT OR REPLACE INTO file_positions (file_path, last_offset) VALUES (?, ?)",
+                   (file_path, 12345))
+    return db_path
+
+def run_after(events, file_path):
+    """Neuer Ablauf: eine Transaktion für alles."""
+    log_processor.commit_ingest_batch(events, [(file_path, 12345, None)])
+    return config.get_db_name()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000, help="Anzahl Events pro Block")
+    parser.add_argument("--npcs", type=int, default=500, help="Anzahl verschiedener NPCs")
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.npcs)
+    database.init_db()
+    for name, func in (("before", run_before), ("after", run_after)):
+        for run in ("neu", "erneut"):
+            start = time.perf_counter()
+            db_path = func(events, "Game.log")
+            elapsed = time.perf_counter() - start
+            conn = sqlite3.connect(db_path)
+            kills = conn.execute("SELECT COUNT(*) FROM kills").fetchone()[0]
+            npcs = conn.execute("SELECT COUNT(*) FROM npc_categories").fetchone()[0]
+            conn.close()
+            print(f"{name:>6} {run:>6}: {elapsed:7.3f} s, {len(events) / elapsed:10,.0f} events/s "
+                  f"({kills} Kills, {npcs} NPCs)")
+
+    database.close_db()
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+bench_log_parsing.py
+
+Vergleicht den Durchsatz beim Einlesen eines großen Game.log:
+- Vorher: Textmodus, jede Zeile wird mit ACTOR_DEATH_REGEX geprüft.
+- Nachher: Binäre Blöcke, Literal-Vorfilter auf "<Actor Death>", Regex nur auf Kandidaten.
+
+Das Log wird synthetisch erzeugt (ca. 1 von 1000 Zeilen ist ein Kill-Event).
+
+Verwendung:
+    python benchmarks/bench_log_parsing.py [--size-mb 300]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_parser
+
+# Das synthetische Log wird in einem temporären Verzeichnis erzeugt
+_temp_dir = tempfile.TemporaryDirectory()
+
+FILLER_LINES = [
+    "<2025-03-01T12:00:00.123Z> [Notice] <Vehicle Control Flow> CVehicleMovementBase::SetDriver: Local client node [2041] requesting control token for 'ANVL_Hornet_F7A_Mk2_7785431' [7785431] [Team_VehicleFeatures][Vehicle]\n",
+    "<2025-03-01T12:00:00.456Z> [Notice] <CEntityComponentInstancedInterior::OnEntityLeaveZone> [InstancedInterior] OnEntityLeaveZone - InstancedInterior [Hangar_LrgTop_001] [12345] -> Entity [Player] [2041] [Team_CoreGameplayFeatures][Cargo]\n",
+    "<2025-03-01T12:00:01.001Z> [Notice] <Spawn Flow> CSCPlayerPUSpawningComponent::UnregisterFromExternalSystems: Player 'bench_player' [2041] lost reservation for spawnpoint [Team_CoreGameplayFeatures]\n",
+    "<2025-03-01T12:00:01.337Z> [Trace] <AttachmentReceived> Player[bench_player] Attachment[body_01_noMagicPocket_202020, body_01_noMagicPocket, 2020] Status[persistent] Port[Body_ItemPort] Elapsed[0.000000] [Team_CoreGameplayFeatures][Inventory]\n",
+]
+KILL_LINE = (
+    "<2025-03-01T12:{minute:02d}:{second:02d}.000Z> [Notice] <Actor Death> CActor::Kill: 'PU_Human_Enemy_GroundCombat_NPC_Grunt_{npc_id}' [{npc_id}] "
+    "in zone 'OOC_Stanton_1_Hurston' killed by 'bench_player' [2041] using 'behr_rifle_ballistic_01_{npc_id}' [Class behr_rifle_ballistic_01] "
+    "with damage type 'Bullet' from direction x: 0.1, y: 0.2, z: 0.3 [Team_ActorTech][Actor]\n"
+)
+
+def generate_log(path, size_mb):
+    """Schreibt ein synthetisches Log mit mindestens size_mb Megabyte und gibt die Zeilenzahl zurück."""
+    target = size_mb * 1024 * 1024
+    block = []
+    for i in range(1000):
+        if i == 500:
+            block.append(KILL_LINE)
+        else:
+            block.append(FILLER_LINES[i % len(FILLER_LINES)])
+    written = 0
+    lines = 0
+    counter = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        while written < target:
+            counter += 1
+            text = "".join(block).replace(
+                KILL_LINE, KILL_LINE.format(minute=counter % 60, second=counter % 60, npc_id=counter)
+            )
+            f.write(text)
+            written += len(text)
+            lines += len(block)
+    return lines
+
+def run_before(path):
+    """Bisheriger Ansatz: Textmodus und Regex auf jeder Zeile."""
+    matches = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if log_parser.parse_log_line(line.strip()):
+                matches += 1
+    return matches
+
+def run_after(path):
+    """Neuer Ansatz: Binäre Blöcke mit Literal-Vorfilter."""
+    matches = 0
+    for chunk, _ in log_parser.read_complete_chunks(path, 0):
+        for raw_line in log_parser.iter_candidate_lines(chunk):
+            if log_parser.parse_log_line_bytes(raw_line):
+                matches += 1
+    return matches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=300, help="Größe des synthetischen Logs in MB")
+    args = parser.parse_args()
+
+    log_path = os.path.join(_temp_dir.name, "Game.log")
+    print(f"Erzeuge synthetisches Log mit {args.size_mb} MB ...")
+    lines = generate_log(log_path, args.size_mb)
+    print(f"{lines:,} Zeilen, {os.path.getsize(log_path) / 1024 / 1024:.1f} MB")
+
+    results = {}
+    for name, func in (("before", run_before), ("after", run_after)):
+        start = time.perf_counter()
+        matches = func(log_path)
+        elapsed = time.perf_counter() - start
+        results[name] = matches
+        print(f"{name:>6}: {elapsed:7.2f} s, {lines / elapsed:12,.0f} lines/s, {matches:,} Kill-Events")
+
+    if results["before"] != results["after"]:
+        print("WARNUNG: Unterschiedliche Trefferzahl!")
+
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
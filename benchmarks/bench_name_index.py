@@ -0,0 +1,117 @@
+"""
+bench_name_index.py
+
+Vergleicht die Statistik-Abfragen auf einer kills-Tabelle mit 1 Mio. Zeilen:
+- Vorher: Altes Schema, Filter mit LOWER(killer)=? / LOWER(killed_player)=? (Full Table Scan).
+- Nachher: Nach den Migrationen aus database.init_db() über die materialisierten,
+  indizierten Spalten direction/opponent_name/opponent_category.
+
+Für beide Varianten werden der Query-Plan (EXPLAIN QUERY PLAN) und die Laufzeit ausgegeben.
+
+Verwendung:
+    python benchmarks/bench_name_index.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Eigene temporäre Datenbank verwenden, damit keine Benutzerdaten angefasst werden
+_temp_dir = tempfile.TemporaryDirectory()
+config.DB_FOLDER = _temp_dir.name
+config.CURRENT_PLAYER_NAME = "Bench_Player"
+
+import database
+
+LEGACY_SCHEMA = """
+    CREATE TABLE kills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        killed_player TEXT,
+        killer TEXT,
+        zone TEXT,
+        weapon TEXT,
+        damage_class TEXT,
+        damage_type TEXT,
+        UNIQUE(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+    )
+"""
+
+QUERIES_BEFORE = {
+    "kills": ("SELECT COUNT(*) FROM kills WHERE LOWER(killer)=? AND LOWER(killed_player) <> ? AND timestamp >= ?",
+              ("bench_player", "bench_player", "2025-06-01")),
+    "deaths": ("SELECT COUNT(*) FROM kills WHERE LOWER(killed_player)=? AND timestamp >= ?",
+               ("bench_player", "2025-06-01")),
+    "kill_board": ("SELECT killed_player, COUNT(*) AS cnt FROM kills WHERE LOWER(killer)=? AND LOWER(killed_player) <> ? "
+                   "GROUP BY LOWER(killed_player) ORDER BY cnt DESC", ("bench_player", "bench_player")),
+}
+QUERIES_AFTER = {
+    "kills": ("SELECT COUNT(*) FROM kills WHERE direction = 'kill' AND timestamp >= ?", ("2025-06-01",)),
+    "deaths": ("SELECT COUNT(*) FROM kills WHERE direction = 'death' AND timestamp >= ?", ("2025-06-01",)),
+    "kill_board": ("SELECT opponent_name, COUNT(*) AS cnt FROM kills WHERE direction = 'kill' "
+                   "GROUP BY opponent_name COLLATE NOCASE ORDER BY cnt DESC", ()),
+}
+
+def create_legacy_db(db_path, rows):
+    """Legt eine Datenbank im alten Schema mit `rows` Kill-Events an."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.execute(LEGACY_SCHEMA)
+    data = []
+    for i in range(rows):
+        opponent = rng.choice([f"Player{rng.randrange(5000)}", f"PU_Human_Enemy_NPC_Pilot_{rng.randrange(10**6)}"])
+        ts = f"2025-{1 + i * 12 // rows:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 59:02d}.{i % 1000:03d}Z"
+        if rng.random() < 0.9:
+            data.append((ts, opponent, "Bench_Player", "Zone", "Weapon", "Class", "Bullet"))
+        else:
+            data.append((ts, "Bench_Player", opponent, "Zone", "Weapon", "Class", "Bullet"))
+    conn.executemany(
+        "INSERT OR IGNORE INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", data
+    )
+    conn.commit()
+    conn.close()
+
+def run_queries(db_path, queries):
+    """Gibt Plan und Laufzeit aller Abfragen aus."""
+    conn = sqlite3.connect(db_path)
+    for name, (query, params) in queries.items():
+        plan = " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+        start = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<11} {elapsed * 1000:8.1f} ms   {plan}")
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Anzahl Zeilen in der kills-Tabelle")
+    args = parser.parse_args()
+
+    db_path = config.get_db_name()
+    print(f"Erzeuge {args.rows:,} Zeilen im alten Schema ...")
+    create_legacy_db(db_path, args.rows)
+
+    print("Vorher (LOWER(...) ohne Index):")
+    run_queries(db_path, QUERIES_BEFORE)
+
+    start = time.perf_counter()
+    database.init_db()
+    database.close_db()
+    print(f"Migration: {time.perf_counter() - start:.2f} s")
+
+    print("Nachher (materialisierte Spalten mit Index):")
+    run_queries(db_path, QUERIES_AFTER)
+
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
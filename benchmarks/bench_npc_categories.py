@@ -0,0 +1,60 @@
+"""
+bench_npc_categories.py
+
+Vergleicht die automatische NPC-Kategorisierung für viele verschiedene Namen:
+- Vorher: die bisherige if-Kette aus npc_handler.auto_categorize_npc(), pro Name.
+- Regeln: npc_handler.compile_category_rules() ohne Zwischenspeicher.
+- categorize_many: Batch-API mit Zwischenspeicher, einmal für alle Namen und einmal für
+  gleich viele Namen, in denen sich 5000 verschiedene wiederholen (typisch für Kill-Events).
+
+Verwendung:
+    python benchmarks/bench_npc_categories.py [--names 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import npc_handler
+from benchmarks.legacy_npc_categories import legacy_auto_categorize_npc
+
+PARTS = ["pu", "human", "enemy", "npc", "pilot", "gunner", "ground", "soldier", "civilian", "populace",
+         "worker", "vendor", "security", "guard", "pirate", "engineer", "medic", "test", "cheesecake",
+         "hazard", "dungeon", "exec", "archetypes", "criminal", "light", "heavy", "xenothreat", "grunt",
+         "sniper", "militia", "shopkeeper", "farmer", "quasigrazer", "vlk", "hangar", "unknown"]
+
+def make_names(count):
+    """Erzeugt count verschiedene NPC-Namen aus typischen Bausteinen."""
+    rng = random.Random(42)
+    names = set()
+    while len(names) < count:
+        names.add("_".join(rng.choices(PARTS, k=rng.randint(3, 7))))
+    return sorted(names)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000, help="Anzahl verschiedener NPC-Namen")
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    repeated_names = names[:5000] * (len(names) // 5000)
+    npc_handler._categorize_cleaned.cache_clear()
+    runs = (
+        ("before", lambda: [legacy_auto_categorize_npc(name) for name in names]),
+        ("rules", lambda: [npc_handler._match_category(npc_handler.clean_npc_name(name)) for name in names]),
+        ("categorize_many", lambda: npc_handler.categorize_many(names)),
+        ("before (repeated)", lambda: [legacy_auto_categorize_npc(name) for name in repeated_names]),
+        ("categorize_many (repeated)", lambda: npc_handler.categorize_many(repeated_names)),
+    )
+    for name, func in runs:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>26}: {elapsed * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
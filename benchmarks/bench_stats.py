@@ -0,0 +1,104 @@
+"""
+bench_stats.py
+
+Vergleicht die Berechnung der Kill/Death-Zahlen pro Gegnerkategorie:
+- Vorher: Fünf Abfragen, alle Gegnernamen werden nach Python geladen und einzeln eingeordnet.
+- Zeilen: stats._get_category_counts() mit einer aggregierten Abfrage über die beim Import
+  materialisierten Spalten direction/opponent_category.
+- Tagessummen: dieselbe Zählung über daily_category_counts (eine Zeile pro Tag und Kategorie),
+  dazu das Kill-Leaderboard aus den kills-Zeilen und aus daily_opponent_counts.
+
+Verwendung:
+    python benchmarks/bench_stats.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Eigene temporäre Datenbank verwenden, damit keine Benutzerdaten angefasst werden
+_temp_dir = tempfile.TemporaryDirectory()
+config.DB_FOLDER = _temp_dir.name
+config.CURRENT_PLAYER_NAME = "Bench_Player"
+
+import database
+import log_processor
+import npc_handler
+import stats
+
+def fill_db(rows):
+    """Schreibt `rows` Events (90 % Kills, 10 % Deaths) gegen Spieler und NPCs."""
+    rng = random.Random(42)
+    data = []
+    for i in range(rows):
+        opponent = rng.choice([f"Player{rng.randrange(5000)}", f"PU_Human_Enemy_NPC_Pilot_{i}", f"vlk_juvenile_{i}"])
+        ts = f"2025-{1 + i * 12 // rows:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 59:02d}.{i % 1000:03d}Z"
+        if rng.random() < 0.9:
+            data.append((ts, opponent, "Bench_Player", "Zone", "Weapon", "Class", "Bullet"))
+        else:
+            data.append((ts, "Bench_Player", opponent, "Zone", "Weapon", "Class", "Bullet"))
+    log_processor.commit_ingest_batch(data, [])
+
+def run_before(player_lower):
+    """Bisheriger Ablauf aus stats.get_stats() (ohne Datumsfilter)."""
+    params = (player_lower, player_lower)
+    database.fetch_query("SELECT COUNT(*) FROM kills WHERE LOWER(killer)=? AND LOWER(killed_player) <> ?", params)
+    database.fetch_query("SELECT COUNT(*) FROM kills WHERE LOWER(killed_player)=?", (player_lower,))
+    database.fetch_query("SELECT COUNT(*) FROM kills WHERE LOWER(killer)=? AND LOWER(killed_player)=?", params)
+    kills_detail = database.fetch_query("SELECT killed_player FROM kills WHERE LOWER(killer)=? AND LOWER(killed_player) <> ?", params)
+    deaths_detail = database.fetch_query("SELECT killer FROM kills WHERE LOWER(killed_player)=? AND LOWER(killer) <> ?", params)
+    npc_dict = npc_handler.load_all_npc_categories()
+    counts = {}
+    for (name,) in kills_detail + deaths_detail:
+        cleaned = npc_handler.clean_npc_name(name)
+        if cleaned.startswith(("vlk_", "kopion_", "quasigrazer_")):
+            category = "npc_animal"
+        elif cleaned.startswith("pu_"):
+            category = f"npc_{npc_dict.get(cleaned, 'uncategorized')}"
+        else:
+            category = "players"
+        counts[category] = counts.get(category, 0) + 1
+    return counts
+
+def run_rows(player_lower):
+    """Eine Abfrage über alle kills-Zeilen, nur Summen pro Kategorie."""
+    return stats._get_category_counts("", [], from_rollup=False)
+
+def run_rollup(player_lower):
+    """Eine Abfrage über die Tagessummen."""
+    return stats._get_category_counts("", [])
+
+def run_leaderboard_rows(player_lower):
+    return stats._get_leaderboard("kill", "", "", [], from_rollup=False)
+
+def run_leaderboard_rollup(player_lower):
+    return stats._get_leaderboard("kill", "", "", [])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Anzahl Zeilen in der kills-Tabelle")
+    args = parser.parse_args()
+
+    database.init_db()
+    print(f"Erzeuge {args.rows:,} Events ...")
+    fill_db(args.rows)
+
+    for name, func in (("before", run_before), ("rows", run_rows), ("rollup", run_rollup),
+                       ("leaderboard rows", run_leaderboard_rows), ("leaderboard rollup", run_leaderboard_rollup)):
+        start = time.perf_counter()
+        func("bench_player")
+        elapsed = time.perf_counter() - start
+        print(f"{name:>18}: {elapsed * 1000:8.1f} ms")
+
+    database.close_db()
+    _temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
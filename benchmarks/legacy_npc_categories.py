@@ -0,0 +1,85 @@
+"""
+legacy_npc_categories.py
+
+Eingefrorene NPC-Kategorisierung der Ausgangsversion (npc_handler.clean_npc_name() und die
+if-Kette aus npc_handler.auto_categorize_npc()). Referenz für bench_npc_categories.py,
+bench_ingest.py und tests/test_npc_handler.py; wird nicht mehr geändert.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger("npc_handler")
+
+def legacy_clean_npc_name(npc_name):
+    """Bisherige npc_handler.clean_npc_name()."""
+    return re.sub(r'_\d+$', '', npc_name.strip().lower())
+
+def legacy_auto_categorize_npc(npc_name):
+    """Bisherige if-Kette aus npc_handler.auto_categorize_npc()."""
+    name = legacy_clean_npc_name(npc_name).lower()
+    
+    # Spezielle Regel für ARGO_ATLS_GEO - als "unknown" kategorisieren
+    if "argo_atls_geo" in name:
+        logger.debug(f"NPC {npc_name} als 'unknown' kategorisiert (ARGO_ATLS_GEO)")
+        return "unknown"
+    
+    # Erweiterte Kategorisierung: Alle Namen mit "hangar" und "unknown" als "unknown" klassifizieren
+    if "hangar" in name.lower() and "unknown" in name.lower():
+        logger.debug(f"NPC {npc_name} als 'unknown' kategorisiert (enthält 'hangar' und 'unknown')")
+        return "unknown"
+    
+    # Tierkategorisierung basierend auf Präfixen
+    if any(name.startswith(prefix) for prefix in ["vlk_", "kopion_", "quasigrazer_"]):
+        return "animal"
+        
+    # NPC_Archetypes-Kategorisierung - diese sollten NIEMALS als Spieler klassifiziert werden
+    if "npc_archetypes" in name:
+        if "soldier" in name or "juggernaut" in name:
+            return "ground"
+        elif "pilot" in name:
+            return "pilot"
+        elif "techie" in name or "technical" in name:
+            return "technical"
+        elif "prisoner" in name or "civilian" in name:
+            return "civilian"
+        else:
+            # Allgemeine NPC_Archetypes als Grundeinheit einstufen
+            return "ground"
+    
+    # Hazard-Dungeon-NPCs erkennen (außer den speziell behandelten Fall)
+    if "hazard" in name and "dungeon" in name:
+        if "exec" in name:
+            return "ground"  # Executive NPCs in Hazard-Dungeons
+        elif "medic" in name or "med" in name:
+            return "technical"  # Medics in Hazard-Dungeons
+        else:
+            return "ground"  # Standard-Einstufung für Hazard-Dungeon-NPCs
+    
+    if "pilot" in name:
+        return "pilot"
+    if "gunner" in name:
+        return "gunner"
+    if any(k in name for k in ["ground", "soldier", "cqc", "juggernaut", "sniper",
+                               "gangster", "grunt", "kareah", "militia", "superboss",
+                               "exec", "executive"]):
+        return "ground"
+    if "civilian" in name or ("populace" in name and "worker" not in name):
+        return "civilian"
+    if any(k in name for k in ["worker", "shopkeeper", "vendor", "gardener", "farmer"]):
+        return "worker"
+    if any(k in name for k in ["law", "security", "guard"]):
+        return "lawenforcement"
+    if "pirate" in name:
+        return "pirate"
+    if any(k in name for k in ["engineer", "technical", "techie", "medic"]):
+        return "technical"
+    if "test" in name:
+        return "test"
+    # Allgemeine Cheesecake-Archetypes als Grundeinheit einstufen
+    if "cheesecake" in name:
+        return "ground"
+    # Wenn 'hazard' im Namen ist, aber nicht genauer kategorisiert werden kann
+    if "hazard" in name:
+        return "ground"
+    return "uncategorized"
@@ -34,10 +34,13 @@ CONFIG_FILE = os.path.join(APP_DATA_PATH, "config.txt")
 # Folder where DB files are stored (im Benutzerverzeichnis)
 DB_FOLDER = os.path.join(APP_DATA_PATH, "databases")
 
+# Regeln für die automatische NPC-Kategorisierung (wird bei Änderungen neu geladen)
+NPC_RULES_FILE = os.path.join(APP_DATA_PATH, "npc_rules.json")
+
 # Verschoben in eine Funktion, um PyArmor-Kompatibilität zu verbessern
 def ensure_directories_exist():
     # Globale Variablen MÜSSEN vor ihrer Verwendung deklariert werden
-    global APP_DATA_PATH, LOG_FOLDER, ERROR_LOG_FOLDER, GENERAL_LOG_FOLDER, DEBUG_LOG_FOLDER, CONFIG_FILE, DB_FOLDER
+    global APP_DATA_PATH, LOG_FOLDER, ERROR_LOG_FOLDER, GENERAL_LOG_FOLDER, DEBUG_LOG_FOLDER, CONFIG_FILE, DB_FOLDER, NPC_RULES_FILE
     
     try:
         os.makedirs(APP_DATA_PATH, exist_ok=True)
@@ -58,6 +61,7 @@ def ensure_directories_exist():
         DEBUG_LOG_FOLDER = os.path.join(LOG_FOLDER, "debug")
         CONFIG_FILE = os.path.join(APP_DATA_PATH, "config.txt")
         DB_FOLDER = os.path.join(APP_DATA_PATH, "databases")
+        NPC_RULES_FILE = os.path.join(APP_DATA_PATH, "npc_rules.json")
         
         # Versuche, die temporären Verzeichnisse zu erstellen
         os.makedirs(APP_DATA_PATH, exist_ok=True)
@@ -71,6 +75,9 @@ CURRENT_PLAYER_NAME = ""
 LOGGING_ENABLED = True  # Standardmäßig ist Logging aktiviert
 LOGGING_LEVEL = "INFO"  # Standardmäßig auf INFO-Level
 REFRESH_INTERVAL = 30   # Standardmäßig 30 Sekunden
+POLLING_REFRESH = False # Zeitgesteuerter Refresh zusätzlich zur Aktualisierung bei neuen Events
+INGEST_DEBOUNCE_MS = 250  # Wartezeit nach einer Änderung an Game.log, bevor sie eingelesen wird
+IMPORT_WORKERS = 0      # Prozesse für den Backup-Log-Import (0 = ein Prozess pro CPU-Kern, 1 = seriell)
 
 # NPC-Typen für Filter
 NPC_CATEGORIES = [
@@ -80,7 +87,7 @@ NPC_CATEGORIES = [
 
 def load_config():
     """Loads the configuration file and sets global variables."""
-    global CURRENT_PLAYER_NAME, LOGGING_ENABLED, LOGGING_LEVEL, REFRESH_INTERVAL, LIVE_FOLDER, BACKUP_FOLDER
+    global CURRENT_PLAYER_NAME, LOGGING_ENABLED, LOGGING_LEVEL, REFRESH_INTERVAL, POLLING_REFRESH, INGEST_DEBOUNCE_MS, IMPORT_WORKERS, LIVE_FOLDER, BACKUP_FOLDER
     
     # Stelle zuerst sicher, dass die benötigten Verzeichnisse existieren
     ensure_directories_exist()
@@ -102,6 +109,22 @@ def load_config():
                     except ValueError:
                         # Bei Fehler Standard verwenden
                         pass
+                elif line.startswith("POLLING_REFRESH="):
+                    POLLING_REFRESH = line.split("=")[1].lower() == "true"
+                elif line.startswith("INGEST_DEBOUNCE_MS="):
+                    try:
+                        debounce = int(line.split("=")[1])
+                        INGEST_DEBOUNCE_MS = max(0, min(debounce, 10000))  # Begrenze auf sinnvolle Werte
+                    except ValueError:
+                        # Bei Fehler Standard verwenden
+                        pass
+                elif line.startswith("IMPORT_WORKERS="):
+                    try:
+                        workers = int(line.split("=")[1])
+                        IMPORT_WORKERS = max(0, min(workers, 64))  # Begrenze auf sinnvolle Werte
+                    except ValueError:
+                        # Bei Fehler Standard verwenden
+                        pass
                 elif line.startswith("SC_PATH="):
                     sc_path = line.split("=")[1]
                     if os.path.exists(sc_path):
@@ -133,6 +156,15 @@ def save_config():
         
         f.write("# Automatische Aktualisierungsintervall in Sekunden\n")
         f.write(f"REFRESH_INTERVAL={REFRESH_INTERVAL}\n\n")
+
+        f.write("# Zusätzlich im Intervall aktualisieren, nicht nur bei neuen Events (true/false)\n")
+        f.write(f"POLLING_REFRESH={'true' if POLLING_REFRESH else 'false'}\n\n")
+
+        f.write("# Wartezeit in Millisekunden nach einer Änderung an Game.log, bevor sie eingelesen wird\n")
+        f.write(f"INGEST_DEBOUNCE_MS={INGEST_DEBOUNCE_MS}\n\n")
+
+        f.write("# Anzahl Prozesse für den Import der Backup-Logs (0 = automatisch, 1 = seriell)\n")
+        f.write(f"IMPORT_WORKERS={IMPORT_WORKERS}\n\n")
         
         f.write("# Star Citizen Installationspfad\n")
         f.write(f"SC_PATH={LIVE_FOLDER}\n")
@@ -1,16 +1,43 @@
 import sqlite3
 import config
 import os
+import hashlib
 import threading
-import time
 import logging
+from contextlib import contextmanager
+from functools import lru_cache
 
 # Logger für diese Datei einrichten
 logger = logging.getLogger(__name__)
 
-# Global lock for thread-safe DB operations
+# Global lock for DB write operations. The database runs in WAL mode, so there is
+# exactly one writer at a time while reading queries run without any lock.
 db_lock = threading.Lock()
 
+# Dauerhafte Verbindungen: jeder Thread hält eine eigene Verbindung zur aktuellen DB-Datei.
+# _open_connections ordnet jedem Thread seine Verbindung zu, damit close_db() alle schließen
+# und Verbindungen beendeter Threads aufgeräumt werden können.
+_local = threading.local()
+_open_connections = {}
+_connections_lock = threading.Lock()
+_connection_generation = 0
+
+# Zwischengespeicherter DB-Pfad, damit config.get_db_name() (inkl. os.makedirs)
+# nur bei einem Wechsel von Spieler oder DB-Ordner aufgerufen wird
+_db_path_cache = (None, None)
+
+# Größe des Statement-Caches pro Verbindung (vorbereitete SQL-Anweisungen)
+STATEMENT_CACHE_SIZE = 256
+
+# Zeilen pro Transaktion, wenn eine Migration große Tabellen umschreibt
+MIGRATION_BATCH_SIZE = 50000
+
+# DB-Dateien, deren Schema in diesem Prozess bereits als aktuell geprüft wurde
+_initialized_paths = set()
+
+# Datenstand: wird nach jedem erfolgreichen Schreib-Commit erhöht (siehe get_data_version())
+_data_version = 0
+
 class DatabaseError(Exception):
     """Basisklasse für Datenbankfehler"""
     pass
@@ -23,9 +50,489 @@ class DatabaseAccessError(DatabaseError):
     """Wird ausgelöst bei allgemeinen Fehlern beim Datenbankzugriff"""
     pass
 
-def init_db():
+def get_db_path():
+    """
+    Returns the database file path for the current player (or None).
+    The path is cached per (DB_FOLDER, CURRENT_PLAYER_NAME).
+    """
+    global _db_path_cache
+    key = (config.DB_FOLDER, config.CURRENT_PLAYER_NAME)
+    cached_key, cached_path = _db_path_cache
+    if cached_key == key:
+        return cached_path
+    db_path = config.get_db_name()
+    _db_path_cache = (key, db_path)
+    return db_path
+
+def _close_dead_connections():
+    """Schließt Verbindungen von Threads, die nicht mehr laufen. Aufruf nur mit _connections_lock."""
+    for thread in [t for t in _open_connections if not t.is_alive()]:
+        try:
+            _open_connections.pop(thread).close()
+        except sqlite3.Error:
+            pass
+
+def _get_connection(action):
+    """
+    Returns the persistent connection of the current thread for the current player's DB.
+    A new connection is opened on first use, after a player/DB change, after close_db()
+    or in a forked child process.
+
+    Raises:
+        NoPlayerConfiguredError: Wenn kein Spieler konfiguriert ist
+        sqlite3.Error: Wenn die Verbindung nicht geöffnet werden kann
+    """
+    db_path = get_db_path()
+    if not db_path:
+        raise NoPlayerConfiguredError(f"No player name set. Cannot {action}.")
+
+    conn = getattr(_local, "conn", None)
+    if (conn is not None and _local.db_path == db_path
+            and _local.generation == _connection_generation and _local.pid == os.getpid()):
+        return conn
+
+    if conn is not None and _local.pid == os.getpid():
+        with _connections_lock:
+            _open_connections.pop(threading.current_thread(), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # check_same_thread=False, damit close_db() die Verbindungen aller Threads schließen kann.
+    # Benutzt wird jede Verbindung trotzdem nur von ihrem eigenen Thread.
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    # WAL: Leser sehen einen konsistenten Stand und werden vom Schreiber nicht blockiert.
+    # synchronous=NORMAL ist im WAL-Modus konsistent und spart ein fsync pro Commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _connections_lock:
+        _close_dead_connections()
+        _open_connections[threading.current_thread()] = conn
+    _local.conn = conn
+    _local.db_path = db_path
+    _local.generation = _connection_generation
+    _local.pid = os.getpid()
+    return conn
+
+def _rollback_quietly(conn):
+    """Setzt eine angefangene Transaktion zurück, damit die Verbindung weiterverwendet werden kann."""
+    try:
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        pass
+
+def _bump_data_version():
+    """Markiert einen neuen Datenstand. Aufruf nach jedem Schreib-Commit, mit db_lock."""
+    global _data_version
+    _data_version += 1
+
+def get_data_version():
+    """
+    Returns a counter that changes whenever a write to the database was committed
+    in this process. Results computed for the same value are still current.
+    """
+    return _data_version
+
+def get_db_key():
+    """
+    Returns (db_path, connection generation) of the current player's DB. close_db() starts a
+    new generation, since the DB files may be deleted or replaced afterwards: per-DB state
+    of other modules (e.g. the backup manifest) is therefore kept per key, not per path.
+    """
+    return get_db_path(), _connection_generation
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _is_select(query):
+    """Prüft (zwischengespeichert), ob eine Abfrage ein SELECT ist."""
+    return query.strip().lower().startswith("select")
+
+def _log_migration_progress(description, done, total):
+    """Standard-Fortschrittsanzeige für Migrationen: schreibt den Fortschritt ins Log."""
+    percent = done * 100 // total if total else 100
+    logger.info(f"Migration '{description}': {done}/{total} ({percent}%)")
+
+def migrate_in_batches(conn, query, description, progress=None, table="kills", batch_size=None):
+    """
+    Runs an UPDATE/INSERT ... SELECT query over a large table in id ranges, so a migration
+    never holds the write lock for the whole table and can report its progress.
+    The query must restrict itself with "id > :start AND id <= :end" and be idempotent,
+    because an interrupted migration starts again from the beginning.
+    Commits after every batch and reports progress as progress(description, done, total).
+    """
+    progress = progress or _log_migration_progress
+    batch_size = batch_size or MIGRATION_BATCH_SIZE
+    max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    for start in range(0, max_id, batch_size):
+        end = min(start + batch_size, max_id)
+        conn.execute(query, {"start": start, "end": end})
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        progress(description, end, max_id)
+
+def _migrate_base_tables(conn, progress):
+    """Migration 1: Grundtabellen in ihrer ursprünglichen Form (bestehende DBs haben sie bereits)."""
+    # Kills table with UNIQUE constraint to prevent duplicate kill events across log files
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS kills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            killed_player TEXT,
+            killer TEXT,
+            zone TEXT,
+            weapon TEXT,
+            damage_class TEXT,
+            damage_type TEXT,
+            UNIQUE(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+        )
+    """)
+
+    # File positions table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS file_positions (
+            file_path TEXT PRIMARY KEY,
+            last_offset INTEGER
+        )
+    """)
+
+    # NPC categories table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS npc_categories (
+            npc_name TEXT PRIMARY KEY,
+            category TEXT
+        )
+    """)
+
+def _migrate_opponent_columns(conn, progress):
+    """
+    Migration 2: Materialisierte Gegnerspalten der kills-Tabelle aus Sicht des Spielers
+    (direction, opponent_name, opponent_category), siehe npc_handler.resolve_opponent().
+    Die Werte werden beim Import berechnet; hier werden vorhandene Zeilen in Blöcken nachgetragen.
+    Sie ersetzen indizierte Kleinschreibungs-Spalten des Spielernamens (killer_lower,
+    killed_player_lower): Statistik und Leaderboards filtern nur noch über direction.
+    """
+    import npc_handler  # Lokal importiert, da npc_handler selbst database importiert
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(kills)")}
+    for column in ("direction", "opponent_name", "opponent_category"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE kills ADD COLUMN {column} TEXT")
+
+    player_lower = (config.CURRENT_PLAYER_NAME or "").lower()
+    npc_categories = dict(conn.execute("SELECT npc_name, category FROM npc_categories"))
+
+    @lru_cache(maxsize=4096)
+    def resolve(killer, killed_player):
+        return npc_handler.resolve_opponent(killer, killed_player, player_lower, npc_categories)
+
+    conn.create_function("resolve_opponent", 3, lambda killer, killed_player, index: resolve(killer, killed_player)[index],
+                         deterministic=True)
+    migrate_in_batches(conn, """
+        UPDATE kills SET direction = resolve_opponent(killer, killed_player, 0),
+                         opponent_name = resolve_opponent(killer, killed_player, 1),
+                         opponent_category = resolve_opponent(killer, killed_player, 2)
+        WHERE id > :start AND id <= :end
+    """, "Gegnerspalten", progress)
+
+    # Statistik: Zählung nach Richtung und Kategorie; Leaderboards: Gruppierung nach Gegnername
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kills_direction_category ON kills(direction, opponent_category, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kills_direction_opponent "
+                 "ON kills(direction, opponent_name COLLATE NOCASE, opponent_category, timestamp)")
+
+# Vorverdichtete Zählerstände pro Tag: Tabelle -> Schlüsselspalten. Selbstmorde haben weder
+# Gegnername noch Kategorie, dafür steht in beiden Spalten ein Leerstring.
+ROLLUP_TABLES = {
+    "daily_category_counts": ("direction", "opponent_category"),
+    "daily_opponent_counts": ("direction", "opponent_name", "opponent_category"),
+}
+
+def _rollup_key(row, columns):
+    """SQL-Ausdrücke für den Rollup-Schlüssel (day, *columns) der kills-Zeile row (NEW/OLD/kills)."""
+    values = [f"substr({row}.timestamp, 1, 10)"]
+    for column in columns:
+        values.append(f"{row}.{column}" if column == "direction" else f"COALESCE({row}.{column}, '')")
+    return ", ".join(values)
+
+def _rollup_trigger_body(row, delta):
+    """Trigger-Anweisungen, die eine kills-Zeile in allen Rollup-Tabellen zählen (+1) oder austragen (-1)."""
+    statements = []
+    for table, columns in ROLLUP_TABLES.items():
+        key_columns = ", ".join(("day",) + columns)
+        key = _rollup_key(row, columns)
+        if delta > 0:
+            statements.append(f"""
+                INSERT INTO {table} ({key_columns}, kill_count) VALUES ({key}, 1)
+                ON CONFLICT ({key_columns}) DO UPDATE SET kill_count = kill_count + 1;""")
+        else:
+            statements.append(f"""
+                UPDATE {table} SET kill_count = kill_count - 1 WHERE ({key_columns}) = ({key});
+                DELETE FROM {table} WHERE ({key_columns}) = ({key}) AND kill_count <= 0;""")
+    return "".join(statements)
+
+def _migrate_kill_rollups(conn, progress):
+    """
+    Migration 3: Tagesweise vorverdichtete Zählerstände der kills-Tabelle (ROLLUP_TABLES):
+    daily_category_counts für get_stats(), daily_opponent_counts für get_leaderboards().
+    Triggers on kills keep both tables current for every insert, category update and delete,
+    so the stats queries read one row per day instead of one per event.
+    Vorhandene Zeilen werden in Blöcken eingerechnet.
+    """
+    for table, columns in ROLLUP_TABLES.items():
+        # opponent_name vergleicht ohne Groß-/Kleinschreibung, wie die Gruppierung der Leaderboards
+        column_defs = "".join(
+            f"{column} TEXT NOT NULL{' COLLATE NOCASE' if column == 'opponent_name' else ''},\n"
+            for column in columns
+        )
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                day TEXT NOT NULL,
+                {column_defs}
+                kill_count INTEGER NOT NULL,
+                PRIMARY KEY (day, {", ".join(columns)})
+            ) WITHOUT ROWID
+        """)
+        # Ein abgebrochener Durchlauf beginnt von vorn, bereits eingerechnete Blöcke verwerfen
+        conn.execute(f"DELETE FROM {table}")
+
+    # Leaderboards gruppieren nach Gegnername und lesen nur aus dem Index
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_opponent_counts_direction "
+                 "ON daily_opponent_counts(direction, opponent_name, opponent_category, day, kill_count)")
+
+    # Die Trigger existieren schon während des Nachtragens: neue Zeilen liegen hinter der
+    # höchsten id, die migrate_in_batches() beim Start ermittelt, und werden so nur einmal gezählt
+    changed_columns = "timestamp, direction, opponent_name, opponent_category"
+    for name, event, row, delta in (
+        ("kills_rollup_insert", "INSERT", "NEW", 1),
+        ("kills_rollup_delete", "DELETE", "OLD", -1),
+        ("kills_rollup_update_old", f"UPDATE OF {changed_columns}", "OLD", -1),
+        ("kills_rollup_update_new", f"UPDATE OF {changed_columns}", "NEW", 1),
+    ):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON kills
+            WHEN {row}.direction IS NOT NULL
+            BEGIN {_rollup_trigger_body(row, delta)}
+            END
+        """)
+
+    for table, columns in ROLLUP_TABLES.items():
+        # Schreibvarianten eines Gegnernamens fasst der NOCASE-Primärschlüssel per ON CONFLICT zusammen
+        key_columns = ", ".join(("day",) + columns)
+        group_by = ", ".join(str(n) for n in range(1, len(columns) + 2))
+        migrate_in_batches(conn, f"""
+            INSERT INTO {table} ({key_columns}, kill_count)
+            SELECT {_rollup_key("kills", columns)}, COUNT(*)
+            FROM kills
+            WHERE direction IS NOT NULL AND id > :start AND id <= :end
+            GROUP BY {group_by}
+            ON CONFLICT ({key_columns}) DO UPDATE SET kill_count = kill_count + excluded.kill_count
+        """, f"Tagessummen ({table})", progress)
+
+def _migrate_npc_categories(conn, progress):
+    """
+    Migration 4: Einmaliges Nachtragen fehlender NPC-Kategorien. Frühere Versionen haben
+    NPCs erst beim Erstellen der Leaderboards kategorisiert, inzwischen geschieht das beim
+    Import. Reads the opponent names from the rollup tables of migration 3.
+    """
+    import npc_handler  # Lokal importiert, da npc_handler selbst database importiert
+
+    count = npc_handler.backfill_npc_categories(conn.cursor())
+    progress("NPC-Kategorien", count, count)
+
+def _migrate_recent_events_index(conn, progress):
+    """
+    Migration 5: Index für die Recent Events (stats.get_recent_events()). Der Index über
+    timestamp enthält die id als letzte Spalte, damit wird eine Seite in Reihenfolge
+    (timestamp, id) direkt aus dem Index gelesen, ohne die Treffer zu sortieren.
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kills_timestamp ON kills(timestamp)")
+
+def _migrate_file_fingerprints(conn, progress):
+    """
+    Migration 6: Fingerprint des bereits gelesenen Dateianfangs je Log-Datei
+    (siehe log_parser.file_fingerprint()), damit ein rotiertes Game.log erkannt wird.
+    Vorhandene Positionen erhalten ihn beim nächsten Einlesen.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(file_positions)")}
+    if "fingerprint" not in columns:
+        conn.execute("ALTER TABLE file_positions ADD COLUMN fingerprint TEXT")
+
+def _migrate_backup_manifest(conn, progress):
+    """
+    Migration 7: Manifest der Backup-Logs (siehe log_processor.parse_all_backup_logs()).
+    Vollständig gelesene Backups mit unveränderter Größe und mtime werden nicht mehr geöffnet.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backup_manifest (
+            file_path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            file_mtime_ns INTEGER NOT NULL,
+            fingerprint TEXT,
+            completed INTEGER NOT NULL
+        )
+    """)
+
+def _migrate_retired_positions(conn, progress):
+    """
+    Migration 8: Letzte Positionen ersetzter Log-Dateien (siehe log_processor.retire_position()).
+    Taucht die Datei später als Backup wieder auf, wird ab dieser Position weitergelesen.
+    claimed = 1 markiert Positionen, die ein Backup schon vom Live-Log übernommen hat.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS retired_positions (
+            fingerprint TEXT NOT NULL,
+            last_offset INTEGER NOT NULL,
+            claimed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (fingerprint, last_offset)
+        )
+    """)
+
+def event_hash(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type):
+    """
+    Compact dedup key of a kill event: signed 64-bit BLAKE2b hash of the seven event fields,
+    stored in kills.event_hash (migration 9). Equal events always get the same key; the
+    importer compares the fields themselves for rows with the same key, so a collision
+    never drops an event (see log_processor.INSERT_KILL_QUERY).
+    """
+    fields = (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+    data = "\x1f".join("" if value is None else str(value) for value in fields).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big", signed=True)
+
+# Gespeicherte Spalten der kills-Tabelle
+KILL_COLUMNS = ("id, timestamp, killed_player, killer, zone, weapon, damage_class, damage_type, "
+                "direction, opponent_name, opponent_category")
+
+def _migrate_event_hash(conn, progress):
+    """
+    Migration 9: Kompakter Dedup-Schlüssel event_hash (siehe event_hash()) mit eigenem
+    Integer-Index statt UNIQUE über sieben Textspalten, dessen Index etwa so groß war wie
+    die Tabelle selbst. SQLite kann eine UNIQUE-Bedingung nicht entfernen, daher wird die
+    Tabelle neu aufgebaut: Zeilen werden in Blöcken (mit id) kopiert, danach werden die
+    Tabellen getauscht und Indizes und Trigger der alten Tabelle neu angelegt. Die Tagessummen
+    bleiben unverändert, da dieselben Zeilen erhalten bleiben.
+    """
+    conn.create_function("event_hash", 7, event_hash, deterministic=True)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS kills_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            killed_player TEXT,
+            killer TEXT,
+            zone TEXT,
+            weapon TEXT,
+            damage_class TEXT,
+            damage_type TEXT,
+            direction TEXT,
+            opponent_name TEXT,
+            opponent_category TEXT,
+            event_hash INTEGER
+        )
+    """)
+    # Ein abgebrochener Durchlauf beginnt von vorn, bereits kopierte ids werden übersprungen
+    copy_query = f"""
+        INSERT OR IGNORE INTO kills_new ({KILL_COLUMNS}, event_hash)
+        SELECT {KILL_COLUMNS}, event_hash(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+        FROM kills
+        WHERE id > :start AND id <= :end
+    """
+    migrate_in_batches(conn, copy_query, "Dedup-Schlüssel", progress)
+    # Zwischen zwei Blöcken können andere Prozesse Zeilen angefügt haben
+    conn.execute(copy_query, {
+        "start": conn.execute("SELECT COALESCE(MAX(id), 0) FROM kills_new").fetchone()[0],
+        "end": conn.execute("SELECT COALESCE(MAX(id), 0) FROM kills").fetchone()[0],
+    })
+
+    # Indizes und Trigger übernehmen; der automatische Index der UNIQUE-Bedingung hat kein SQL
+    schema = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = 'kills' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    )]
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'kills'").fetchone()
+    conn.execute("DROP TABLE kills")
+    conn.execute("ALTER TABLE kills_new RENAME TO kills")
+    for sql in schema:
+        conn.execute(sql)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kills_event_hash ON kills(event_hash)")
+    if sequence:
+        # ids gelöschter Zeilen am Ende werden wie bisher nicht wiederverwendet
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'kills'", sequence)
+
+def _migrate_normalized_log_paths(conn, progress):
+    """
+    Migration 10: Dateipositionen und Backup-Manifest unter dem normalisierten Pfad
+    (log_parser.normalize_log_path()). Verschieden geschriebene Pfade derselben Datei werden
+    zusammengefasst, von den Positionen bleibt die mit dem größten Offset.
+    """
+    from log_parser import normalize_log_path
+
+    rows = conn.execute("SELECT file_path, last_offset, fingerprint FROM file_positions ORDER BY last_offset").fetchall()
+    positions = {normalize_log_path(path): (offset, fingerprint) for path, offset, fingerprint in rows}
+    conn.execute("DELETE FROM file_positions")
+    conn.executemany(
+        "INSERT INTO file_positions (file_path, last_offset, fingerprint) VALUES (?, ?, ?)",
+        [(path, offset, fingerprint) for path, (offset, fingerprint) in positions.items()]
+    )
+
+    rows = conn.execute("SELECT file_path, file_size, file_mtime_ns, fingerprint, completed FROM backup_manifest").fetchall()
+    manifest = {normalize_log_path(row[0]): row[1:] for row in rows}
+    conn.execute("DELETE FROM backup_manifest")
+    conn.executemany(
+        "INSERT INTO backup_manifest (file_path, file_size, file_mtime_ns, fingerprint, completed) VALUES (?, ?, ?, ?, ?)",
+        [(path,) + values for path, values in manifest.items()]
+    )
+
+# Geordnete Liste aller Schema-Migrationen: (Version, Beschreibung, Funktion).
+# Jede Migration läuft genau einmal pro DB-Datei, danach wird PRAGMA user_version gesetzt.
+# Schema-Änderungen werden immer als neue Migration angehängt, bestehende nie geändert.
+MIGRATIONS = [
+    (1, "Grundtabellen", _migrate_base_tables),
+    (2, "Materialisierte Gegnerspalten", _migrate_opponent_columns),
+    (3, "Tagessummen", _migrate_kill_rollups),
+    (4, "NPC-Kategorien", _migrate_npc_categories),
+    (5, "Index für Recent Events", _migrate_recent_events_index),
+    (6, "Fingerprints der Log-Dateien", _migrate_file_fingerprints),
+    (7, "Backup-Manifest", _migrate_backup_manifest),
+    (8, "Positionen rotierter Log-Dateien", _migrate_retired_positions),
+    (9, "Kompakter Dedup-Schlüssel", _migrate_event_hash),
+    (10, "Normalisierte Pfade der Log-Dateien", _migrate_normalized_log_paths),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def _get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _run_migrations(conn, progress):
+    """
+    Bringt die DB auf SCHEMA_VERSION. Jede Migration läuft in einer eigenen Transaktion
+    zusammen mit dem Setzen von user_version, ein Abbruch lässt die DB also auf dem Stand
+    der letzten vollständigen Migration. Aufruf nur mit db_lock.
     """
-    Initializes the database for the current player and creates necessary tables.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Erst nach BEGIN IMMEDIATE lesen, da ein anderer Prozess gerade migriert haben kann
+        current = _get_schema_version(conn)
+        if current > SCHEMA_VERSION:
+            logger.warning(f"Datenbank hat Schema-Version {current}, diese Programmversion kennt nur {SCHEMA_VERSION}")
+        for version, description, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info(f"Migration {version}: {description}")
+            migrate(conn, progress)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+        conn.commit()
+    except BaseException:
+        _rollback_quietly(conn)
+        raise
+
+def init_db(progress=None):
+    """
+    Initializes the database for the current player: creates the tables and runs all
+    pending schema migrations. Is a cheap check once the schema is current.
+    progress(description, done, total) is called during long-running migrations
+    (default: log output).
+
     Raises:
         NoPlayerConfiguredError: Wenn kein Spieler konfiguriert ist
         DatabaseAccessError: Bei allgemeinen Datenbankfehlern
@@ -34,53 +541,25 @@ def init_db():
     if not config.CURRENT_PLAYER_NAME and os.path.exists(config.CONFIG_FILE):
         config.load_config()
 
-    db_path = config.get_db_name()
+    db_path = get_db_path()
     if not db_path:
         raise NoPlayerConfiguredError("No player name set. Cannot initialize database.")
 
-    # Restlicher Code bleibt unverändert
     if not os.path.exists(db_path):
         logger.info(f"Creating new database file: {os.path.basename(db_path)}")
 
+    conn = None
     try:
+        conn = _get_connection("initialize database")
+        if _get_schema_version(conn) >= SCHEMA_VERSION:
+            _initialized_paths.add(db_path)
+            return
         with db_lock:
-            conn = sqlite3.connect(db_path, timeout=30)
-            c = conn.cursor()
-
-            # Kills table with UNIQUE constraint to prevent duplicate kill events across log files
-            c.execute("""
-                CREATE TABLE IF NOT EXISTS kills (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT,
-                    killed_player TEXT,
-                    killer TEXT,
-                    zone TEXT,
-                    weapon TEXT,
-                    damage_class TEXT,
-                    damage_type TEXT,
-                    UNIQUE(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
-                )
-            """)
-
-            # File positions table
-            c.execute("""
-                CREATE TABLE IF NOT EXISTS file_positions (
-                    file_path TEXT PRIMARY KEY,
-                    last_offset INTEGER
-                )
-            """)
-
-            # NPC categories table
-            c.execute("""
-                CREATE TABLE IF NOT EXISTS npc_categories (
-                    npc_name TEXT PRIMARY KEY,
-                    category TEXT
-                )
-            """)
-
-            conn.commit()
-            conn.close()
+            _run_migrations(conn, progress or _log_migration_progress)
+            _bump_data_version()
+        _initialized_paths.add(db_path)
     except sqlite3.Error as e:
+        _rollback_quietly(conn)
         logger.error(f"SQLite error during initialization: {str(e)}")
         raise DatabaseAccessError(f"Failed to initialize database: {str(e)}") from e
 
@@ -88,27 +567,26 @@ def execute_query(query, params=()):
     """
     Executes a single query (INSERT, UPDATE, DELETE, or SELECT) on the player's DB.
     Returns rows if it's a SELECT, otherwise None.
+    Uses the persistent connection of the calling thread. SELECTs run without
+    taking db_lock, so they are not blocked by a running write transaction.
     
     Raises:
         NoPlayerConfiguredError: Wenn kein Spieler konfiguriert ist
         DatabaseAccessError: Bei allgemeinen Datenbankfehlern
     """
-    db_path = config.get_db_name()
-    if not db_path:
-        raise NoPlayerConfiguredError("No player name set. Cannot execute query.")
-
+    conn = None
     try:
+        if _is_select(query):
+            conn = _get_connection("execute query")
+            return conn.execute(query, params).fetchall()
         with db_lock:
-            conn = sqlite3.connect(db_path, timeout=30)
-            c = conn.cursor()
-            c.execute(query, params)
-            result = None
-            if query.strip().lower().startswith("select"):
-                result = c.fetchall()
+            conn = _get_connection("execute query")
+            conn.execute(query, params)
             conn.commit()
-            conn.close()
-        return result
+            _bump_data_version()
+        return None
     except sqlite3.Error as e:
+        _rollback_quietly(conn)
         logger.error(f"SQLite error during query execution: {str(e)}")
         logger.debug(f"Query: {query}, Params: {params}")
         raise DatabaseAccessError(f"Failed to execute query: {str(e)}") from e
@@ -121,22 +599,53 @@ def execute_many(query, param_list):
         NoPlayerConfiguredError: Wenn kein Spieler konfiguriert ist
         DatabaseAccessError: Bei allgemeinen Datenbankfehlern
     """
-    db_path = config.get_db_name()
-    if not db_path:
-        raise NoPlayerConfiguredError("No player name set. Cannot execute many.")
-        
+    conn = None
     try:
         with db_lock:
-            conn = sqlite3.connect(db_path, timeout=30)
-            c = conn.cursor()
-            c.executemany(query, param_list)
+            conn = _get_connection("execute many")
+            conn.executemany(query, param_list)
             conn.commit()
-            conn.close()
+            _bump_data_version()
     except sqlite3.Error as e:
+        _rollback_quietly(conn)
         logger.error(f"SQLite error during batch execution: {str(e)}")
         logger.debug(f"Query: {query}, Param count: {len(param_list)}")
         raise DatabaseAccessError(f"Failed to execute batch query: {str(e)}") from e
 
+@contextmanager
+def transaction():
+    """
+    Context manager that runs all statements on the yielded cursor in a single transaction.
+    Commits when the block finishes, rolls back on any error.
+    The transaction takes the write lock up front (BEGIN IMMEDIATE), so reads inside
+    the block already see a stable state. Readers in other threads are not blocked.
+
+    Raises:
+        NoPlayerConfiguredError: Wenn kein Spieler konfiguriert ist
+        DatabaseAccessError: Bei allgemeinen Datenbankfehlern
+    """
+    with db_lock:
+        try:
+            conn = _get_connection("start transaction")
+        except sqlite3.Error as e:
+            logger.error(f"SQLite error while opening transaction: {str(e)}")
+            raise DatabaseAccessError(f"Failed to start transaction: {str(e)}") from e
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            conn.commit()
+            _bump_data_version()
+        except sqlite3.Error as e:
+            _rollback_quietly(conn)
+            logger.error(f"SQLite error during transaction: {str(e)}")
+            raise DatabaseAccessError(f"Failed to execute transaction: {str(e)}") from e
+        except BaseException:
+            _rollback_quietly(conn)
+            raise
+        finally:
+            cursor.close()
+
 def fetch_query(query, params=()):
     """
     Helper function for SELECT queries, returning the result.
@@ -149,16 +658,22 @@ def fetch_query(query, params=()):
 
 def get_db_size_kb():
     """
-    Returns the database file size in KB.
+    Returns the database file size in KB (including the WAL file).
     """
-    db_path = config.get_db_name()
+    db_path = get_db_path()
     if not db_path or not os.path.exists(db_path):
         return 0
-    return os.path.getsize(db_path) / 1024
+    size = os.path.getsize(db_path)
+    wal_path = db_path + "-wal"
+    if os.path.exists(wal_path):
+        size += os.path.getsize(wal_path)
+    return size / 1024
 
 def ensure_db_initialized():
     """
     Ensures the database is initialized by calling init_db().
+    Once the schema of the current DB file has been checked in this process,
+    this returns immediately without touching the database.
     
     Raises:
         NoPlayerConfiguredError: Wird abgefangen und protokolliert
@@ -167,9 +682,11 @@ def ensure_db_initialized():
     if not config.CURRENT_PLAYER_NAME and os.path.exists(config.CONFIG_FILE):
         config.load_config()
         
+    db_path = get_db_path()
+    if db_path in _initialized_paths and os.path.exists(db_path):
+        return
+
     try:
-        # Immer init_db aufrufen, um sicherzustellen, dass alle Tabellen existieren,
-        # auch wenn die Datenbankdatei bereits vorhanden ist
         init_db()
     except NoPlayerConfiguredError as e:
         logger.error(str(e))
@@ -181,12 +698,24 @@ def close_db():
     Schließt alle offenen Datenbankverbindungen sauber.
     Dies sollte aufgerufen werden, bevor die Anwendung beendet wird
     oder wenn die Datenbank gelöscht werden soll.
+    Threads, die danach wieder zugreifen, öffnen automatisch eine neue Verbindung.
     """
-    # Da wir keine persistente Verbindung haben, müssen wir nichts aktiv schließen.
-    # Diese Funktion ist ein Platzhalter für zukünftige Implementierungen,
-    # falls wir zur persistenten Verbindung wechseln.
+    global _connection_generation, _db_path_cache
     logger.info("Datenbankverbindungen werden geschlossen")
-    
-    # Stelle für zukünftige Implementierungen sicher, dass alle ausstehenden
-    # Transaktionen abgeschlossen sind, indem wir etwas warten
-    time.sleep(0.2)
+
+    # db_lock stellt sicher, dass kein Schreibvorgang mehr läuft
+    with db_lock:
+        with _connections_lock:
+            connections = list(_open_connections.values())
+            _open_connections.clear()
+            _connection_generation += 1
+        # DB-Pfad beim nächsten Zugriff neu ermitteln (Ordner könnte gelöscht worden sein)
+        _db_path_cache = (None, None)
+        _initialized_paths.clear()
+        # Die DB-Datei kann danach gelöscht oder ersetzt werden
+        _bump_data_version()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Fehler beim Schließen einer Datenbankverbindung: {str(e)}")
@@ -1,7 +1,12 @@
-import gui
+import multiprocessing
 
 def main():
+    # Erst hier importieren: die Worker-Prozesse des parallelen Imports (Startmethode "spawn")
+    # laden dieses Modul erneut und sollen dabei weder GUI noch Datenbank initialisieren
+    import gui
     gui.start_gui()
 
 if __name__ == "__main__":
+    # Nötig für den parallelen Log-Import in der gebündelten .exe
+    multiprocessing.freeze_support()
     main()
@@ -3,6 +3,7 @@ from tkinter import ttk
 import tkinter.font as tkFont
 import threading
 import time
+import queue
 import os
 import webbrowser
 import logging
@@ -14,9 +15,10 @@ import config
 import database
 import log_processor
 import stats
-from watchdog_handler import start_watchdog
+import npc_handler
+from watchdog_handler import start_watchdog, start_rules_watchdog
 from datetime import datetime
-from ui_constants import Colors, Fonts, WindowSettings, RefreshSettings
+from ui_constants import Colors, Fonts, WindowSettings, RefreshSettings, BoardSettings
 import logger
 
 # Aktuelle Version der Anwendung - wird bei jedem Release aktualisiert
@@ -44,6 +46,9 @@ UI_CONSTANTS = {
     'REFRESH_INTERVAL': 5,
 }
 
+# Zeilen pro Event in der Recent-Events-Anzeige (siehe GriefingCounterApp._insert_recent_events())
+RECENT_EVENT_LINES = 8
+
 @dataclass
 class LeaderboardEntry:
     name: str
@@ -395,35 +400,20 @@ class GriefingCounterApp(tk.Tk):
                 entity_filters[key] = var.get()
                 
             self.logger.info(f"Lade Daten mit Filtern: Start={start_date}, Ende={end_date}, Entities={entity_filters}")
-            stats_text, recent_text = stats.get_stats(start_date, end_date, entity_filters)
+            stats_text, recent_events = stats.get_stats(start_date, end_date, entity_filters)
             self.logger.info("Statistiken erfolgreich geladen")
             
-            # Status-Update in der GUI - direkt über die tkinter Variable aktualisieren
-            self.var_stats.set(stats_text)
-
             # Update recent kill events - direkt in die GUI schreiben
             self.logger.info("Aktualisiere Recent Kill Events")
-            self.kill_text.config(state="normal")
-            self.kill_text.delete("1.0", tk.END)
-            for line in recent_text.split("\n"):
-                if line.lower().startswith("killer:"):
-                    self.kill_text.insert(tk.END, "Killer: ", "normal")
-                    name = line[len("Killer: "):].strip()
-                    self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-                elif line.lower().startswith("killed:"):
-                    self.kill_text.insert(tk.END, "Killed: ", "normal")
-                    name = line[len("Killed: "):].strip()
-                    self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-                else:
-                    self.kill_text.insert(tk.END, line + "\n", "normal")
-            self.kill_text.config(state="disabled")
+            self.update_recent_events(start_date, end_date, entity_filters, recent_events)
 
             # Update leaderboards mit den aktuellen Filtern
             self.logger.info("Aktualisiere Leaderboards mit Filtern")
             kill_leaderboard, death_leaderboard = stats.get_leaderboards(start_date, end_date, entity_filters)
-            # Aktualisiere die Anzeige explizit
-            self.after(0, lambda: self.kill_leaderboard_widget.update_data([LeaderboardEntry(name, count) for name, count in kill_leaderboard]))
-            self.after(0, lambda: self.death_leaderboard_widget.update_data([LeaderboardEntry(name, count) for name, count in death_leaderboard]))
+            # Stats und Leaderboards gesammelt im Hauptthread anzeigen
+            kill_entries = [LeaderboardEntry(name, count) for name, count in kill_leaderboard]
+            death_entries = [LeaderboardEntry(name, count) for name, count in death_leaderboard]
+            self.after(0, lambda: self._apply_stats(stats_text, kill_entries, death_entries))
             
             self.logger.info("Datenaktualisierung mit Filtern abgeschlossen")
         except Exception as e:
@@ -460,7 +450,7 @@ class GriefingCounterApp(tk.Tk):
         self.right_frame = tk.Frame(self.main_frame)
         self.right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
 
-        ttk.Label(self.right_frame, text="Recent 100 Kill Events:").pack(anchor="nw")
+        ttk.Label(self.right_frame, text="Recent Kill Events:").pack(anchor="nw")
 
         self.kill_text_frame = tk.Frame(self.right_frame)
         self.kill_text_frame.pack(fill=tk.BOTH, expand=True)
@@ -473,20 +463,41 @@ class GriefingCounterApp(tk.Tk):
         self.kill_text.tag_configure("hyperlink", foreground="blue", underline=True)
         self.kill_text.config(state="disabled")
         self.kill_text.bind("<Button-1>", self.on_recent_event_click)
+        # Aktuell angezeigte Events (neueste zuerst) und die Filter, mit denen sie geladen wurden.
+        # Das erste Event ist die Keyset-Position für neue Events, das letzte für ältere Seiten.
+        self.recent_events = []
+        self.recent_events_query = None
 
         self.scrollbar = ttk.Scrollbar(self.kill_text_frame, orient="vertical", command=self.kill_text.yview)
         self.kill_text.config(yscrollcommand=self.scrollbar.set)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+        ttk.Button(self.right_frame, text="Load older events", command=self.load_older_events).pack(anchor="ne", pady=(5, 0))
+
     def setup_observers(self):
         """Initialize observers and threads"""
         self.observer = None
         self.auto_refresh_running = False
+
+        # Der Import meldet neu gespeicherte Events über diese Queue, der Tk-Mainloop holt
+        # sie in process_ingest_notifications() ab (ohne Datenbankzugriff, solange nichts ankommt)
+        self.ingest_queue = queue.Queue()
+        self.pending_new_events = 0
+        self.stats_refresh_running = False
+        log_processor.add_ingest_listener(self.ingest_queue.put)
+        self.after(RefreshSettings.INGEST_POLL_MS, self.process_ingest_notifications)
+
+        # Änderungen an der NPC-Regeldatei automatisch übernehmen
+        try:
+            self.rules_observer = start_rules_watchdog()
+        except Exception as e:
+            self.rules_observer = None
+            self.logger.error(f"Failed to watch NPC rule file: {str(e)}")
         
         if config.CURRENT_PLAYER_NAME:
             try:
                 threading.Thread(target=self.load_data, daemon=True).start()
-                threading.Thread(target=self.auto_refresh_loop, daemon=True).start()
+                self.start_log_watchdog()
             except Exception as e:
                 self.logger.error(f"Failed to initialize observers: {str(e)}")
                 self.show_error("Failed to initialize application")
@@ -499,12 +510,8 @@ class GriefingCounterApp(tk.Tk):
         config.CURRENT_PLAYER_NAME = name
         config.save_config()
 
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-            self.observer = None
-
         threading.Thread(target=self.load_data, daemon=True).start()
+        self.start_log_watchdog()
         
         # Warte einen kurzen Moment und drücke dann automatisch den Apply Filter-Button
         self.after(3000, self.apply_entity_filter)
@@ -520,6 +527,9 @@ class GriefingCounterApp(tk.Tk):
     def load_data(self):
         """Enhanced data loading with error handling"""
         try:
+            # NPC-Regeln aus der Regeldatei auf die (ggf. neue) Spieler-DB anwenden
+            npc_handler.reload_category_rules()
+
             live_log = os.path.join(config.LIVE_FOLDER, config.GAME_LOG_FILENAME)
             
             if not os.path.exists(live_log):
@@ -558,15 +568,68 @@ class GriefingCounterApp(tk.Tk):
             self.show_error("Failed to load data")
 
     def refresh_data(self):
-        """Manueller Refresh."""
-        threading.Thread(target=self.load_data_with_scroll_memory, daemon=True).start()
+        """Manueller Refresh. Die Recent Events werden nur um neue Events ergänzt (siehe update_recent_events())."""
+        threading.Thread(target=self.load_data, daemon=True).start()
+
+    def start_log_watchdog(self):
+        """
+        (Re)startet die Überwachung von Game.log in LIVE_FOLDER. Neue Events werden dann beim
+        Schreiben der Log-Datei importiert und über die Ingest-Queue angezeigt. Der
+        zeitgesteuerte Refresh läuft nur noch, wenn er konfiguriert ist (config.POLLING_REFRESH)
+        oder die Überwachung nicht gestartet werden kann.
+        """
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        try:
+            self.observer = start_watchdog()
+        except Exception as e:
+            self.logger.error(f"Failed to watch Game.log: {str(e)}")
+
+        if config.POLLING_REFRESH or self.observer is None:
+            if not self.auto_refresh_running:
+                self.logger.info("Zeitgesteuerter Refresh als Fallback aktiv")
+                self.auto_refresh_running = True
+                threading.Thread(target=self.auto_refresh_loop, daemon=True).start()
+        else:
+            self.auto_refresh_running = False
+            self.var_countdown.set("Live updates")
+
+    def process_ingest_notifications(self):
+        """
+        Läuft im Tk-Mainloop alle RefreshSettings.INGEST_POLL_MS: sammelt die Benachrichtigungen
+        über neu gespeicherte Events und aktualisiert die Anzeige einmal für alle zusammen.
+        Während eine Aktualisierung läuft, werden weitere Benachrichtigungen für die nächste gesammelt.
+        """
+        try:
+            while True:
+                self.pending_new_events += self.ingest_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        if self.pending_new_events and not self.stats_refresh_running:
+            self.logger.info(f"{self.pending_new_events} neue Events gespeichert, aktualisiere Anzeige")
+            self.pending_new_events = 0
+            self.stats_refresh_running = True
+            # Tk-Variablen nur hier im Mainloop lesen, der Thread fragt nur die Datenbank ab
+            entity_filters = {key: var.get() for key, var in self.entity_filters.items()}
+            threading.Thread(target=self.refresh_stats_after_ingest, args=(entity_filters,), daemon=True).start()
+
+        self.after(RefreshSettings.INGEST_POLL_MS, self.process_ingest_notifications)
+
+    def refresh_stats_after_ingest(self, entity_filters):
+        """Aktualisiert Stats, Leaderboards und Recent Events nach neuen Events (ohne erneuten Log-Import)."""
+        try:
+            self.update_stats(entity_filters)
+        except Exception as e:
+            self.logger.error(f"Fehler beim Aktualisieren nach neuen Events: {str(e)}", exc_info=True)
+        finally:
+            self.after(0, self._finish_stats_refresh)
 
-    def load_data_with_scroll_memory(self):
-        """Refresh-Daten laden und dabei die Scrollposition des Recent-Events-Text-Widgets beibehalten."""
-        current_scroll = self.kill_text.yview()
-        # Verwende die aktiven Filter auch beim manuellen Refresh
-        self.load_data()
-        self.kill_text.yview_moveto(current_scroll[0])
+    def _finish_stats_refresh(self):
+        """Gibt die nächste Aktualisierung frei (im Tk-Mainloop, wie process_ingest_notifications())."""
+        self.stats_refresh_running = False
 
     def auto_refresh_loop(self):
         """Loop für die automatische Aktualisierung der Daten."""
@@ -618,45 +681,35 @@ class GriefingCounterApp(tk.Tk):
             self.after(3000, lambda: self.restart_auto_refresh())
             return
         
-        # Wenn der Loop normal beendet wird
-        self.after(0, lambda: self.var_countdown.set("Auto refresh stopped"))
+        # Wenn der Loop normal beendet wird (bei laufender Game.log-Überwachung kommen Updates weiterhin live)
+        self.after(0, lambda: self.var_countdown.set("Live updates" if self.observer else "Auto refresh stopped"))
         self.logger.info("Auto-Refresh-Loop beendet")
 
-    def update_stats(self):
-        """Aktualisiert Stats, Leaderboards und Recent Kill Events in der GUI."""
-        # Hole aktuelle Entity-Filter
-        entity_filters = {}
-        for key, var in self.entity_filters.items():
-            entity_filters[key] = var.get()
-            
+    def update_stats(self, entity_filters):
+        """
+        Berechnet Stats, Leaderboards und Recent Kill Events im Hintergrund-Thread und übernimmt
+        sie im Tk-Mainloop. entity_filters wurde vom Aufrufer im Mainloop gelesen.
+        """
         # Verwende die gespeicherten Filter, falls vorhanden
-        stats_text, recent_text = stats.get_stats(self.active_start_date, self.active_end_date, entity_filters)
-        self.var_stats.set(stats_text)
+        stats_text, recent_events = stats.get_stats(self.active_start_date, self.active_end_date, entity_filters)
 
         # Leaderboards aktualisieren mit den aktiven Filtern
         kill_leaderboard, death_leaderboard = stats.get_leaderboards(
             self.active_start_date, self.active_end_date, entity_filters)
             
         # Alle Leaderboard-Einträge anzeigen, ohne den Unknwon-Filter
-        self.kill_leaderboard_widget.update_data([LeaderboardEntry(name, count) for name, count in kill_leaderboard])
-        self.death_leaderboard_widget.update_data([LeaderboardEntry(name, count) for name, count in death_leaderboard])
+        kill_entries = [LeaderboardEntry(name, count) for name, count in kill_leaderboard]
+        death_entries = [LeaderboardEntry(name, count) for name, count in death_leaderboard]
+        self.after(0, lambda: self._apply_stats(stats_text, kill_entries, death_entries))
 
-        # Recent Kill Events in das Text-Widget einfügen, mit separater Formatierung:
-        self.kill_text.config(state="normal")
-        self.kill_text.delete("1.0", tk.END)
-        # Wir verarbeiten die Zeilen einzeln, sodass nur die Spielernamen in den Zeilen "Killer:" und "Killed:" den Hyperlink-Tag bekommen.
-        for line in recent_text.split("\n"):
-            if line.lower().startswith("killer:"):
-                self.kill_text.insert(tk.END, "Killer: ", "normal")
-                name = line[len("Killer: "):].strip()
-                self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-            elif line.lower().startswith("killed:"):
-                self.kill_text.insert(tk.END, "Killed: ", "normal")
-                name = line[len("Killed: "):].strip()
-                self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-            else:
-                self.kill_text.insert(tk.END, line + "\n", "normal")
-        self.kill_text.config(state="disabled")
+        # Recent Kill Events in das Text-Widget einfügen (übernimmt sie ebenfalls im Mainloop)
+        self.update_recent_events(self.active_start_date, self.active_end_date, entity_filters, recent_events)
+
+    def _apply_stats(self, stats_text, kill_entries, death_entries):
+        """Zeigt berechnete Stats und Leaderboards an (im Tk-Mainloop, siehe update_stats())."""
+        self.var_stats.set(stats_text)
+        self.kill_leaderboard_widget.update_data(kill_entries)
+        self.death_leaderboard_widget.update_data(death_entries)
 
     def update_progress_info(self):
         """Entfernt die alte Anzeige der Logs und DB-Größe."""
@@ -678,6 +731,116 @@ class GriefingCounterApp(tk.Tk):
             player_name = text.split()[0]
             self.open_citizen_page(player_name)
 
+    def _insert_recent_events(self, events, index):
+        """
+        Fügt Recent Kill Events (stats.KillEvent) ab index in das Text-Widget ein, in der
+        gegebenen Reihenfolge. Nur die Namen von Killer und Opfer bekommen den Hyperlink-Tag.
+        """
+        # Die Marke wandert mit dem eingefügten Text mit, so folgt jedes Event dem vorherigen
+        self.kill_text.mark_set("recent_insert", index)
+        self.kill_text.mark_gravity("recent_insert", tk.RIGHT)
+        for ev in events:
+            self.kill_text.insert("recent_insert", f"Time: {ev.timestamp}\n", "normal")
+            self.kill_text.insert("recent_insert", "Killer: ", "normal")
+            self.kill_text.insert("recent_insert", ev.killer + "\n", "hyperlink")
+            self.kill_text.insert("recent_insert", "Killed: ", "normal")
+            self.kill_text.insert("recent_insert", ev.killed_player + "\n", "hyperlink")
+            self.kill_text.insert("recent_insert", (
+                f"Weapon: {ev.weapon}\n"
+                f"Class: {ev.damage_class}\n"
+                f"Type: {ev.damage_type}\n"
+                f"Zone: {ev.zone}\n"
+                "------------------------------------\n"
+            ), "normal")
+        self.kill_text.mark_unset("recent_insert")
+
+    def show_recent_events(self, events, append=False):
+        """
+        Schreibt Recent Kill Events (stats.KillEvent) in das Text-Widget.
+        Mit append werden ältere Events angehängt, sonst wird der Inhalt ersetzt.
+        """
+        self.kill_text.config(state="normal")
+        if append:
+            self.recent_events = self.recent_events + list(events)
+        else:
+            self.recent_events = list(events)
+            self.kill_text.delete("1.0", tk.END)
+        self._insert_recent_events(events, tk.END)
+        self.kill_text.config(state="disabled")
+
+    def prepend_recent_events(self, events):
+        """
+        Fügt neue Events (neueste zuerst) oben ein und entfernt die ältesten Events über
+        BoardSettings.RECENT_EVENTS_CAP. Die sichtbaren Events bleiben an ihrer Position,
+        außer die Ansicht steht ganz oben, dann werden die neuen Events sichtbar.
+        """
+        top_line = int(self.kill_text.index("@0,0").split(".")[0])
+        at_top = self.kill_text.yview()[0] == 0.0
+
+        self.kill_text.config(state="normal")
+        self._insert_recent_events(events, "1.0")
+        self.recent_events = list(events) + self.recent_events
+        if len(self.recent_events) > BoardSettings.RECENT_EVENTS_CAP:
+            self.recent_events = self.recent_events[:BoardSettings.RECENT_EVENTS_CAP]
+            self.kill_text.delete(f"{BoardSettings.RECENT_EVENTS_CAP * RECENT_EVENT_LINES + 1}.0", "end-1c")
+        self.kill_text.config(state="disabled")
+
+        if not at_top:
+            self.kill_text.yview(f"{top_line + len(events) * RECENT_EVENT_LINES}.0")
+
+    def update_recent_events(self, start_date, end_date, entity_filters, first_page):
+        """
+        Aktualisiert die Recent-Events-Anzeige nach einem Refresh (aus einem Hintergrund-Thread).
+        Bei unveränderten Filtern werden nur Events geladen, die neuer sind als das neueste
+        angezeigte; eingefügt wird in _apply_recent_events() im Tk-Mainloop. Sonst wird
+        first_page (erste Seite aus stats.get_stats()) angezeigt.
+        """
+        query = (start_date, end_date, tuple(sorted(entity_filters.items())))
+        # self.recent_events wird nur im Tk-Mainloop und nur durch Zuweisung einer neuen Liste
+        # geändert, hier wird also immer eine vollständige Liste gelesen
+        shown = self.recent_events
+        head = shown[0].key if shown and query == self.recent_events_query else None
+        new_events = []
+        if head is not None:
+            new_events = stats.get_recent_events(start_date, end_date, entity_filters,
+                                                 limit=BoardSettings.RECENT_EVENTS_CAP, after=head)
+        self.after(0, lambda: self._apply_recent_events(query, head, new_events, first_page))
+
+    def _apply_recent_events(self, query, head, new_events, first_page):
+        """
+        Übernimmt das Ergebnis von update_recent_events() im Tk-Mainloop. Laufen mehrere
+        Aktualisierungen gleichzeitig (Refresh, Import, neue Events), hat eine andere die Events
+        eventuell schon eingefügt: eingefügt werden daher nur Events, die neuer sind als das
+        jetzt neueste angezeigte. Ohne neue Events bleibt das Widget unverändert.
+        """
+        if (head is not None and query == self.recent_events_query and self.recent_events
+                and self.recent_events[0].key >= head and len(new_events) < BoardSettings.RECENT_EVENTS_CAP):
+            current = self.recent_events[0].key
+            new_events = [ev for ev in new_events if ev.key > current]
+            if new_events:
+                self.prepend_recent_events(new_events)
+            return
+        self.recent_events_query = query
+        self.show_recent_events(first_page)
+
+    def load_older_events(self):
+        """Hängt die nächstältere Seite Recent Kill Events an (Keyset nach dem letzten angezeigten Event)."""
+        if not self.recent_events:
+            return
+        entity_filters = {key: var.get() for key, var in self.entity_filters.items()}
+        before = self.recent_events[-1].key
+
+        def load():
+            events = stats.get_recent_events(self.active_start_date, self.active_end_date, entity_filters, before=before)
+            self.after(0, lambda: append(events))
+
+        def append(events):
+            # Verwerfen, falls die Anzeige inzwischen neu geladen oder schon erweitert wurde
+            if self.recent_events and self.recent_events[-1].key == before:
+                self.show_recent_events(events, append=True)
+
+        threading.Thread(target=load, daemon=True).start()
+
     def on_recent_event_click(self, event):
         """Handler für Klick in der Recent Kill Events Text-Ansicht.
         Prüft, ob an der Klickposition das Tag 'hyperlink' gesetzt ist und öffnet dann die Citizen-Seite."""
@@ -732,34 +895,17 @@ class GriefingCounterApp(tk.Tk):
                 
             # Lade Daten mit allen Filtern
             self.logger.info(f"Lade Daten mit Filtern: Start={self.active_start_date}, Ende={self.active_end_date}, Entities={entity_filters}")
-            stats_text, recent_text = stats.get_stats(self.active_start_date, self.active_end_date, entity_filters)
-            
-            # Aktualisiere die Anzeige
-            self.var_stats.set(stats_text)
+            stats_text, recent_events = stats.get_stats(self.active_start_date, self.active_end_date, entity_filters)
             
             # Aktualisiere Recent Kill Events
-            self.kill_text.config(state="normal")
-            self.kill_text.delete("1.0", tk.END)
-            for line in recent_text.split("\n"):
-                if line.lower().startswith("killer:"):
-                    self.kill_text.insert(tk.END, "Killer: ", "normal")
-                    name = line[len("Killer: "):].strip()
-                    self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-                elif line.lower().startswith("killed:"):
-                    self.kill_text.insert(tk.END, "Killed: ", "normal")
-                    name = line[len("Killed: "):].strip()
-                    self.kill_text.insert(tk.END, name + "\n", "hyperlink")
-                else:
-                    self.kill_text.insert(tk.END, line + "\n", "normal")
-            self.kill_text.config(state="disabled")
+            self.update_recent_events(self.active_start_date, self.active_end_date, entity_filters, recent_events)
             
             # Aktualisiere Leaderboards
             kill_leaderboard, death_leaderboard = stats.get_leaderboards(self.active_start_date, self.active_end_date, entity_filters)
-            # Aktualisiere die Leaderboard-Widgets im Hauptthread
-            self.after(0, lambda: self.kill_leaderboard_widget.update_data(
-                [LeaderboardEntry(name, count) for name, count in kill_leaderboard]))
-            self.after(0, lambda: self.death_leaderboard_widget.update_data(
-                [LeaderboardEntry(name, count) for name, count in death_leaderboard]))
+            # Stats und Leaderboard-Widgets gesammelt im Hauptthread aktualisieren
+            kill_entries = [LeaderboardEntry(name, count) for name, count in kill_leaderboard]
+            death_entries = [LeaderboardEntry(name, count) for name, count in death_leaderboard]
+            self.after(0, lambda: self._apply_stats(stats_text, kill_entries, death_entries))
             
             self.logger.info("Datenaktualisierung mit allen Filtern abgeschlossen")
         except Exception as e:
@@ -1001,8 +1147,9 @@ class GriefingCounterApp(tk.Tk):
         config.BACKUP_FOLDER = os.path.join(sc_path, "logbackups")
         config.save_config()
         
-        # Daten neu laden
+        # Daten neu laden und den neuen Ordner überwachen
         threading.Thread(target=self.load_data, daemon=True).start()
+        self.start_log_watchdog()
         
     def on_clear_appdata(self):
         """Löscht alle Daten aus dem AppData-Verzeichnis (Logs, Datenbank)"""
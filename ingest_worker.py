@@ -0,0 +1,134 @@
+"""
+ingest_worker.py
+
+Ein einzelner Hintergrund-Thread, der Log-Dateien einliest, sobald der Watchdog Änderungen meldet.
+- Meldungen werden pro Datei zusammengefasst: solange eine Datei in der Warteschlange steht,
+  lösen weitere Änderungen keinen zusätzlichen Durchlauf aus.
+- Jede Datei wird frühestens nach dem Debounce-Fenster (config.INGEST_DEBOUNCE_MS) seit der
+  ersten Meldung eingelesen, sodass ein Schwall von Flushes zu einem einzigen Lesevorgang führt.
+- Da nur ein Thread liest, wird eine Datei nie parallel verarbeitet.
+- get_status() liefert Warteschlangenlänge und Verzögerung.
+"""
+
+import threading
+import queue
+import time
+import logging
+import config
+import log_processor
+
+logger = logging.getLogger(__name__)
+
+# Ab dieser Verzögerung zwischen erster Meldung und Einlesen wird gewarnt (Sekunden)
+LAG_WARNING_SECONDS = 5.0
+
+# Markiert in der Warteschlange das Ende des Workers
+_STOP = object()
+
+class IngestWorker:
+    """Liest gemeldete Log-Dateien nacheinander in einem eigenen Thread ein (siehe Moduldokumentation)."""
+
+    def __init__(self, process=None, debounce_ms=None):
+        """
+        Args:
+            process: Funktion, die eine Datei einliest (Standard: log_processor.process_log_file)
+            debounce_ms: Debounce-Fenster in Millisekunden (Standard: config.INGEST_DEBOUNCE_MS)
+        """
+        self.process = process or log_processor.process_log_file
+        self.debounce_ms = config.INGEST_DEBOUNCE_MS if debounce_ms is None else debounce_ms
+        self._queue = queue.Queue()
+        # Datei -> Zeitpunkt der ersten noch nicht verarbeiteten Meldung (time.monotonic())
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._processed = 0
+        self._coalesced = 0
+        self._last_lag = 0.0
+
+    def start(self):
+        """Startet den Worker-Thread (mehrfacher Aufruf ist unschädlich)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="IngestWorker", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=None):
+        """Beendet den Worker, nachdem alle bereits fälligen Dateien verarbeitet wurden."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def submit(self, file_path):
+        """
+        Meldet eine Änderung an file_path. Steht die Datei bereits in der Warteschlange,
+        wird die Meldung mit der vorhandenen zusammengefasst. Kehrt sofort zurück.
+        """
+        with self._lock:
+            if file_path in self._pending:
+                self._coalesced += 1
+                return
+            self._pending[file_path] = time.monotonic()
+        self._queue.put(file_path)
+
+    def get_status(self):
+        """
+        Returns a dict with queue_depth (files waiting), lag (seconds since the oldest waiting
+        notification), last_lag (lag of the last processed file), processed and coalesced
+        (notifications merged into an already queued file).
+        """
+        now = time.monotonic()
+        with self._lock:
+            oldest = min(self._pending.values(), default=now)
+            return {
+                "queue_depth": len(self._pending),
+                "lag": now - oldest,
+                "last_lag": self._last_lag,
+                "processed": self._processed,
+                "coalesced": self._coalesced,
+            }
+
+    def _run(self):
+        while True:
+            file_path = self._queue.get()
+            if file_path is _STOP:
+                return
+
+            # Die Warteschlange ist nach erster Meldung sortiert, das Warten auf den Kopf
+            # verzögert also keine Datei über ihr eigenes Debounce-Fenster hinaus
+            with self._lock:
+                first_seen = self._pending[file_path]
+            delay = first_seen + self.debounce_ms / 1000 - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            # Ab hier lösen neue Meldungen einen weiteren Durchlauf aus, da sie Daten
+            # betreffen können, die dieser Durchlauf nicht mehr sieht
+            with self._lock:
+                del self._pending[file_path]
+                lag = time.monotonic() - first_seen
+                self._last_lag = lag
+                queue_depth = len(self._pending)
+            logger.debug(f"Ingest {file_path}: Verzögerung {lag * 1000:.0f} ms, {queue_depth} weitere Dateien wartend")
+            if lag > LAG_WARNING_SECONDS:
+                logger.warning(f"Ingest hinkt hinterher: {file_path} nach {lag:.1f} s eingelesen")
+
+            try:
+                self.process(file_path)
+            except Exception as e:
+                logger.error(f"Fehler beim Einlesen von {file_path}: {str(e)}", exc_info=True)
+            with self._lock:
+                self._processed += 1
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_worker():
+    """Gibt den gemeinsamen, laufenden IngestWorker zurück und legt ihn beim ersten Aufruf an."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = IngestWorker()
+        _worker.start()
+        return _worker
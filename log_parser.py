@@ -0,0 +1,215 @@
+"""
+log_parser.py
+
+Lesen und Parsen der Log-Dateien ohne Datenbankzugriff:
+- Binäres Einlesen ab einem Byte-Offset in Blöcken vollständiger Zeilen (read_complete_chunks()).
+- Vorfilter auf das <Actor Death>-Literal und Regex nur auf Kandidaten (parse_log_events()).
+- Wiedererkennen einer Log-Datei über den Fingerprint ihres Anfangs.
+
+Das Modul hat beim Import keine Nebenwirkungen (keine Konfiguration, keine Datenbank),
+damit die Worker-Prozesse des parallelen Backup-Imports (Startmethode "spawn") es
+günstig importieren können. Die Datenbankseite liegt in log_processor.
+"""
+
+import os
+import re
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+ACTOR_DEATH_REGEX = re.compile(
+    r"^<(?P<timestamp>[^>]+)>.*?<Actor Death>.*?'(?P<killed_player>[^']+)' \[\d+\].*?"
+    r"in zone '(?P<zone>[^']+)'"
+    r".*?killed by '(?P<killer>[^']+)' \[\d+\].*?using '(?P<weapon>[^']+)' \[Class (?P<class>[^]]+)\].*?"
+    r"with damage type '(?P<damage_type>[^']+)'",
+    re.IGNORECASE
+)
+
+# Literal, das in jeder Actor-Death-Zeile vorkommt (kleingeschrieben, da der Regex IGNORECASE nutzt)
+ACTOR_DEATH_MARKER = b"<actor death>"
+
+# Binäre Variante des Regex, damit nur Zeilen dekodiert werden, die tatsächlich passen
+ACTOR_DEATH_REGEX_BYTES = re.compile(ACTOR_DEATH_REGEX.pattern.encode("utf-8"), re.IGNORECASE)
+
+# Blockgröße, in der Log-Dateien binär eingelesen werden
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Unvollständige Zeilenenden je Datei: file_path -> (Byte-Offset des Fragments, gelesene Bytes).
+# Das Fragment wird beim nächsten Durchlauf weiterverwendet, statt erneut gelesen zu werden.
+_pending_fragments = {}
+_fragments_lock = threading.Lock()
+
+def normalize_log_path(file_path):
+    """
+    Einheitliche Schreibweise eines Log-Pfads (absolut, unter Windows ohne Groß-/Kleinschreibung).
+    Watchdog, Konfiguration und Backup-Ordner schreiben denselben Pfad unterschiedlich; unter
+    diesem Schlüssel werden Dateipositionen gespeichert und Dateien gesperrt.
+    """
+    return os.path.normcase(os.path.abspath(file_path))
+
+def parse_log_line(line):
+    """Parses a single log line using ACTOR_DEATH_REGEX, returns dict if matched."""
+    match = ACTOR_DEATH_REGEX.match(line)
+    if match:
+        return match.groupdict()
+    return None
+
+def parse_log_line_bytes(line):
+    """
+    Parses a single raw (bytes) log line, returns dict with decoded values if matched.
+    Only the fields of matching lines are decoded.
+    """
+    match = ACTOR_DEATH_REGEX_BYTES.match(line.strip())
+    if match:
+        return {key: value.decode("utf-8", errors="replace") for key, value in match.groupdict().items()}
+    return None
+
+def iter_candidate_lines(chunk):
+    """
+    Sucht in einem Block vollständiger Zeilen nach ACTOR_DEATH_MARKER und liefert nur
+    die Zeilen, die das Literal enthalten. Alle anderen Zeilen werden nie einzeln
+    betrachtet, sodass der teure Regex nur auf Kandidaten läuft.
+    """
+    lowered = chunk.lower()
+    pos = lowered.find(ACTOR_DEATH_MARKER)
+    while pos != -1:
+        line_start = chunk.rfind(b"\n", 0, pos) + 1
+        line_end = chunk.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(chunk)
+        yield chunk[line_start:line_end]
+        pos = lowered.find(ACTOR_DEATH_MARKER, line_end)
+
+def read_complete_chunks(file_path, offset, final=False):
+    """
+    Liest file_path ab dem Byte-Offset `offset` binär in Blöcken von READ_CHUNK_SIZE.
+    Liefert Tupel (chunk, end_offset), wobei jeder chunk nur vollständige Zeilen enthält
+    und end_offset die exakte Byte-Position direkt hinter dem chunk ist.
+
+    Eine unvollständige letzte Zeile wird nicht ausgeliefert, sondern als Fragment
+    für den nächsten Durchlauf zurückgehalten. Der gespeicherte Offset zeigt daher
+    immer auf einen Zeilenanfang. Mit final=True (Dateien, die nicht mehr wachsen, z.B.
+    Backup-Logs) gilt das Fragment am Dateiende als vollständige letzte Zeile.
+    """
+    fragment = b""
+    read_pos = offset
+    with _fragments_lock:
+        pending = _pending_fragments.pop(file_path, None)
+    if pending and pending[0] == offset:
+        # Bereits gelesene Bytes der angefangenen Zeile wiederverwenden
+        fragment = pending[1]
+        read_pos = offset + len(fragment)
+
+    chunk_start = offset
+    with open(file_path, "rb") as f:
+        f.seek(read_pos)
+        while True:
+            data = f.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            buf = fragment + data if fragment else data
+            cut = buf.rfind(b"\n") + 1
+            if cut == 0:
+                # Noch kein Zeilenende in Sicht, weiterlesen
+                fragment = buf
+                continue
+            chunk_end = chunk_start + cut
+            yield buf[:cut], chunk_end
+            fragment = buf[cut:]
+            chunk_start = chunk_end
+
+    if fragment and final:
+        yield fragment, chunk_start + len(fragment)
+    elif fragment:
+        with _fragments_lock:
+            _pending_fragments[file_path] = (chunk_start, fragment)
+
+# Anzahl Bytes am Dateianfang, an denen eine Log-Datei wiedererkannt wird (siehe file_fingerprint())
+FINGERPRINT_BYTES = 4096
+
+def file_fingerprint(file_path, offset):
+    """
+    Fingerprint of the part of file_path that was read up to offset: SHA-1 (hex) of the first
+    min(offset, FINGERPRINT_BYTES) bytes. None for offset 0 or if the file is shorter than that.
+    """
+    length = min(offset, FINGERPRINT_BYTES)
+    if length <= 0:
+        return None
+    with open(file_path, "rb") as f:
+        head = f.read(length)
+    if len(head) < length:
+        return None
+    return hashlib.sha1(head).hexdigest()
+
+def resolve_start_offset(file_path, offset, fingerprint):
+    """
+    Prüft, ob file_path noch die Datei ist, zu der die gespeicherte Position (offset, fingerprint)
+    gehört. Returns (offset, fingerprint) unchanged, or (0, None) if the file was truncated
+    (shorter than offset) or replaced by a new file with a different start, e.g. a new Game.log
+    after a game restart. Positions without fingerprint (older versions) only get the size check.
+    """
+    if offset <= 0:
+        return 0, None
+    size = os.path.getsize(file_path)
+    if size < offset:
+        logger.info(f"{file_path} ist kürzer als der gespeicherte Offset ({size} < {offset}), lese ab Byte 0")
+        return 0, None
+    if fingerprint is not None and file_fingerprint(file_path, offset) != fingerprint:
+        logger.info(f"{file_path} wurde durch eine neue Datei ersetzt, lese ab Byte 0")
+        return 0, None
+    return offset, fingerprint
+
+def advance_fingerprint(file_path, offset, fingerprint, new_offset):
+    """
+    Fingerprint für die neue Position new_offset. Der (von resolve_start_offset() geprüfte)
+    bisherige Fingerprint gilt weiter, solange er dieselben Bytes abdeckt; sonst wird neu gelesen.
+    """
+    if fingerprint is not None and min(offset, FINGERPRINT_BYTES) == min(new_offset, FINGERPRINT_BYTES):
+        return fingerprint
+    return file_fingerprint(file_path, new_offset)
+
+def parse_log_events(file_path, offset, player, final=False):
+    """
+    Reads file_path from the byte offset and returns (events, new_offset).
+    events contains tuples for the kills table where player is killer or victim.
+    final=True also parses an unterminated last line (see read_complete_chunks()).
+    Does not touch the database, so it can run in worker processes.
+    """
+    events = []
+    new_offset = offset
+    for chunk, chunk_end in read_complete_chunks(file_path, offset, final):
+        for raw_line in iter_candidate_lines(chunk):
+            event = parse_log_line_bytes(raw_line)
+            if event:
+                killer = event["killer"].strip().lower()
+                victim = event["killed_player"].strip().lower()
+                # Only store events where the current player is killer or victim
+                if killer == player or victim == player:
+                    logger.debug(f"Kill-Event gefunden: {victim} getötet von {killer} in {event['zone']}")
+                    events.append((
+                        event["timestamp"],
+                        event["killed_player"],
+                        event["killer"],
+                        event["zone"],
+                        event["weapon"],
+                        event["class"],
+                        event["damage_type"]
+                    ))
+        new_offset = chunk_end
+    return events, new_offset
+
+def _parse_backup_log_job(job):
+    """
+    Worker-Funktion für den parallelen Import. Läuft in einem eigenen Prozess.
+    Gibt (file_path, events, position, error) zurück, position wie in commit_ingest_batch().
+    """
+    file_path, offset, fingerprint, player = job
+    try:
+        offset, fingerprint = resolve_start_offset(file_path, offset, fingerprint)
+        events, new_offset = parse_log_events(file_path, offset, player, final=True)
+        return file_path, events, (file_path, new_offset, advance_fingerprint(file_path, offset, fingerprint, new_offset)), None
+    except Exception as e:
+        return file_path, [], None, str(e)
+
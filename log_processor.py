@@ -1,7 +1,9 @@
 import os
-import re
+import threading
+import multiprocessing
 import config
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Stelle sicher, dass die Konfiguration vor allem anderen geladen wird
@@ -11,6 +13,10 @@ if not config.CURRENT_PLAYER_NAME and os.path.exists(config.CONFIG_FILE):
 # Erst NACH dem Laden der Konfiguration weitere Module importieren
 import database
 import npc_handler
+from log_parser import (
+    FINGERPRINT_BYTES, file_fingerprint, resolve_start_offset, advance_fingerprint, parse_log_events,
+    _parse_backup_log_job, normalize_log_path,
+)
 
 # Initialisiere den Logger korrekt
 logger = logging.getLogger(__name__)
@@ -30,109 +36,285 @@ except database.DatabaseError as e:
     except database.DatabaseError as db_error:
         logger.critical(f"Datenbank konnte nicht initialisiert werden: {str(db_error)}")
 
-ACTOR_DEATH_REGEX = re.compile(
-    r"^<(?P<timestamp>[^>]+)>.*?<Actor Death>.*?'(?P<killed_player>[^']+)' \[\d+\].*?"
-    r"in zone '(?P<zone>[^']+)'"
-    r".*?killed by '(?P<killer>[^']+)' \[\d+\].*?using '(?P<weapon>[^']+)' \[Class (?P<class>[^]]+)\].*?"
-    r"with damage type '(?P<damage_type>[^']+)'",
-    re.IGNORECASE
-)
+# Ein Lock pro Log-Datei, damit eine Datei nie von zwei Threads gleichzeitig eingelesen wird
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+NPC_PREFIXES = npc_handler.NPC_PREFIXES
+
+# Ein Event wird nur gespeichert, wenn es noch keines mit denselben sieben Feldern gibt. Gesucht
+# wird über den Integer-Index des Dedup-Schlüssels (database.event_hash()); die Felder selbst
+# werden nur für Zeilen mit gleichem Schlüssel verglichen, eine Kollision verwirft kein Event.
+INSERT_KILL_QUERY = """\
+    INSERT INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type,
+                       direction, opponent_name, opponent_category, event_hash)
+    SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+    WHERE NOT EXISTS (
+        SELECT 1 FROM kills INDEXED BY idx_kills_event_hash
+        WHERE event_hash = ?11 AND timestamp IS ?1 AND killed_player IS ?2 AND killer IS ?3
+          AND zone IS ?4 AND weapon IS ?5 AND damage_class IS ?6 AND damage_type IS ?7
+    )
+"""
+
+UPDATE_POSITION_QUERY = """\
+    INSERT OR REPLACE INTO file_positions (file_path, last_offset, fingerprint)
+    VALUES (?, ?, ?)
+"""
+
+UPSERT_BACKUP_MANIFEST_QUERY = """\
+    INSERT OR REPLACE INTO backup_manifest (file_path, file_size, file_mtime_ns, fingerprint, completed)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Backup-Manifest je DB (database.get_db_key()) im Speicher (siehe _load_backup_manifest()); der Lock
+# sorgt zugleich dafür, dass nur ein Backup-Import gleichzeitig läuft
+_backup_manifests = {}
+_backup_manifest_lock = threading.Lock()
+
+# Empfänger der Benachrichtigungen über neu gespeicherte Events (siehe add_ingest_listener())
+_ingest_listeners = []
+_listeners_lock = threading.Lock()
+
+# Anzahl Events, ab der der parallele Import einen Block in die Datenbank schreibt
+IMPORT_BATCH_SIZE = 20000
+
+def retire_position(offset, fingerprint):
+    """
+    Merkt sich die letzte Position einer ersetzten Log-Datei (z.B. Game.log nach einem Neustart
+    des Spiels). Das Spiel verschiebt die alte Datei nach logbackups, wo sie über
+    claim_rotated_position() anhand des Fingerprints wiedererkannt wird.
+    Hat ein Backup die Position bereits übernommen, solange sie noch die des Live-Logs war,
+    liegt dafür ein Eintrag mit claimed = 1 vor: dann wird nur dieser entfernt.
+    """
+    if fingerprint is None or offset <= 0:
+        return
+    with database.transaction() as cursor:
+        cursor.execute(
+            "DELETE FROM retired_positions WHERE fingerprint = ? AND last_offset = ? AND claimed = 1",
+            (fingerprint, offset)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                "INSERT OR REPLACE INTO retired_positions (fingerprint, last_offset, claimed) VALUES (?, ?, 0)",
+                (fingerprint, offset)
+            )
+
+def get_rotation_candidates():
+    """
+    Returns (last_offset, fingerprint, retired) for every position a newly appearing backup log
+    may continue from: retired positions of replaced files and the current positions of all
+    files outside BACKUP_FOLDER (the live Game.log may be rotated before it is read again).
+    """
+    backup_folder = normalize_log_path(config.BACKUP_FOLDER)
+    candidates = [
+        (offset, fingerprint, True)
+        for fingerprint, offset in database.fetch_query(
+            "SELECT fingerprint, last_offset FROM retired_positions WHERE claimed = 0"
+        ) or []
+    ]
+    for path, offset, fingerprint in database.fetch_query(
+        "SELECT file_path, last_offset, fingerprint FROM file_positions WHERE fingerprint IS NOT NULL"
+    ) or []:
+        if os.path.dirname(path) != backup_folder:
+            candidates.append((offset, fingerprint, False))
+    return candidates
+
+def find_rotated_position(file_path, candidates):
+    """
+    Returns the candidate (last_offset, fingerprint, retired) whose fingerprint matches the start
+    of file_path, preferring the largest offset, or None. Each distinct fingerprint length is
+    read only once.
+    """
+    size = os.path.getsize(file_path)
+    heads = {}
+    match = None
+    for offset, fingerprint, retired in candidates:
+        if offset <= 0 or offset > size or (match and match[0] >= offset):
+            continue
+        length = min(offset, FINGERPRINT_BYTES)
+        if length not in heads:
+            heads[length] = file_fingerprint(file_path, length)
+        if heads[length] == fingerprint:
+            match = (offset, fingerprint, retired)
+    return match
+
+def claim_rotated_position(file_path, candidates=None):
+    """
+    Für eine Datei ohne gespeicherte Position: Ist sie ein rotiertes Game.log, das bereits live
+    eingelesen wurde, wird dessen Position übernommen und gespeichert, sodass nur der ungelesene
+    Rest gelesen wird. candidates wie get_rotation_candidates() (wird sonst abgefragt).
+
+    Returns:
+        tuple: (offset, fingerprint) zum Weiterlesen, (0, None) wenn keine Position passt
+    """
+    if candidates is None:
+        candidates = get_rotation_candidates()
+    match = find_rotated_position(file_path, candidates)
+    if match is None:
+        return 0, None
+    offset, fingerprint, retired = match
+    with database.transaction() as cursor:
+        cursor.execute(UPDATE_POSITION_QUERY, (file_path, offset, fingerprint))
+        if retired:
+            cursor.execute(
+                "DELETE FROM retired_positions WHERE fingerprint = ? AND last_offset = ?", (fingerprint, offset)
+            )
+        else:
+            # Die Position gehört noch dem Live-Log: vermerken, dass sie beim Ersetzen des
+            # Live-Logs (retire_position()) nicht mehr aufgehoben werden muss
+            cursor.execute(
+                "INSERT OR REPLACE INTO retired_positions (fingerprint, last_offset, claimed) VALUES (?, ?, 1)",
+                (fingerprint, offset)
+            )
+    if retired:
+        candidates.remove(match)
+    logger.info(f"{os.path.basename(file_path)} ist ein rotiertes Log, lese ab Byte {offset} weiter")
+    return offset, fingerprint
+
+def categorize_event_npcs(events, cursor):
+    """
+    Auto-categorizes all NPCs (by prefix) that appear as killer or victim in events with one
+    batch lookup and one bulk insert on cursor, i.e. in the caller's transaction.
+
+    Returns:
+        dict: cleaned NPC name -> category for all NPCs of the events
+    """
+    # Die Regeln können jederzeit neu geladen werden (npc_handler.reload_category_rules()):
+    # gespeicherte Kategorien dieser DB vor dem Speichern neuer NPCs auf die aktiven Regeln bringen
+    npc_handler.refresh_stored_categories(cursor)
+
+    names = dict.fromkeys(val.strip().lower() for event in events for val in (event[1], event[2]))
+    return npc_handler.categorize_npcs([name for name in names if name.startswith(NPC_PREFIXES)], cursor)
+
+def resolve_event_opponents(events, categories):
+    """
+    Appends (direction, opponent_name, opponent_category) and the dedup key (database.event_hash)
+    to every event as stored by INSERT_KILL_QUERY. categories maps cleaned NPC names to their
+    category (categorize_event_npcs).
+    """
+    player_lower = (config.CURRENT_PLAYER_NAME or "").lower()
+    return [
+        tuple(event) + npc_handler.resolve_opponent(event[2], event[1], player_lower, categories)
+        + (database.event_hash(*event),)
+        for event in events
+    ]
+
+def add_ingest_listener(callback):
+    """
+    Registers callback(count), called after every ingest commit that stored count > 0 new
+    kill events. It runs in the ingesting thread, so it should only hand the notification
+    over (e.g. queue.Queue.put) and return.
+    """
+    with _listeners_lock:
+        _ingest_listeners.append(callback)
 
-def parse_log_line(line):
-    """Parses a single log line using ACTOR_DEATH_REGEX, returns dict if matched."""
-    match = ACTOR_DEATH_REGEX.match(line)
-    if match:
-        return match.groupdict()
-    return None
+def remove_ingest_listener(callback):
+    """Entfernt einen mit add_ingest_listener() registrierten Empfänger."""
+    with _listeners_lock:
+        if callback in _ingest_listeners:
+            _ingest_listeners.remove(callback)
+
+def _publish_ingest(count):
+    """Benachrichtigt alle Empfänger über count neu gespeicherte Events."""
+    with _listeners_lock:
+        listeners = list(_ingest_listeners)
+    for callback in listeners:
+        try:
+            callback(count)
+        except Exception as e:
+            logger.error(f"Fehler beim Benachrichtigen über neue Events: {str(e)}", exc_info=True)
+
+def commit_ingest_batch(events, positions):
+    """
+    Ingestion unit of work: writes the kill events, the NPC categories of the new NPCs
+    and the new file positions (list of (file_path, last_offset, fingerprint)) in a single transaction.
+    Either everything is stored or nothing, so a crash can never leave offsets that
+    point behind events which were not saved (or vice versa).
+    After the commit the ingest listeners are notified if new events were stored.
+
+    Returns:
+        int: Anzahl neu gespeicherter Events (Duplikate nicht mitgezählt)
+
+    Raises:
+        database.DatabaseError: Wenn die Transaktion fehlschlägt (sie wurde dann zurückgerollt)
+    """
+    inserted = 0
+    with database.transaction() as cursor:
+        if events:
+            categories = categorize_event_npcs(events, cursor)
+            cursor.executemany(INSERT_KILL_QUERY, resolve_event_opponents(events, categories))
+            inserted = cursor.rowcount
+        cursor.executemany(UPDATE_POSITION_QUERY, positions)
+    if inserted > 0:
+        _publish_ingest(inserted)
+    return inserted
+
+def _get_file_lock(file_path):
+    """Lock einer Log-Datei; file_path ist bereits normalisiert (normalize_log_path())."""
+    with _file_locks_lock:
+        return _file_locks.setdefault(file_path, threading.Lock())
+
+def process_log_file(file_path, final=False):
+    """
+    Reads new lines from file_path, extracts kill events for the current player, saves to DB.
+    final=True for files that no longer grow (backup logs): an unterminated last line is read too.
+    Calls for the same file from different threads (ingest worker, GUI refresh) run one after another.
+    Returns True if the file was read and everything new was stored, False on errors.
+    The position is stored under the normalized path (normalize_log_path()), so every
+    spelling of the same file shares one offset and one lock.
+    """
+    file_path = normalize_log_path(file_path)
+    with _get_file_lock(file_path):
+        return _process_log_file(file_path, final)
 
-def process_log_file(file_path):
-    """Reads new lines from file_path, extracts kill events for the current player, saves to DB."""
+def _process_log_file(file_path, final):
     if not os.path.exists(file_path):
         logger.warning(f"Log-Datei existiert nicht: {file_path}")
-        return
+        return False
 
     # Log start
     logger.info(f"Starting to read log: {file_path}")
 
     try:
         offset_res = database.fetch_query(
-            "SELECT last_offset FROM file_positions WHERE file_path = ?", (file_path,)
+            "SELECT last_offset, fingerprint FROM file_positions WHERE file_path = ?", (file_path,)
         )
-        offset = offset_res[0][0] if offset_res else 0
-
-        new_events = []
         player = config.CURRENT_PLAYER_NAME.strip().lower() if config.CURRENT_PLAYER_NAME else ""
         if not player:
             logger.warning("Kein Spielername konfiguriert, überspringe Log-Verarbeitung")
-            return
-            
-        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-            f.seek(offset)
-            for line in f:
-                event = parse_log_line(line.strip())
-                if event:
-                    killer = event["killer"].strip().lower()
-                    victim = event["killed_player"].strip().lower()
-                    # Only store events where the current player is killer or victim
-                    if killer == player or victim == player:
-                        logger.debug(f"Kill-Event gefunden: {victim} getötet von {killer} in {event['zone']}")
-                        # Auto-categorize NPCs - erweitert um weitere NPC-Präfixe
-                        for key in ("killed_player", "killer"):
-                            val = event[key].strip().lower()
-                            if val.startswith(("pu_", "vlk_", "kopion_", "quasigrazer_")):
-                                try:
-                                    npc_handler.save_npc_category(val, "uncategorized")
-                                except Exception as e:
-                                    logger.error(f"Fehler bei NPC-Kategorisierung: {str(e)}")
-
-                        new_events.append((
-                            event["timestamp"],
-                            event["killed_player"],
-                            event["killer"],
-                            event["zone"],
-                            event["weapon"],
-                            event["class"],
-                            event["damage_type"]
-                        ))
-
-        if new_events:
-            try:
-                database.execute_many("""\
-                    INSERT OR IGNORE INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, new_events)
-                logger.info(f"Stored {len(new_events)} new events from {file_path}")
-            except database.DatabaseError as e:
-                logger.error(f"Fehler beim Speichern von Ereignissen: {str(e)}")
-                # Tabellen neu initialisieren und erneut versuchen
-                try:
-                    database.init_db()
-                    database.execute_many("""\
-                        INSERT OR IGNORE INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, new_events)
-                    logger.info(f"Nach Neuinitialisierung: {len(new_events)} Ereignisse gespeichert")
-                except database.DatabaseError as retry_error:
-                    logger.error(f"Speichern nach Neuinitialisierung fehlgeschlagen: {str(retry_error)}")
-                    return  # Beenden, wenn auch nach Neuinitialisierung ein Fehler auftritt
-
-        new_offset = os.path.getsize(file_path)
+            return False
+
+        if offset_res:
+            stored = offset_res[0]
+        else:
+            # Neue Datei: ggf. ein bereits live gelesenes, nach logbackups rotiertes Game.log
+            stored = claim_rotated_position(file_path)
+
+        # Rotiertes oder gekürztes Game.log: ab Byte 0 der neuen Datei lesen und die alte
+        # Position für das rotierte Backup aufheben
+        offset, fingerprint = resolve_start_offset(file_path, *stored)
+        if (offset, fingerprint) != tuple(stored):
+            retire_position(*stored)
+        new_events, new_offset = parse_log_events(file_path, offset, player, final)
+        if not new_events and new_offset == offset:
+            # Nichts Neues gelesen, keine Schreiboperation nötig
+            logger.info(f"Finished reading log: {file_path}")
+            return True
+
+        position = (file_path, new_offset, advance_fingerprint(file_path, offset, fingerprint, new_offset))
         try:
-            database.execute_query("""\
-                INSERT OR REPLACE INTO file_positions (file_path, last_offset)
-                VALUES (?, ?)
-            """, (file_path, new_offset))
+            commit_ingest_batch(new_events, [position])
+            logger.info(f"Stored {len(new_events)} new events from {file_path}")
         except database.DatabaseError as e:
-            logger.error(f"Fehler beim Aktualisieren der Dateiposition: {str(e)}")
+            logger.error(f"Fehler beim Speichern von Ereignissen: {str(e)}")
             # Tabellen neu initialisieren und erneut versuchen
             try:
                 database.init_db()
-                database.execute_query("""\
-                    INSERT OR REPLACE INTO file_positions (file_path, last_offset)
-                    VALUES (?, ?)
-                """, (file_path, new_offset))
+                commit_ingest_batch(new_events, [position])
+                logger.info(f"Nach Neuinitialisierung: {len(new_events)} Ereignisse gespeichert")
             except database.DatabaseError as retry_error:
-                logger.error(f"Positionsaktualisierung nach Neuinitialisierung fehlgeschlagen: {str(retry_error)}")
+                logger.error(f"Speichern nach Neuinitialisierung fehlgeschlagen: {str(retry_error)}")
+                return False
             
     except Exception as e:
         logger.error(f"Allgemeiner Fehler bei der Verarbeitung von {file_path}: {str(e)}", exc_info=True)
@@ -141,28 +323,179 @@ def process_log_file(file_path):
             database.init_db()
         except database.DatabaseError as db_error:
             logger.error(f"Datenbank-Neuinitialisierung nach Fehler fehlgeschlagen: {str(db_error)}")
+        return False
 
     # Log finish
     logger.info(f"Finished reading log: {file_path}")
+    return True
+
+def _write_import_batch(events, positions):
+    """Schreibt gesammelte Events und Dateipositionen in einer einzigen Transaktion. Returns True on success."""
+    try:
+        commit_ingest_batch(events, positions)
+        logger.info(f"Stored {len(events)} events from {len(positions)} backup logs")
+        return True
+    except database.DatabaseError as e:
+        logger.error(f"Fehler beim Speichern eines Import-Blocks: {str(e)}")
+        return False
+
+def get_import_workers(workers=None):
+    """Returns the number of import worker processes (config.IMPORT_WORKERS, 0 = one per CPU core)."""
+    if workers is None:
+        workers = config.IMPORT_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
 
-def parse_all_backup_logs():
-    """Reads all backup logs once, so only new lines are processed for each."""
+def _parse_backup_logs_parallel(paths, workers):
+    """
+    Parst die Backup-Logs in einem Prozess-Pool. Die Worker lesen nur Dateien;
+    geschrieben wird ausschließlich hier in großen Transaktionen, in derselben
+    Reihenfolge wie beim seriellen Import.
+
+    Returns:
+        dict: file_path -> True, wenn die Datei fehlerfrei gelesen und gespeichert wurde
+    """
+    results = {}
+    player = config.CURRENT_PLAYER_NAME.strip().lower() if config.CURRENT_PLAYER_NAME else ""
+    if not player:
+        logger.warning("Kein Spielername konfiguriert, überspringe Log-Verarbeitung")
+        return results
+
+    rows = database.fetch_query("SELECT file_path, last_offset, fingerprint FROM file_positions") or []
+    known_positions = {path: (offset, fingerprint) for path, offset, fingerprint in rows}
+    candidates = get_rotation_candidates()
+    for path in paths:
+        if path not in known_positions:
+            known_positions[path] = claim_rotated_position(path, candidates)
+    jobs = [(path, *known_positions[path], player) for path in paths]
+
+    pending_events = []
+    pending_positions = []
+    # "spawn" statt fork: ein Fork aus dem GUI-Prozess könnte von laufenden Threads gehaltene
+    # Locks erben und blockieren. Die Worker importieren nur log_parser (ohne DB-Zugriff).
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for file_path, events, position, error in executor.map(_parse_backup_log_job, jobs):
+            if error:
+                logger.error(f"Fehler beim Verarbeiten von Backup-Log {os.path.basename(file_path)}: {error}")
+                results[file_path] = False
+                continue
+            pending_events.extend(events)
+            pending_positions.append(position)
+            if len(pending_events) >= IMPORT_BATCH_SIZE:
+                stored = _write_import_batch(pending_events, pending_positions)
+                results.update((path, stored) for path, _, _ in pending_positions)
+                pending_events = []
+                pending_positions = []
+
+    if pending_positions:
+        stored = _write_import_batch(pending_events, pending_positions)
+        results.update((path, stored) for path, _, _ in pending_positions)
+    return results
+
+def _load_backup_manifest():
+    """
+    Returns the in-memory backup manifest of the current DB: file_path -> (file_size,
+    file_mtime_ns, completed). It is read from backup_manifest once per DB file and connection
+    generation (after database.close_db() the file may have been deleted) and then only
+    updated by _store_backup_manifest(). Must be called with _backup_manifest_lock held.
+    """
+    db_key = database.get_db_key()
+    manifest = _backup_manifests.get(db_key)
+    if manifest is None:
+        rows = database.fetch_query(
+            "SELECT file_path, file_size, file_mtime_ns, completed FROM backup_manifest"
+        ) or []
+        manifest = {path: (size, mtime_ns, bool(completed)) for path, size, mtime_ns, completed in rows}
+        # Manifeste früherer Generationen werden nicht mehr gebraucht
+        for key in [key for key in _backup_manifests if key[1] != db_key[1]]:
+            del _backup_manifests[key]
+        _backup_manifests[db_key] = manifest
+    return manifest
+
+def _store_backup_manifest(manifest, entries):
+    """
+    Speichert Manifest-Einträge (file_path, file_size, file_mtime_ns, completed) in der DB und
+    im Speicher. Der Fingerprint (Dateianfang) wird nur für diese Dateien einmalig gelesen.
+    """
+    rows = []
+    for path, size, mtime_ns, completed in entries:
+        try:
+            fingerprint = file_fingerprint(path, size)
+        except OSError:
+            fingerprint = None
+        rows.append((path, size, mtime_ns, fingerprint, int(completed)))
+    try:
+        database.execute_many(UPSERT_BACKUP_MANIFEST_QUERY, rows)
+    except database.DatabaseError as e:
+        # Ohne gespeichertes Manifest werden die Dateien beim nächsten Mal erneut geprüft
+        logger.error(f"Fehler beim Speichern des Backup-Manifests: {str(e)}")
+        return
+    for path, size, mtime_ns, completed in entries:
+        manifest[path] = (size, mtime_ns, completed)
+
+def parse_all_backup_logs(workers=None):
+    """
+    Reads all new or changed backup logs, so only new lines are processed for each.
+    Backup logs do not change after rotation: a log that was read completely at its current
+    size and mtime (see backup_manifest) is skipped without being opened, so an idle refresh
+    costs a single scandir. With more than one worker (see get_import_workers) the logs are
+    parsed in parallel. If an import is already running, the call returns immediately.
+    """
     if not os.path.isdir(config.BACKUP_FOLDER):
         logger.warning(f"Backup-Ordner existiert nicht: {config.BACKUP_FOLDER}")
         return
-        
-    logs = [f for f in os.listdir(config.BACKUP_FOLDER) if f.lower().endswith(".log")]
-    logs.sort()
-    
-    logger.info(f"Parsing {len(logs)} backup logs from {config.BACKUP_FOLDER}")
-    
-    for lf in logs:
-        full_path = os.path.join(config.BACKUP_FOLDER, lf)
-        try:
-            process_log_file(full_path)
-        except Exception as e:
-            logger.error(f"Fehler beim Verarbeiten von Backup-Log {lf}: {str(e)}")
-            # Fahre mit dem nächsten Log fort, auch wenn dieses fehlschlägt
+
+    if not _backup_manifest_lock.acquire(blocking=False):
+        logger.info("Backup-Import läuft bereits, überspringe")
+        return
+    try:
+        manifest = _load_backup_manifest()
+        changed = []
+        with os.scandir(config.BACKUP_FOLDER) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".log") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                path = normalize_log_path(entry.path)
+                if manifest.get(path) != (stat.st_size, stat.st_mtime_ns, True):
+                    changed.append((path, stat.st_size, stat.st_mtime_ns))
+        changed.sort()
+
+        if not changed:
+            logger.debug("Keine neuen oder geänderten Backup-Logs")
+            return
+        logger.info(f"Parsing {len(changed)} new or changed backup logs from {config.BACKUP_FOLDER}")
+
+        paths = [path for path, _, _ in changed]
+        results = None
+        workers = get_import_workers(workers)
+        if workers > 1 and len(paths) > 1:
+            try:
+                results = _parse_backup_logs_parallel(paths, min(workers, len(paths)))
+            except Exception as e:
+                logger.error(f"Paralleler Import fehlgeschlagen, verwende seriellen Import: {str(e)}", exc_info=True)
+
+        if results is None:
+            results = {}
+            for full_path in paths:
+                try:
+                    results[full_path] = process_log_file(full_path, final=True)
+                except Exception as e:
+                    logger.error(f"Fehler beim Verarbeiten von Backup-Log {os.path.basename(full_path)}: {str(e)}")
+                    # Fahre mit dem nächsten Log fort, auch wenn dieses fehlschlägt
+                    results[full_path] = False
+
+        # Vollständig gelesen ist ein Backup erst, wenn die gespeicherte Position am Dateiende steht
+        offsets = dict(database.fetch_query("SELECT file_path, last_offset FROM file_positions") or [])
+
+        # Größe und mtime von vor dem Lesen: ändert sich eine Datei währenddessen, wird sie erneut gelesen
+        _store_backup_manifest(manifest, [
+            (path, size, mtime_ns, results.get(path, False) and offsets.get(path, 0) == size)
+            for path, size, mtime_ns in changed
+        ])
+    finally:
+        _backup_manifest_lock.release()
 
 def get_backup_log_progress():
     """
@@ -179,7 +512,7 @@ def get_backup_log_progress():
     
     try:
         for lf in logs:
-            full_path = os.path.join(config.BACKUP_FOLDER, lf)
+            full_path = normalize_log_path(os.path.join(config.BACKUP_FOLDER, lf))
             res = database.fetch_query(
                 "SELECT last_offset FROM file_positions WHERE file_path = ?", (full_path,)
             )
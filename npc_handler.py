@@ -1,99 +1,392 @@
+import os
 import re
+import json
+import config
 import database
 import logging
+import threading
+from functools import lru_cache
 
 # Logger für diese Datei einrichten
 logger = logging.getLogger(__name__)
 
+# Präfixe, an denen Tiere erkannt werden
+ANIMAL_PREFIXES = ("vlk_", "kopion_", "quasigrazer_")
+
+# Präfixe von NPC-Namen, die beim Import automatisch kategorisiert werden
+NPC_PREFIXES = ("pu_",) + ANIMAL_PREFIXES
+
+UPDATE_KILL_CATEGORY_QUERY = """\
+    UPDATE kills SET opponent_category = ?
+    WHERE direction IN ('kill', 'death') AND opponent_name = ? COLLATE NOCASE
+"""
+
+UPSERT_NPC_CATEGORY_QUERY = """\
+    INSERT INTO npc_categories (npc_name, category) VALUES (?, ?)
+    ON CONFLICT (npc_name) DO NOTHING
+"""
+
+# Namen pro SELECT beim Nachschlagen gespeicherter Kategorien (Grenze für SQL-Parameter)
+CATEGORY_LOOKUP_CHUNK = 500
+
+# Anhängende numerische ID eines Namens, z. B. "_12345"
+ID_SUFFIX_REGEX = re.compile(r'_\d+$')
+
 def clean_npc_name(npc_name):
     """
     Removes trailing numeric IDs from an NPC name.
     Example: "pu_human_enemy_npc_juggernaut_12345" -> "pu_human_enemy_npc_juggernaut"
     """
-    return re.sub(r'_\d+$', '', npc_name.strip().lower())
+    name = npc_name.strip().lower()
+    if name[-1:].isdigit():
+        name = ID_SUFFIX_REGEX.sub('', name)
+    return name
+
+# Geordnete Kategorisierungsregeln, die erste passende Regel gewinnt. Bedingungen einer Regel
+# (alle optional, in Kleinbuchstaben mit dem bereinigten Namen in Kleinbuchstaben verglichen):
+#   prefixes: der Name beginnt mit einem dieser Präfixe
+#   all:      alle Stichwörter kommen im Namen vor
+#   any:      mindestens eines der Stichwörter kommt vor
+#   none:     keines der Stichwörter kommt vor
+# Passt keine Regel, ist die Kategorie "uncategorized".
+CATEGORY_RULES = [
+    # ARGO_ATLS_GEO und Hangar-Objekte mit "unknown" sind keine NPCs im eigentlichen Sinn
+    {"category": "unknown", "all": ["argo_atls_geo"]},
+    {"category": "unknown", "all": ["hangar", "unknown"]},
+    {"category": "animal", "prefixes": list(ANIMAL_PREFIXES)},
+    # NPC_Archetypes - diese sollten NIEMALS als Spieler klassifiziert werden
+    {"category": "ground", "all": ["npc_archetypes"], "any": ["soldier", "juggernaut"]},
+    {"category": "pilot", "all": ["npc_archetypes"], "any": ["pilot"]},
+    {"category": "technical", "all": ["npc_archetypes"], "any": ["techie", "technical"]},
+    {"category": "civilian", "all": ["npc_archetypes"], "any": ["prisoner", "civilian"]},
+    {"category": "ground", "all": ["npc_archetypes"]},
+    # Hazard-Dungeon-NPCs: Executives, Medics, sonst Bodentruppen
+    {"category": "ground", "all": ["hazard", "dungeon", "exec"]},
+    {"category": "technical", "all": ["hazard", "dungeon", "med"]},
+    {"category": "ground", "all": ["hazard", "dungeon"]},
+    {"category": "pilot", "any": ["pilot"]},
+    {"category": "gunner", "any": ["gunner"]},
+    {"category": "ground", "any": ["ground", "soldier", "cqc", "juggernaut", "sniper", "gangster", "grunt",
+                                   "kareah", "militia", "superboss", "exec", "executive"]},
+    {"category": "civilian", "any": ["civilian"]},
+    {"category": "civilian", "all": ["populace"], "none": ["worker"]},
+    {"category": "worker", "any": ["worker", "shopkeeper", "vendor", "gardener", "farmer"]},
+    {"category": "lawenforcement", "any": ["law", "security", "guard"]},
+    {"category": "pirate", "any": ["pirate"]},
+    {"category": "technical", "any": ["engineer", "technical", "techie", "medic"]},
+    {"category": "test", "any": ["test"]},
+    # Allgemeine Cheesecake-Archetypes und sonstige Hazard-NPCs als Grundeinheit einstufen
+    {"category": "ground", "any": ["cheesecake", "hazard"]},
+]
+
+# Anzahl bereinigter Namen, deren Kategorie zwischengespeichert wird
+CATEGORY_CACHE_SIZE = 65536
+
+RULE_CONDITIONS = ("prefixes", "all", "any", "none")
+
+def _compile_rule(rule):
+    """
+    Validiert eine Regel und gibt sie als Tupel (category, prefixes, all, any, none) zurück.
+    Kategorie und Stichwörter werden in Kleinbuchstaben umgewandelt, da sie mit dem
+    bereinigten Namen in Kleinbuchstaben verglichen werden.
+    """
+    if (not isinstance(rule, dict) or set(rule) - {"category", *RULE_CONDITIONS}
+            or not isinstance(rule.get("category"), str) or not rule["category"].strip()):
+        raise ValueError(f"Ungültige Kategorisierungsregel: {rule!r}")
+    conditions = []
+    for key in RULE_CONDITIONS:
+        values = rule.get(key, ())
+        if not isinstance(values, (list, tuple)) or not all(isinstance(value, str) and value for value in values):
+            raise ValueError(f"Ungültige Kategorisierungsregel: {rule!r}")
+        conditions.append(tuple(value.lower() for value in values))
+    return (rule["category"].strip().lower(), *conditions)
+
+def compile_category_rules(rules):
+    """
+    Compiles an ordered rule list (format see CATEGORY_RULES) into a function
+    cleaned_name -> category. The rules are validated and lowercased once into tuples;
+    matching walks them in order with plain substring tests and stops at the first rule
+    whose conditions all hold.
+
+    Raises:
+        ValueError: Wenn eine Regel ungültig ist (unbekannter Schlüssel, Bedingungen keine Listen
+            nicht-leerer Strings)
+    """
+    compiled = tuple(_compile_rule(rule) for rule in rules)
+
+    def categorize(name):
+        # for/else statt all()/any(): ohne Generator pro Regel deutlich schneller
+        for category, prefixes, all_keywords, any_keywords, none_keywords in compiled:
+            if prefixes and not name.startswith(prefixes):
+                continue
+            for keyword in all_keywords:
+                if keyword not in name:
+                    break
+            else:
+                if any_keywords:
+                    for keyword in any_keywords:
+                        if keyword in name:
+                            break
+                    else:
+                        continue
+                for keyword in none_keywords:
+                    if keyword in name:
+                        break
+                else:
+                    return category
+        return "uncategorized"
+
+    return categorize
+
+_builtin_match = compile_category_rules(CATEGORY_RULES)
+
+# Aktive Regeln: Funktion und Regelliste werden nur zusammen unter _rules_lock getauscht.
+# _applied_rules hält je DB (database.get_db_key()) die Funktion, mit der ihre gespeicherten Kategorien
+# zuletzt abgeglichen wurden (siehe refresh_stored_categories()).
+_match_category = _builtin_match
+_active_rules = CATEGORY_RULES
+_applied_rules = {}
+_rules_lock = threading.RLock()
+
+RULES_FILE_DESCRIPTION = (
+    "Regeln für die automatische NPC-Kategorisierung. Die erste passende Regel gewinnt. "
+    "Bedingungen (alle optional, Groß-/Kleinschreibung egal): prefixes = Name beginnt mit einem davon, "
+    "all = alle Stichwörter kommen vor, any = mindestens eines, none = keines. "
+    "Änderungen werden automatisch übernommen."
+)
+
+@lru_cache(maxsize=CATEGORY_CACHE_SIZE)
+def _categorize_cleaned(name, match):
+    """
+    Kategorie eines bereinigten Namens nach der Regelfunktion match, zwischengespeichert pro
+    Name und Funktion: ein Ergebnis der bisherigen Regeln wird nach einem Neuladen nie geliefert.
+    """
+    return match(name)
 
 def auto_categorize_npc(npc_name):
     """
-    Automatically determines a category for an NPC based on keywords in the cleaned name.
-    Returns one of: pilot, gunner, ground, civilian, worker, lawenforcement, pirate, technical, test, animal, or uncategorized.
+    Automatically determines a category for an NPC based on keywords in the cleaned name
+    (see CATEGORY_RULES). Returns one of: pilot, gunner, ground, civilian, worker,
+    lawenforcement, pirate, technical, test, animal, unknown or uncategorized.
     """
-    name = clean_npc_name(npc_name).lower()
-    
-    # Spezielle Regel für ARGO_ATLS_GEO - als "unknown" kategorisieren
-    if "argo_atls_geo" in name:
-        logger.debug(f"NPC {npc_name} als 'unknown' kategorisiert (ARGO_ATLS_GEO)")
-        return "unknown"
-    
-    # Erweiterte Kategorisierung: Alle Namen mit "hangar" und "unknown" als "unknown" klassifizieren
-    if "hangar" in name.lower() and "unknown" in name.lower():
-        logger.debug(f"NPC {npc_name} als 'unknown' kategorisiert (enthält 'hangar' und 'unknown')")
+    return _categorize_cleaned(clean_npc_name(npc_name), _match_category)
+
+def categorize_many(npc_names, match=None):
+    """
+    Batch variant of auto_categorize_npc(). match is the rule function to use
+    (default: the active rules).
+
+    Returns:
+        dict: given name -> category
+    """
+    match = match or _match_category
+    return {npc_name: _categorize_cleaned(clean_npc_name(npc_name), match) for npc_name in npc_names}
+
+def save_category_rules(rules, path=None):
+    """Writes the rule list as JSON rule file (default config.NPC_RULES_FILE)."""
+    path = path or config.NPC_RULES_FILE
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"description": RULES_FILE_DESCRIPTION, "rules": rules}, f, indent=2, ensure_ascii=False)
+
+def load_category_rules(path=None):
+    """
+    Loads the rule list from the JSON rule file (default config.NPC_RULES_FILE).
+    If the file does not exist yet, it is created with the built-in CATEGORY_RULES.
+
+    Raises:
+        OSError: Wenn die Datei nicht gelesen werden kann
+        ValueError: Wenn die Datei kein gültiges JSON-Regelformat enthält
+    """
+    path = path or config.NPC_RULES_FILE
+    if not os.path.exists(path):
+        save_category_rules(CATEGORY_RULES, path)
+        return CATEGORY_RULES
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    rules = data.get("rules") if isinstance(data, dict) else None
+    if not isinstance(rules, list) or not all(isinstance(rule, dict) for rule in rules):
+        raise ValueError(f"{os.path.basename(path)} enthält keine Liste 'rules' mit Regeln")
+    return rules
+
+def _recategorize_stored(cursor, match, old_match):
+    """
+    Gleicht die gespeicherten Kategorien auf cursor mit der Regelfunktion match ab: nur NPCs in
+    npc_categories, deren Kategorie sich ändert, werden aktualisiert (Bulk-UPDATE), ebenso
+    kills.opponent_category nur für Gegner mit geänderter Kategorie. Die Gegner stammen aus
+    daily_opponent_counts, die kills-Tabelle wird nicht durchsucht. Kategorien, die weder
+    "uncategorized" sind noch von old_match stammen, wurden von Hand gesetzt und bleiben.
+
+    Returns:
+        int: Anzahl NPCs mit geänderter Kategorie
+    """
+    stored = dict(cursor.execute("SELECT npc_name, category FROM npc_categories").fetchall())
+    new_categories = categorize_many(stored, match)
+    changed = [(new_categories[name], name) for name, category in stored.items()
+               if new_categories[name] != category and category in ("uncategorized", old_match(name))]
+    cursor.executemany("UPDATE npc_categories SET category=? WHERE npc_name=?", changed)
+    stored.update((name, category) for category, name in changed)
+
+    kill_updates = {}
+    for name, category in cursor.execute("""
+        SELECT DISTINCT opponent_name, opponent_category FROM daily_opponent_counts
+        WHERE direction IN ('kill', 'death')
+    """).fetchall():
+        cleaned = name.lower()
+        new_category = entity_category(cleaned, stored.get(cleaned))
+        if new_category != category:
+            kill_updates[cleaned] = (new_category, name)
+    cursor.executemany(UPDATE_KILL_CATEGORY_QUERY, list(kill_updates.values()))
+    return len(changed)
+
+def refresh_stored_categories(cursor):
+    """
+    Ensures the stored categories of the current DB follow the active rules, inside the
+    caller's transaction on cursor (e.g. an ingest batch). Does nothing if they were already
+    matched against the active rules; otherwise, e.g. after the rules were reloaded while
+    another player's DB was active, it runs the same update as apply_category_rules().
+
+    Returns:
+        int: Anzahl NPCs mit geänderter Kategorie
+    """
+    db_key = database.get_db_key()
+    match = _match_category
+    applied = _applied_rules.get(db_key)
+    if applied is match:
+        return 0
+    changed = _recategorize_stored(cursor, match, applied or _builtin_match)
+    _applied_rules[db_key] = match
+    if changed:
+        logger.info(f"{changed} NPCs nach den aktuellen Regeln neu kategorisiert")
+    return changed
+
+def apply_category_rules(rules):
+    """
+    Activates a new rule list and transfers it to the current player's DB in one transaction
+    (see _recategorize_stored()). The rules are swapped inside that transaction: an ingest
+    batch waits for the write lock and then already categorizes with the new rules, while
+    NPCs stored by a batch that committed earlier are updated by this transaction.
+    The commit changes the data version, which invalidates the stats caches.
+
+    Returns:
+        int: Anzahl NPCs mit geänderter Kategorie
+
+    Raises:
+        ValueError: Wenn die Regeln ungültig sind (die bisherigen bleiben aktiv)
+        database.DatabaseError: Bei Datenbankfehlern (die bisherigen Regeln bleiben aktiv)
+    """
+    global _match_category, _active_rules
+    match = compile_category_rules(rules)
+    with _rules_lock:
+        old_match, old_rules = _match_category, _active_rules
+        db_key = database.get_db_key()
+        if not db_key[0]:
+            _match_category, _active_rules = match, rules
+            _categorize_cleaned.cache_clear()
+            return 0
+
+        old_applied = _applied_rules.get(db_key)
+        try:
+            with database.transaction() as cursor:
+                _match_category, _active_rules = match, rules
+                _applied_rules[db_key] = match
+                changed = _recategorize_stored(cursor, match, old_applied or old_match)
+        except BaseException:
+            _match_category, _active_rules = old_match, old_rules
+            _applied_rules[db_key] = old_applied
+            raise
+        # Einträge der bisherigen Regeln werden nicht mehr abgefragt
+        _categorize_cleaned.cache_clear()
+        return changed
+
+def reload_category_rules(path=None):
+    """
+    Loads the rule file and applies it with apply_category_rules(), unless the same rules are
+    already applied to the current DB. Errors are logged, the current rules stay active.
+
+    Returns:
+        bool: True, wenn neue Regeln übernommen wurden
+    """
+    try:
+        rules = load_category_rules(path)
+        with _rules_lock:
+            if rules == _active_rules and _applied_rules.get(database.get_db_key()) is _match_category:
+                return False
+            changed = apply_category_rules(rules)
+        logger.info(f"NPC-Regeln geladen: {len(rules)} Regeln, {changed} NPCs neu kategorisiert")
+        return True
+    except (OSError, ValueError) as e:
+        logger.error(f"NPC-Regeldatei konnte nicht geladen werden: {str(e)}")
+    except database.DatabaseError as e:
+        logger.error(f"Fehler beim Übernehmen der NPC-Regeln: {str(e)}")
+    return False
+
+def entity_category(cleaned_name, npc_category=None):
+    """
+    Resolves the entity category of a cleaned (lowercase, ID-free) killer/victim name:
+    "unknown", "players" or "npc_<category>". npc_category is the category stored in
+    npc_categories for this name (None if there is none). This is the one classification
+    chain used for the materialized kills.opponent_category column.
+    """
+    if cleaned_name == "unknown" or ("hangar" in cleaned_name and "unknown" in cleaned_name):
         return "unknown"
-    
-    # Tierkategorisierung basierend auf Präfixen
-    if any(name.startswith(prefix) for prefix in ["vlk_", "kopion_", "quasigrazer_"]):
-        return "animal"
-        
-    # NPC_Archetypes-Kategorisierung - diese sollten NIEMALS als Spieler klassifiziert werden
-    if "npc_archetypes" in name:
-        if "soldier" in name or "juggernaut" in name:
-            return "ground"
-        elif "pilot" in name:
-            return "pilot"
-        elif "techie" in name or "technical" in name:
-            return "technical"
-        elif "prisoner" in name or "civilian" in name:
-            return "civilian"
-        else:
-            # Allgemeine NPC_Archetypes als Grundeinheit einstufen
-            return "ground"
-    
-    # Hazard-Dungeon-NPCs erkennen (außer den speziell behandelten Fall)
-    if "hazard" in name and "dungeon" in name:
-        if "exec" in name:
-            return "ground"  # Executive NPCs in Hazard-Dungeons
-        elif "medic" in name or "med" in name:
-            return "technical"  # Medics in Hazard-Dungeons
-        else:
-            return "ground"  # Standard-Einstufung für Hazard-Dungeon-NPCs
-    
-    if "pilot" in name:
-        return "pilot"
-    if "gunner" in name:
-        return "gunner"
-    if any(k in name for k in ["ground", "soldier", "cqc", "juggernaut", "sniper",
-                               "gangster", "grunt", "kareah", "militia", "superboss",
-                               "exec", "executive"]):
-        return "ground"
-    if "civilian" in name or ("populace" in name and "worker" not in name):
-        return "civilian"
-    if any(k in name for k in ["worker", "shopkeeper", "vendor", "gardener", "farmer"]):
-        return "worker"
-    if any(k in name for k in ["law", "security", "guard"]):
-        return "lawenforcement"
-    if "pirate" in name:
-        return "pirate"
-    if any(k in name for k in ["engineer", "technical", "techie", "medic"]):
-        return "technical"
-    if "test" in name:
-        return "test"
-    # Allgemeine Cheesecake-Archetypes als Grundeinheit einstufen
-    if "cheesecake" in name:
-        return "ground"
-    # Wenn 'hazard' im Namen ist, aber nicht genauer kategorisiert werden kann
-    if "hazard" in name:
-        return "ground"
-    return "uncategorized"
-
-def get_npc_category(npc_name):
+    # NPC_Archetypes und Hazard-Dungeon-NPCs sind immer NPCs, auch ohne pu_-Präfix
+    if "npc_archetypes" in cleaned_name or ("hazard" in cleaned_name and "dungeon" in cleaned_name):
+        return f"npc_{auto_categorize_npc(cleaned_name)}"
+    if cleaned_name.startswith(ANIMAL_PREFIXES):
+        return "npc_animal"
+    if cleaned_name.startswith("pu_"):
+        return f"npc_{npc_category or 'uncategorized'}"
+    return "players"
+
+def resolve_opponent(killer, killed_player, player_lower, npc_categories):
+    """
+    Returns (direction, opponent_name, opponent_category) of a kill event from the point
+    of view of the player: direction is "kill", "death", "suicide" or None (player not involved).
+    opponent_name keeps the original spelling without the trailing ID.
+    npc_categories maps cleaned NPC names to their stored category.
+    """
+    killer_is_player = killer.lower() == player_lower
+    victim_is_player = killed_player.lower() == player_lower
+    if killer_is_player and victim_is_player:
+        return "suicide", None, None
+    if killer_is_player:
+        direction, opponent = "kill", killed_player
+    elif victim_is_player:
+        direction, opponent = "death", killer
+    else:
+        return None, None, None
+    opponent_name = re.sub(r'_\d+$', '', opponent.strip())
+    cleaned = opponent_name.lower()
+    return direction, opponent_name, entity_category(cleaned, npc_categories.get(cleaned))
+
+def update_kill_categories(npc_names, cursor=None):
+    """
+    Transfers the current categories of the given cleaned NPC names to the materialized
+    kills.opponent_category column. Must be called whenever npc_categories changes.
+    """
+    updates = []
+    for npc_name in npc_names:
+        updates.append((entity_category(npc_name, get_npc_category(npc_name, cursor)), npc_name))
+    if not updates:
+        return
+    if cursor is not None:
+        cursor.executemany(UPDATE_KILL_CATEGORY_QUERY, updates)
+    else:
+        database.execute_many(UPDATE_KILL_CATEGORY_QUERY, updates)
+
+def get_npc_category(npc_name, cursor=None):
     """
     Returns the category for the cleaned NPC name from DB, or None if not found.
+    If cursor is given, the query runs on it (e.g. inside database.transaction()).
     """
     try:
         cleaned = clean_npc_name(npc_name)
-        res = database.fetch_query(
-            "SELECT category FROM npc_categories WHERE npc_name=?",
-            (cleaned,)
-        )
+        query = "SELECT category FROM npc_categories WHERE npc_name=?"
+        if cursor is not None:
+            res = cursor.execute(query, (cleaned,)).fetchall()
+        else:
+            res = database.fetch_query(query, (cleaned,))
         if res and len(res) > 0:
             return res[0][0]
         return None
@@ -116,55 +409,123 @@ def load_all_npc_categories():
         logger.error(f"Fehler beim Laden aller NPC-Kategorien: {str(e)}")
         return {}
 
-def recategorize_uncategorized():
+def recategorize_uncategorized(cursor=None):
     """
     Checks all NPCs in npc_categories that are 'uncategorized' and tries to recategorize them.
+    If cursor is given, all statements run on it (e.g. inside database.transaction()).
     """
     try:
-        rows = database.fetch_query(
-            "SELECT npc_name, category FROM npc_categories WHERE category='uncategorized'"
-        )
+        query = "SELECT npc_name, category FROM npc_categories WHERE category='uncategorized'"
+        if cursor is not None:
+            rows = cursor.execute(query).fetchall()
+        else:
+            rows = database.fetch_query(query)
         if not rows:
             return
             
-        updated_count = 0
-        for (npc_name, old_cat) in rows:
-            new_cat = auto_categorize_npc(npc_name)
-            if new_cat != "uncategorized":
-                database.execute_query(
-                    "UPDATE npc_categories SET category=? WHERE npc_name=?",
-                    (new_cat, npc_name)
-                )
-                logger.info(f"Recategorized {npc_name} from {old_cat} to {new_cat}")
-                updated_count += 1
-                
-        if updated_count > 0:
-            logger.debug(f"Insgesamt {updated_count} NPCs neu kategorisiert")
+        new_categories = categorize_many(npc_name for npc_name, _ in rows)
+        updates = [(cat, npc_name) for npc_name, cat in new_categories.items() if cat != "uncategorized"]
+        for cat, npc_name in updates:
+            logger.info(f"Recategorized {npc_name} from uncategorized to {cat}")
+
+        if updates:
+            update = "UPDATE npc_categories SET category=? WHERE npc_name=?"
+            if cursor is not None:
+                cursor.executemany(update, updates)
+            else:
+                database.execute_many(update, updates)
+            updated = [npc_name for _, npc_name in updates]
+            update_kill_categories(updated, cursor)
+            logger.debug(f"Insgesamt {len(updated)} NPCs neu kategorisiert")
     except database.DatabaseError as e:
         logger.error(f"Fehler bei der Neukategorisierung von NPCs: {str(e)}")
 
-def save_npc_category(npc_name, default_category="uncategorized"):
+def categorize_npcs(npc_names, cursor, default_category="uncategorized"):
+    """
+    Batch variant of save_npc_category() for one ingest batch: reads the stored categories
+    of all distinct cleaned names at once, auto-categorizes the unknown ones in memory and
+    writes them with a single bulk upsert on cursor (i.e. in the caller's transaction).
+
+    Returns:
+        dict: cleaned name -> category for all given names
+    """
+    names = list(dict.fromkeys(clean_npc_name(name) for name in npc_names))
+    categories = {}
+    for start in range(0, len(names), CATEGORY_LOOKUP_CHUNK):
+        chunk = names[start:start + CATEGORY_LOOKUP_CHUNK]
+        cursor.execute(
+            f"SELECT npc_name, category FROM npc_categories WHERE npc_name IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        categories.update(cursor.fetchall())
+
+    new_rows = []
+    for name, cat in categorize_many(name for name in names if name not in categories).items():
+        if cat == "uncategorized" and default_category != "uncategorized":
+            cat = default_category
+        categories[name] = cat
+        new_rows.append((name, cat))
+
+    if new_rows:
+        cursor.executemany(UPSERT_NPC_CATEGORY_QUERY, new_rows)
+        # Bereits gespeicherte Kills dieser NPCs auf die neue Kategorie setzen
+        cursor.executemany(UPDATE_KILL_CATEGORY_QUERY, [
+            (entity_category(name, cat), name) for name, cat in new_rows
+        ])
+        logger.info(f"{len(new_rows)} neue NPCs kategorisiert")
+    return categories
+
+def backfill_npc_categories(cursor):
+    """
+    One-time job for databases from versions that categorized NPCs only when the
+    leaderboards were built: stores a category for every NPC opponent (NPC_PREFIXES) of
+    the kills table that is not yet in npc_categories, in the caller's transaction.
+    New NPCs are categorized at ingest time (see log_processor.categorize_event_npcs()).
+
+    Returns:
+        int: number of NPC names checked
+    """
+    # Die Tagessummen enthalten jeden Gegnernamen, ohne dass die kills-Tabelle gelesen wird
+    cursor.execute(
+        "SELECT DISTINCT opponent_name FROM daily_opponent_counts WHERE direction IN ('kill', 'death')"
+    )
+    names = [name for (name,) in cursor.fetchall() if name.lower().startswith(NPC_PREFIXES)]
+    categorize_npcs(names, cursor)
+    return len(names)
+
+def save_npc_category(npc_name, default_category="uncategorized", cursor=None):
     """
     If npc_name not in npc_categories, auto-categorize and do INSERT OR IGNORE.
     Afterwards, calls recategorize_uncategorized() once.
+
+    If cursor is given, the row is written on it as part of the caller's transaction
+    and recategorization is left to the caller. Returns True if a new row was written.
     """
     try:
         cleaned = clean_npc_name(npc_name)
-        existing = get_npc_category(cleaned)
+        existing = get_npc_category(cleaned, cursor)
         if existing is not None:
-            return  # Already known
+            return False  # Already known
 
         cat = auto_categorize_npc(cleaned)
         if cat == "uncategorized" and default_category != "uncategorized":
             cat = default_category
 
-        database.execute_query(
-            "INSERT OR IGNORE INTO npc_categories (npc_name, category) VALUES (?, ?)",
-            (cleaned, cat)
-        )
+        insert = "INSERT OR IGNORE INTO npc_categories (npc_name, category) VALUES (?, ?)"
+        if cursor is not None:
+            cursor.execute(insert, (cleaned, cat))
+            update_kill_categories([cleaned], cursor)
+            logger.info(f"NPC kategorisiert: {cleaned}, Kategorie={cat}")
+            return True
+
+        database.execute_query(insert, (cleaned, cat))
         logger.info(f"NPC kategorisiert: {cleaned}, Kategorie={cat}")
+        # Bereits gespeicherte Kills dieses NPCs auf die neue Kategorie setzen
+        update_kill_categories([cleaned])
         
         # Versuche, unkategorisierte NPCs neu zu kategorisieren
         recategorize_uncategorized()
+        return True
     except database.DatabaseError as e:
         logger.error(f"Fehler beim Speichern der NPC-Kategorie für {npc_name}: {str(e)}")
+        return False
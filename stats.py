@@ -6,21 +6,47 @@ Berechnet die Gesamt- und Detailstatistiken zu Kills/Deaths aus der Datenbank f
 - Bei den Deaths wird als "Total Deaths" nur die Zahl der Deaths durch Gegner (ohne Selbstmorde) angezeigt;
   die Selbstmorde werden separat im Death Breakdown gelistet.
 - Zwei Leaderboards:
-  - Kill Leaderboard: Top 10 Spieler, die der Benutzer getötet hat (NPCs und Selbstmorde ausgeschlossen).
-  - Death Leaderboard: Top 10 Spieler, die den Benutzer getötet haben (NPCs und Selbstmorde ausgeschlossen).
+  - Kill Leaderboard: Top-K Gegner, die der Benutzer getötet hat (seitenweise über limit/offset).
+  - Death Leaderboard: Top-K Gegner, die den Benutzer getötet haben (seitenweise über limit/offset).
 - Recent Kill Events werden anhand des Timestamps in absteigender Reihenfolge (neueste zuerst) angezeigt.
 """
 
 import re
 import logging
 from datetime import datetime, time, timedelta
+from functools import lru_cache
+from typing import NamedTuple
 import config
 import database
-import npc_handler
 
 # Logger einrichten
 logger = logging.getLogger(__name__)
 
+# Anzahl zwischengespeicherter Ergebnisse je Funktion (Zeitraum × Entity-Filter × Datenstand)
+RESULT_CACHE_SIZE = 32
+
+# Standardlänge eines Leaderboards (Einträge pro Seite)
+LEADERBOARD_SIZE = 10
+
+# Anzahl Recent Kill Events pro Seite
+RECENT_EVENTS_PAGE_SIZE = 100
+
+class KillEvent(NamedTuple):
+    """Ein Recent Kill Event, Namen ohne anhängende IDs (siehe clean_id())."""
+    id: int
+    timestamp: str
+    killer: str
+    killed_player: str
+    weapon: str
+    damage_class: str
+    damage_type: str
+    zone: str
+
+    @property
+    def key(self):
+        """Keyset-Position (timestamp, id), als before übergeben liefert sie die nächstältere Seite."""
+        return self.timestamp, self.id
+
 class StatsError(Exception):
     """Basisklasse für Fehler in der Statistik-Berechnung"""
     pass
@@ -44,41 +70,137 @@ def clean_npc_name(name):
     
     return clean_name
 
-def categorize_missing_npcs():
-    """Durchsucht die Datenbank nach NPCs mit vlk_, kopion_, oder quasigrazer_ Präfixen, 
-    die noch nicht in npc_categories sind, und fügt sie hinzu."""
-    try:
-        # Hole alle Killer und Victims aus der Datenbank
-        all_entities = database.fetch_query("""
-            SELECT DISTINCT killed_player FROM kills
-            UNION
-            SELECT DISTINCT killer FROM kills
-        """)
-
-        count = 0
-        for (entity,) in all_entities:
-            entity_lower = entity.strip().lower()
-            # Prüfe, ob es sich um einen NPC mit einem der Präfixe handelt
-            if entity_lower.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                # Füge ihn zur NPC-Kategorie hinzu, wenn er noch nicht existiert
-                try:
-                    npc_handler.save_npc_category(entity_lower, "uncategorized")
-                    count += 1
-                except Exception as e:
-                    logger.error(f"Fehler beim Kategorisieren von NPC {entity_lower}: {str(e)}")
-        
-        logger.info(f"Categorized {count} previously uncategorized NPCs")
-        return count
-    except database.DatabaseError as e:
-        logger.error(f"Datenbankfehler beim Kategorisieren von NPCs: {str(e)}")
-        return 0
-    except Exception as e:
-        logger.error(f"Allgemeiner Fehler beim Kategorisieren von NPCs: {str(e)}", exc_info=True)
-        return 0
+def _category_filter(entity_filters):
+    """
+    Baut die SQL-Bedingung, die Events mit deaktivierten Gegnerkategorien ausschließt.
+    Kategorien, die nicht in entity_filters stehen, gelten als aktiviert.
+
+    Returns:
+        tuple: (SQL-Bedingung, Parameterliste)
+    """
+    disabled = [category for category, enabled in entity_filters.items() if not enabled]
+    if not disabled:
+        return "", []
+    return f" AND opponent_category NOT IN ({', '.join('?' * len(disabled))})", disabled
+
+def _date_filter(start_date, end_date):
+    """
+    Baut den Datumsfilter für die Zählabfragen (end_date exklusiv).
+    Liegen beide Grenzen auf Tagesanfängen, wird auf die Tagesspalte der Rollup-Tabellen
+    (database.ROLLUP_TABLES) gefiltert, sonst auf den Zeitstempel der einzelnen kills-Zeilen.
+
+    Returns:
+        tuple: (SQL-Bedingung, Parameterliste, from_rollup)
+    """
+    bounds = [d for d in (start_date, end_date) if d is not None]
+    if all(d.time() == time.min for d in bounds):
+        column, fmt = "day", '%Y-%m-%d'
+    else:
+        column, fmt = "timestamp", '%Y-%m-%d %H:%M:%S'
+
+    date_filter = ""
+    date_params = []
+    if start_date:
+        date_filter += f" AND {column} >= ?"
+        date_params.append(start_date.strftime(fmt))
+    if end_date:
+        date_filter += f" AND {column} < ?"
+        date_params.append(end_date.strftime(fmt))
+    return date_filter, date_params, column == "day"
+
+def _get_category_counts(date_filter, date_params, from_rollup=True):
+    """
+    Zählt Kills und Deaths des Spielers in einer einzigen Abfrage über die materialisierten
+    Spalten direction und opponent_category (siehe npc_handler.resolve_opponent()).
+    Mit from_rollup werden die Tagessummen aus daily_category_counts addiert statt kills-Zeilen gezählt.
+
+    Returns:
+        tuple: (Liste von (direction, category, count) für 'kill'/'death', Anzahl Selbstmorde)
+    """
+    if from_rollup:
+        query = f"""
+            SELECT direction, opponent_category, SUM(kill_count)
+            FROM daily_category_counts
+            WHERE 1 {date_filter}
+            GROUP BY direction, opponent_category
+        """
+    else:
+        query = f"""
+            SELECT direction, opponent_category, COUNT(*)
+            FROM kills
+            WHERE direction IS NOT NULL {date_filter}
+            GROUP BY direction, opponent_category
+        """
+    rows = database.fetch_query(query, tuple(date_params)) or []
+
+    suicides = sum(count for direction, _, count in rows if direction == "suicide")
+    return [row for row in rows if row[0] != "suicide"], suicides
+
+def _get_leaderboard(direction, category_filter, date_filter, params, from_rollup=True, limit=-1, offset=0):
+    """
+    Gegner einer Richtung ('kill'/'death') nach bereinigtem Namen zusammengefasst,
+    absteigend nach Anzahl sortiert. Mit from_rollup aus den Tagessummen in daily_opponent_counts.
+    Returns the entries offset..offset+limit (limit -1: all). SQLite keeps only these while
+    sorting, and ties are ordered by name so consecutive pages never overlap.
+    """
+    if from_rollup:
+        table, count = "daily_opponent_counts", "SUM(kill_count)"
+    else:
+        table, count = "kills", "COUNT(*)"
+    return database.fetch_query(f"""
+        SELECT opponent_name, {count} as cnt
+        FROM {table}
+        WHERE direction = ?
+          {category_filter}
+          {date_filter}
+        GROUP BY opponent_name COLLATE NOCASE
+        ORDER BY cnt DESC, opponent_name COLLATE NOCASE
+        LIMIT ? OFFSET ?
+    """, (direction,) + tuple(params) + (limit, offset)) or []
+
+def _day_bounds(start_date, end_date):
+    """
+    Erweitert den Datumsfilter auf ganze Tage: start_date auf 00:00:00 des Tages,
+    end_date auf 00:00:00 des NÄCHSTEN Tages (exklusiv), damit der volle Tag eingeschlossen ist.
+    """
+    if start_date:
+        start_date = datetime.combine(start_date.date(), time.min)
+    if end_date:
+        end_date = datetime.combine(end_date.date(), time.min) + timedelta(days=1)
+    return start_date, end_date
+
+def _result_key(entity_filters):
+    """
+    Hashbarer Teil des Cache-Schlüssels: Entity-Filter, DB-Datei und Datenstand.
+    Nach jedem Schreib-Commit ändert sich der Datenstand, ältere Einträge werden nie mehr getroffen.
+    """
+    return tuple(sorted(entity_filters.items())), database.get_db_path(), database.get_data_version()
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _cached_stats(start_date, end_date, filters, db_path, data_version):
+    return _compute_stats(start_date, end_date, dict(filters))
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _cached_leaderboards(start_date, end_date, limit, offset, filters, db_path, data_version):
+    return _compute_leaderboards(start_date, end_date, dict(filters), limit, offset)
+
+def get_cache_info():
+    """
+    Returns the hit/miss counters of the result caches of get_stats() and get_leaderboards()
+    as {"stats": CacheInfo, "leaderboards": CacheInfo} (see functools.lru_cache).
+    """
+    return {"stats": _cached_stats.cache_info(), "leaderboards": _cached_leaderboards.cache_info()}
+
+def clear_cache():
+    """Leert die Ergebnis-Caches und setzt die Zähler zurück."""
+    _cached_stats.cache_clear()
+    _cached_leaderboards.cache_clear()
 
 def get_stats(start_date=None, end_date=None, entity_filters=None):
     """
     Berechnet die Gesamt- und Detailstatistiken zu Kills/Deaths aus der Datenbank für den aktuellen Spieler.
+    Ergebnisse werden pro Datenstand zwischengespeichert: ein Refresh ohne neue Daten
+    kostet nur einen Cache-Zugriff (siehe get_cache_info()).
     
     Args:
         start_date (datetime, optional): Startdatum für die Filterung
@@ -87,12 +209,12 @@ def get_stats(start_date=None, end_date=None, entity_filters=None):
             Format: {'players': True, 'npc_pilot': False, ...}
     
     Returns:
-        tuple: (stats_text, recent_kill_events_text)
+        tuple: (stats_text, recent_events) - recent_events ist die erste Seite von get_recent_events()
     """
     try:
         if not config.CURRENT_PLAYER_NAME:
             logger.warning("Kein Spielername konfiguriert")
-            return ("No player name set.", "No kill events to show.")
+            return ("No player name set.", [])
 
         player_lower = config.CURRENT_PLAYER_NAME.lower()
 
@@ -110,359 +232,235 @@ def get_stats(start_date=None, end_date=None, entity_filters=None):
             for category in config.NPC_CATEGORIES:
                 entity_filters[f"npc_{category}"] = True
 
-        # Anpassung der Datumsformate für SQL
-        
-        # Startdatum: Wenn angegeben, setze es auf 00:00:00 des Tages
-        if start_date:
-            start_date = datetime.combine(start_date.date(), time.min)
-            start_date_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            start_date_str = None
-        
-        # Enddatum: Wenn angegeben, setze es auf 00:00:00 des NÄCHSTEN Tages
-        if end_date:
-            # Setze auf 00:00:00 des nächsten Tages, um den vollen Tag einzuschließen
-            end_date = datetime.combine(end_date.date(), time.min) + timedelta(days=1)
-            end_date_str = end_date.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            end_date_str = None
-
-        # Debug-Ausgabe der angepassten Datumsfilter
-        logger.debug(f"Adjusted date filters - Start: {start_date_str}, End: {end_date_str}")
-
-        # Add date filters to SQL queries
-        date_filter = ""
-        date_params = []
-        
-        # Standardfilter für Datum
-        if start_date_str:
-            date_filter += " AND timestamp >= ?"
-            date_params.append(start_date_str)
-        if end_date_str:
-            date_filter += " AND timestamp < ?"  # Wichtig: Verwende "<" statt "<=" da end_date jetzt auf den nächsten Tag zeigt
-            date_params.append(end_date_str)
-
-        # Gesamtkills (ohne Selbstmorde)
-        kill_params = [player_lower, player_lower] + date_params
-        kills_res = database.fetch_query(f"""
-            SELECT COUNT(*) FROM kills
-            WHERE LOWER(killer)=? AND LOWER(killed_player) <> ? {date_filter}
-        """, tuple(kill_params))
-        kills_by_me = kills_res[0][0] if kills_res else 0
-
-        # Gesamtdeaths (inklusive Selbstmorde)
-        death_params = [player_lower] + date_params  # Hier nur ein Parameter für player_lower
-        deaths_res = database.fetch_query(f"""
-            SELECT COUNT(*) FROM kills
-            WHERE LOWER(killed_player)=? {date_filter}
-        """, tuple(death_params))
-        deaths_total = deaths_res[0][0] if deaths_res else 0
-
-        # Selbstmorde
-        suicide_params = [player_lower, player_lower] + date_params
-        suicide_res = database.fetch_query(f"""
-            SELECT COUNT(*) FROM kills
-            WHERE LOWER(killer)=? AND LOWER(killed_player)=? {date_filter}
-        """, tuple(suicide_params))
-        suicides = suicide_res[0][0] if suicide_res else 0
-
-        # Deaths by others (ohne Selbstmorde)
-        deaths_by_others = deaths_total - suicides
-
-        # K/D-Ratio (ohne Selbstmorde)
-        kd_ratio = kills_by_me / deaths_by_others if deaths_by_others > 0 else float('inf')
-
-        # Kills Breakdown (nur Kills, bei denen der Spieler als Killer agierte, ohne Selbstmorde)
-        kill_detail_params = [player_lower, player_lower] + date_params
-        kills_detail = database.fetch_query(f"""
-            SELECT killed_player FROM kills
-            WHERE LOWER(killer)=? AND LOWER(killed_player) <> ? {date_filter}
-        """, tuple(kill_detail_params)) or []        # Death Breakdown - filtert Selbstmorde aus (nur Tode durch andere)
-        death_detail_params = [player_lower, player_lower] + date_params
-        deaths_detail = database.fetch_query(f"""
-            SELECT killer FROM kills
-            WHERE LOWER(killed_player)=? AND LOWER(killer) <> ? {date_filter}
-        """, tuple(death_detail_params)) or []
-
-        npc_dict = npc_handler.load_all_npc_categories()
-
-        # Initialisiere Zählvariablen mit allen NPC-Kategorien
-        kill_counts = {
-            "players": 0, "npc_pilot": 0, "npc_civilian": 0, "npc_worker": 0,
-            "npc_lawenforcement": 0, "npc_gunner": 0, "npc_technical": 0,
-            "npc_test": 0, "npc_pirate": 0, "npc_ground": 0, "npc_animal": 0,
-            "npc_uncategorized": 0
-        }
-        # Initialisiere Death Breakdown Zähler (mit "unknown")
-        death_counts = {
-            "players": 0, "npc_pilot": 0, "npc_civilian": 0, "npc_worker": 0,
-            "npc_lawenforcement": 0, "npc_gunner": 0, "npc_technical": 0,
-            "npc_test": 0, "npc_pirate": 0, "npc_ground": 0, "npc_animal": 0,
-            "npc_uncategorized": 0, "unknown": 0
-        }
-
-        # Filtere und zähle Kills basierend auf den Entity-Filtern
-        for (victim,) in kills_detail:
-            cleaned = npc_handler.clean_npc_name(victim)
-            # Tiere und andere NPC-Typen erkennen
-            if cleaned.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                category = "npc_animal"
-                if entity_filters.get(category, True):
-                    kill_counts[category] += 1
-            elif cleaned.startswith("pu_"):
-                cat = npc_dict.get(cleaned, "uncategorized")
-                category = f"npc_{cat}"
-                if entity_filters.get(category, True):
-                    kill_counts[category] = kill_counts.get(category, 0) + 1
-            else:
-                if entity_filters.get("players", True):
-                    kill_counts["players"] += 1
-
-        # Filtere und zähle Deaths basierend auf den Entity-Filtern
-        for (killer,) in deaths_detail:
-            cleaned = npc_handler.clean_npc_name(killer)
-            if cleaned.lower() == "unknown":
-                if entity_filters.get("unknown", True):
-                    death_counts["unknown"] = death_counts.get("unknown", 0) + 1
-            # Tiere und andere NPC-Typen erkennen
-            elif cleaned.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                category = "npc_animal"
-                if entity_filters.get(category, True):
-                    death_counts[category] += 1
-            elif cleaned.startswith("pu_"):
-                cat = npc_dict.get(cleaned, "uncategorized")
-                category = f"npc_{cat}"
-                if entity_filters.get(category, True):
-                    death_counts[category] = death_counts.get(category, 0) + 1
-            else:
-                # Wenn es nicht als NPC identifiziert wurde, betrachten wir es als Spieler
-                if entity_filters.get("players", True):
-                    death_counts["players"] += 1
-
-        # Berechne gefilterte Totalsummen für die Anzeige
-        filtered_kills = sum(count for category, count in kill_counts.items() if entity_filters.get(category, True))
-        filtered_deaths = sum(count for category, count in death_counts.items() 
-                            if entity_filters.get(category, True) and category != "unknown")
-        
-        # K/D-Ratio mit gefilterten Werten
-        filtered_kd_ratio = filtered_kills / filtered_deaths if filtered_deaths > 0 else float('inf')
-
-        stats_text = (
-            f"Total Kills (filtered): {filtered_kills}\n"
-            f"Total Deaths (excl. suicides, filtered): {filtered_deaths}\n"
-            f"K/D Ratio (filtered): {filtered_kd_ratio:.2f}\n\n"
-            f"Kills Breakdown:\n"
-        )
-        
-        # Füge nur die Kategorien hinzu, die im Filter aktiviert sind
-        if entity_filters.get("players", True):
-            stats_text += f"  Player Kills: {kill_counts['players']}\n"
-        
-        # Alle NPC-Kategorien
-        for category in config.NPC_CATEGORIES:
-            key = f"npc_{category}"
-            if entity_filters.get(key, True):
-                stats_text += f"  NPC {category.capitalize()} Kills: {kill_counts.get(key, 0)}\n"
-        
-        stats_text += "\nDeaths Breakdown:\n"
-        
-        # Spieler-Deaths
-        if entity_filters.get("players", True):
-            stats_text += f"  Player Deaths: {death_counts['players']}\n"
-        
-        # Unknown Deaths
-        if entity_filters.get("unknown", True):
-            stats_text += f"  Unknown Deaths: {death_counts.get('unknown', 0)}\n"
-        
-        # Selbstmorde immer anzeigen
-        stats_text += f"  Suicides: {suicides}\n"
-        
-        # Alle NPC-Kategorien für Deaths
-        for category in config.NPC_CATEGORIES:
-            key = f"npc_{category}"
-            if entity_filters.get(key, True):
-                stats_text += f"  NPC {category.capitalize()} Deaths: {death_counts.get(key, 0)}\n"
-
-        recent_text = get_recent_kill_events(start_date, end_date, entity_filters)
-        return stats_text, recent_text
+        # Datumsfilter auf ganze Tage erweitern
+        start_date, end_date = _day_bounds(start_date, end_date)
+        logger.debug(f"Adjusted date filters - Start: {start_date}, End: {end_date}")
+
+        # Kopie, damit Aufrufer die zwischengespeicherte Liste nicht verändern
+        stats_text, recent_events = _cached_stats(start_date, end_date, *_result_key(entity_filters))
+        return stats_text, list(recent_events)
         
     except database.DatabaseError as e:
         logger.error(f"Datenbankfehler bei der Statistikberechnung: {str(e)}")
-        return (f"Database error: {str(e)}", "No kill events to show due to database error.")
+        return (f"Database error: {str(e)}", [])
     except Exception as e:
         logger.error(f"Fehler bei der Statistikberechnung: {str(e)}", exc_info=True)
-        return (f"Error calculating statistics: {str(e)}", "No kill events to show due to error.")
+        return (f"Error calculating statistics: {str(e)}", [])
 
-def get_recent_kill_events(start_date=None, end_date=None, entity_filters=None):
+def _compute_stats(start_date, end_date, entity_filters):
+    """
+    Berechnet (stats_text, recent_events) ohne Cache. start_date/end_date sind
+    bereits auf ganze Tage erweitert (siehe _day_bounds()).
+
+    Raises:
+        database.DatabaseError: Bei Datenbankfehlern
+    """
+    # Ganze Tage: die Zählung läuft über die Tagessummen statt über einzelne Events
+    date_filter, date_params, from_rollup = _date_filter(start_date, end_date)
+
+    # Alle Kills, Deaths und Selbstmorde in einem Durchlauf, gruppiert nach Gegnerkategorie
+    category_counts, suicides = _get_category_counts(date_filter, date_params, from_rollup)
+
+    # Initialisiere Zählvariablen mit allen NPC-Kategorien
+    kill_counts = {
+        "players": 0, "npc_pilot": 0, "npc_civilian": 0, "npc_worker": 0,
+        "npc_lawenforcement": 0, "npc_gunner": 0, "npc_technical": 0,
+        "npc_test": 0, "npc_pirate": 0, "npc_ground": 0, "npc_animal": 0,
+        "npc_uncategorized": 0, "unknown": 0
+    }
+    # Initialisiere Death Breakdown Zähler (mit "unknown")
+    death_counts = {
+        "players": 0, "npc_pilot": 0, "npc_civilian": 0, "npc_worker": 0,
+        "npc_lawenforcement": 0, "npc_gunner": 0, "npc_technical": 0,
+        "npc_test": 0, "npc_pirate": 0, "npc_ground": 0, "npc_animal": 0,
+        "npc_uncategorized": 0, "unknown": 0
+    }
+
+    # Zähle Kills und Deaths basierend auf den Entity-Filtern
+    for direction, category, count in category_counts:
+        if not entity_filters.get(category, True):
+            continue
+        counts = kill_counts if direction == "kill" else death_counts
+        counts[category] = counts.get(category, 0) + count
+
+    # Berechne gefilterte Totalsummen für die Anzeige
+    filtered_kills = sum(count for category, count in kill_counts.items() if entity_filters.get(category, True))
+    filtered_deaths = sum(count for category, count in death_counts.items() 
+                        if entity_filters.get(category, True) and category != "unknown")
+    
+    # K/D-Ratio mit gefilterten Werten
+    filtered_kd_ratio = filtered_kills / filtered_deaths if filtered_deaths > 0 else float('inf')
+
+    stats_text = (
+        f"Total Kills (filtered): {filtered_kills}\n"
+        f"Total Deaths (excl. suicides, filtered): {filtered_deaths}\n"
+        f"K/D Ratio (filtered): {filtered_kd_ratio:.2f}\n\n"
+        f"Kills Breakdown:\n"
+    )
+    
+    # Füge nur die Kategorien hinzu, die im Filter aktiviert sind
+    if entity_filters.get("players", True):
+        stats_text += f"  Player Kills: {kill_counts['players']}\n"
+
+    # Unknown Kills (zählen zu den Kills, damit der Breakdown die Summe ergibt)
+    if entity_filters.get("unknown", True):
+        stats_text += f"  Unknown Kills: {kill_counts['unknown']}\n"
+    
+    # Alle NPC-Kategorien
+    for category in config.NPC_CATEGORIES:
+        key = f"npc_{category}"
+        if entity_filters.get(key, True):
+            stats_text += f"  NPC {category.capitalize()} Kills: {kill_counts.get(key, 0)}\n"
+    
+    stats_text += "\nDeaths Breakdown:\n"
+    
+    # Spieler-Deaths
+    if entity_filters.get("players", True):
+        stats_text += f"  Player Deaths: {death_counts['players']}\n"
+    
+    # Unknown Deaths
+    if entity_filters.get("unknown", True):
+        stats_text += f"  Unknown Deaths: {death_counts.get('unknown', 0)}\n"
+    
+    # Selbstmorde immer anzeigen
+    stats_text += f"  Suicides: {suicides}\n"
+    
+    # Alle NPC-Kategorien für Deaths
+    for category in config.NPC_CATEGORIES:
+        key = f"npc_{category}"
+        if entity_filters.get(key, True):
+            stats_text += f"  NPC {category.capitalize()} Deaths: {death_counts.get(key, 0)}\n"
+
+    recent_events = _query_recent_events(start_date, end_date, entity_filters)
+    return stats_text, recent_events
+
+def _query_recent_events(start_date, end_date, entity_filters, limit=RECENT_EVENTS_PAGE_SIZE, before=None, after=None):
     """
-    Formatiert die letzten 100 Kill-Events:
+    Liest eine Seite Recent Kill Events (neueste zuerst) ohne Fehlerbehandlung. start_date/end_date
+    sind bereits auf ganze Tage erweitert (siehe _day_bounds()).
+    Datums-, Kategorie- und Keyset-Bedingung stehen in der Abfrage, sodass die Seite genau
+    limit sichtbare Events enthält und unabhängig von ihrer Position gleich schnell ist.
+
+    Raises:
+        database.DatabaseError: Bei Datenbankfehlern
+    """
+    # Spieler ist Killer oder Opfer (ohne Selbstmorde), Gegnerkategorie muss aktiviert sein
+    category_filter, params = _category_filter(entity_filters)
+    conditions = ""
+    if start_date:
+        conditions += " AND timestamp >= ?"
+        params.append(start_date.strftime('%Y-%m-%d %H:%M:%S'))
+    if end_date:
+        conditions += " AND timestamp < ?"
+        params.append(end_date.strftime('%Y-%m-%d %H:%M:%S'))
+    if before is not None:
+        # Entspricht (timestamp, id) < before, als Bereich auf timestamp aber über den Index auflösbar
+        before_timestamp, before_id = before
+        conditions += " AND timestamp <= ? AND (timestamp < ? OR id < ?)"
+        params += [before_timestamp, before_timestamp, before_id]
+    if after is not None:
+        # (timestamp, id) > after: nur Events, die neuer sind als das neueste angezeigte
+        after_timestamp, after_id = after
+        conditions += " AND timestamp >= ? AND (timestamp > ? OR id > ?)"
+        params += [after_timestamp, after_timestamp, after_id]
+
+    # idx_kills_timestamp liefert die Zeilen bereits in Ausgabereihenfolge, die Abfrage
+    # endet nach limit Treffern (ohne INDEXED BY wählt SQLite den Richtungsindex und sortiert)
+    rows = database.fetch_query(f"""
+        SELECT id, timestamp, killer, killed_player, weapon, damage_class, damage_type, zone
+        FROM kills INDEXED BY idx_kills_timestamp
+        WHERE direction IN ('kill', 'death')
+          {category_filter}
+          {conditions}
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+    """, tuple(params) + (limit,))
+    logger.debug(f"Recent Kill Events: {len(rows)} Einträge gefunden")
+
+    return [
+        KillEvent(event_id, ts, killer, clean_id(killed_p), clean_id(weapon), dmg_class, dmg_type, clean_id(zone))
+        for event_id, ts, killer, killed_p, weapon, dmg_class, dmg_type, zone in rows
+    ]
+
+def get_recent_events(start_date=None, end_date=None, entity_filters=None, limit=RECENT_EVENTS_PAGE_SIZE, before=None,
+                      after=None):
+    """
+    Gibt eine Seite der Recent Kill Events als Liste von KillEvent zurück:
       - Es werden nur Events zurückgegeben, bei denen der Spieler entweder als Killer oder Opfer auftritt,
       - Selbstmorde werden ausgeschlossen,
-      - Die Ergebnisse werden anhand des Timestamps (absteigend: neueste zuerst) sortiert,
+      - Die Ergebnisse werden nach (timestamp, id) absteigend sortiert (neueste zuerst),
       - Namen werden von anhängenden Zahlen befreit.
-      
+
     Args:
-        start_date (datetime, optional): Startdatum für die Filterung
-        end_date (datetime, optional): Enddatum für die Filterung
+        start_date (datetime, optional): Startdatum für die Filterung (ganzer Tag)
+        end_date (datetime, optional): Enddatum für die Filterung (ganzer Tag)
         entity_filters (dict, optional): Filter für Entitätstypen (players, npcs, etc.)
             Format: {'players': True, 'npc_pilot': False, ...}
+        limit (int): Maximale Anzahl Events der Seite
+        before (tuple, optional): KillEvent.key des letzten Events der vorherigen Seite;
+            es werden nur ältere Events geliefert
+        after (tuple, optional): KillEvent.key des neuesten bereits angezeigten Events;
+            es werden nur neuere Events geliefert (die neuesten limit, neueste zuerst)
     """
     try:
         if not config.CURRENT_PLAYER_NAME:
             logger.warning("Kein Spielername für Recent-Events konfiguriert")
-            return "No player name set."
-            
-        player_lower = config.CURRENT_PLAYER_NAME.lower()
-        start_date_str = start_date.strftime('%Y-%m-%d %H:%M:%S') if start_date else None
-        end_date_str = end_date.strftime('%Y-%m-%d %H:%M:%S') if end_date else None
+            return []
 
-        date_filter = ""
-        date_params = []
-        params = [player_lower, player_lower, player_lower, player_lower]
-        
-        if start_date_str:
-            date_filter += " AND timestamp >= ?"
-            date_params.append(start_date_str)
-        if end_date_str:
-            date_filter += " AND timestamp <= ?"
-            date_params.append(end_date_str)
-
-        # Kombiniere alle Parameter
-        all_params = params + date_params
-        
-        recent_res = database.fetch_query(f"""
-            SELECT timestamp, killed_player, killer, zone, weapon, damage_class, damage_type
-            FROM kills
-            WHERE (LOWER(killer)=? OR LOWER(killed_player)=?)
-              AND NOT (LOWER(killer)=? AND LOWER(killed_player)=?)
-              {date_filter}
-            ORDER BY timestamp DESC
-            LIMIT 1000
-        """, tuple(all_params))
-
-        recent_text = ""
-        
-        # Debug-Ausgabe
-        logger.debug(f"Recent Kill Events: {len(recent_res)} Einträge gefunden")
-        
-        # NPC-Kategorien für die Filterung laden
-        npc_dict = npc_handler.load_all_npc_categories()
-        
         # Wenn keine Entity-Filter gesetzt sind, alle anzeigen
         if entity_filters is None:
-            entity_filters = {
-                "players": True,
-                "unknown": True,
-            }
-            for category in config.NPC_CATEGORIES:
-                entity_filters[f"npc_{category}"] = True
-        
-        events_shown = 0
-        
-        for ev in recent_res:
-            ts, killed_p, killer, zone, weapon, dmg_class, dmg_type = ev
-            
-            # Kategorie des Killers und Opfers bestimmen
-            killer_category = "unknown"
-            victim_category = "unknown"
-            
-            # Killer-Kategorie bestimmen
-            cleaned_killer = npc_handler.clean_npc_name(killer)
-            if cleaned_killer.lower() == player_lower.lower():
-                killer_category = "players"  # Der Spieler selbst
-            elif cleaned_killer.lower() == "unknown":
-                killer_category = "unknown"
-            elif cleaned_killer.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                killer_category = "npc_animal"
-            elif cleaned_killer.startswith("pu_"):
-                cat = npc_dict.get(cleaned_killer, "uncategorized")
-                killer_category = f"npc_{cat}"
-            else:
-                killer_category = "players"  # Andere Spieler
-                
-            # Opfer-Kategorie bestimmen
-            cleaned_victim = npc_handler.clean_npc_name(killed_p)
-            if cleaned_victim.lower() == player_lower.lower():
-                victim_category = "players"  # Der Spieler selbst
-            elif cleaned_victim.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                victim_category = "npc_animal"
-            elif cleaned_victim.startswith("pu_"):
-                cat = npc_dict.get(cleaned_victim, "uncategorized")
-                victim_category = f"npc_{cat}"
-            else:
-                victim_category = "players"  # Andere Spieler
-
-            # Debug-Ausgabe
-            logger.debug(f"Killer: {killer} (Kategorie: {killer_category}), Victim: {killed_p} (Kategorie: {victim_category})")
-            
-            # Überprüfen, ob dieses Event angezeigt werden soll basierend auf den Filtern
-            # Spieler ist Opfer: Zeige, wenn Killer-Kategorie aktiviert ist
-            # Spieler ist Killer: Zeige, wenn Opfer-Kategorie aktiviert ist
-            show_event = False
-            if cleaned_victim.lower() == player_lower.lower():
-                show_event = entity_filters.get(killer_category, True)
-            elif cleaned_killer.lower() == player_lower.lower():
-                show_event = entity_filters.get(victim_category, True)
-            
-            if not show_event:
-                continue
-                
-            # Namen bereinigen
-            killed_p = clean_id(killed_p)
-            weapon = clean_id(weapon)
-            zone = clean_id(zone)
-
-            recent_text += (
-                f"Time: {ts}\n"
-                f"Killer: {killer}\n"
-                f"Killed: {killed_p}\n"
-                f"Weapon: {weapon}\n"
-                f"Class: {dmg_class}\n"
-                f"Type: {dmg_type}\n"
-                f"Zone: {zone}\n"
-                "------------------------------------\n"
-            )
-            
-            events_shown += 1
-            if events_shown >= 100:  # Begrenze auf 100 gefilterte Einträge
-                break
-        
-        # Debug-Ausgabe
-        logger.debug(f"Recent Kill Events angezeigt: {events_shown}")
-        
-        return recent_text
-        
+            entity_filters = {}
+        start_date, end_date = _day_bounds(start_date, end_date)
+        return _query_recent_events(start_date, end_date, entity_filters, limit, before, after)
+
     except database.DatabaseError as e:
         logger.error(f"Datenbankfehler beim Abrufen aktueller Events: {str(e)}")
-        return "Database error occurred while retrieving recent events."
+        return []
     except Exception as e:
         logger.error(f"Fehler beim Abrufen aktueller Events: {str(e)}", exc_info=True)
-        return f"Error retrieving recent kill events: {str(e)}"
+        return []
+
+def format_kill_event(event):
+    """Textdarstellung eines KillEvent, wie sie in der Recent-Events-Anzeige erscheint."""
+    return (
+        f"Time: {event.timestamp}\n"
+        f"Killer: {event.killer}\n"
+        f"Killed: {event.killed_player}\n"
+        f"Weapon: {event.weapon}\n"
+        f"Class: {event.damage_class}\n"
+        f"Type: {event.damage_type}\n"
+        f"Zone: {event.zone}\n"
+        "------------------------------------\n"
+    )
+
+def get_recent_kill_events(start_date=None, end_date=None, entity_filters=None):
+    """
+    Formatiert die letzten RECENT_EVENTS_PAGE_SIZE Kill-Events als Text (siehe get_recent_events()).
+    """
+    if not config.CURRENT_PLAYER_NAME:
+        return "No player name set."
+    return "".join(format_kill_event(event) for event in get_recent_events(start_date, end_date, entity_filters))
 
-def get_leaderboards(start_date=None, end_date=None, entity_filters=None):
+def get_leaderboards(start_date=None, end_date=None, entity_filters=None, limit=LEADERBOARD_SIZE, offset=0):
     """
     Gibt zwei Listen zurück (kill_leaderboard, death_leaderboard):
       - Kill Leaderboard: Spieler und NPCs, die der Benutzer getötet hat (basierend auf Filtern).
       - Death Leaderboard: Spieler und NPCs, die den Benutzer getötet haben (basierend auf Filtern).
+    Ergebnisse werden wie bei get_stats() pro Datenstand zwischengespeichert.
     
     Args:
         start_date: Optional[datetime] - Filtere Ereignisse nach diesem Datum
         end_date: Optional[datetime] - Filtere Ereignisse vor diesem Datum
         entity_filters: Optional[dict] - Filter für Entitätstypen 
             Format: {'players': True, 'npc_pilot': False, ...}
+        limit: int - Maximale Anzahl Einträge je Leaderboard
+        offset: int - Anzahl übersprungener Einträge (Blättern: offset = Seite * limit)
     """
     try:
         if not config.CURRENT_PLAYER_NAME:
             logger.warning("Kein Spielername für Leaderboards konfiguriert")
             return [], []
 
-        # Stelle sicher, dass alle vlk_, kopion_, quasigrazer_ und pu_-NPCs kategorisiert sind
-        categorize_missing_npcs()
-        
-        # Initialisiere leere Ergebnismengen
-        kill_data = []
-        death_data = []
-        
         # Standardfilter, wenn keine angegeben sind
         if entity_filters is None:
             entity_filters = {
@@ -472,188 +470,13 @@ def get_leaderboards(start_date=None, end_date=None, entity_filters=None):
             for category in config.NPC_CATEGORIES:
                 entity_filters[f"npc_{category}"] = True
         
-        player_lower = config.CURRENT_PLAYER_NAME.lower()
-        
-        # Anpassung der Datumsformate für SQL
-        
-        # Startdatum: Wenn angegeben, setze es auf 00:00:00 des Tages
-        if start_date:
-            start_date = datetime.combine(start_date.date(), time.min)
-            start_date_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            start_date_str = None
-        
-        # Enddatum: Wenn angegeben, setze es auf 00:00:00 des NÄCHSTEN Tages
-        if end_date:
-            # Setze auf 00:00:00 des nächsten Tages, um den vollen Tag einzuschließen
-            end_date = datetime.combine(end_date.date(), time.min) + timedelta(days=1)
-            end_date_str = end_date.strftime('%Y-%m-%d %H:%M:%S')
-        else:
-            end_date_str = None
-        
-        # Debug-Ausgabe der angepassten Datumsfilter
-        logger.debug(f"Leaderboards - Adjusted date filters - Start: {start_date_str}, End: {end_date_str}")
-
-        # Füge Datumsfilter hinzu
-        date_filter = ""
-        date_params = []
-        if start_date_str:
-            date_filter += " AND timestamp >= ?"
-            date_params.append(start_date_str)
-        if end_date_str:
-            date_filter += " AND timestamp < ?"  # Wichtig: Verwende "<" statt "<=" da end_date jetzt auf den nächsten Tag zeigt
-            date_params.append(end_date_str)
-
-        # Lade alle Kills ohne Filterung
-        kill_params = [player_lower, player_lower] + date_params
-        all_kills = database.fetch_query(f"""
-            SELECT killed_player, COUNT(*) as cnt
-            FROM kills
-            WHERE LOWER(killer) = ?
-              AND LOWER(killed_player) <> ?
-              {date_filter}
-            GROUP BY LOWER(killed_player)
-            ORDER BY cnt DESC
-        """, tuple(kill_params))        # Lade alle Deaths ohne Filterung (exklusive Selbstmorde)
-        death_params = [player_lower, player_lower] + date_params
-        all_deaths = database.fetch_query(f"""
-            SELECT killer, COUNT(*) as cnt
-            FROM kills
-            WHERE LOWER(killed_player) = ?
-              AND LOWER(killer) <> ?
-              {date_filter}
-            GROUP BY LOWER(killer)
-            ORDER BY cnt DESC
-        """, tuple(death_params))
-
-        # NPC-Kategorien für die Filterung laden
-        npc_dict = npc_handler.load_all_npc_categories()
-        
-        # Dictionary für die Zusammenfassung von NPCs mit verschiedenen IDs aber gleichem Basisnamen
-        kill_summary = {}
-        death_summary = {}
-        
-        # Kill-Leaderboard filtern und IDs bei NPCs entfernen
-        for name, count in all_kills:
-            # Entferne die ID am Ende des Namens (bei bestimmten NPCs)
-            clean_name = name
-            
-            # Entferne ID-Anhänge sowohl für PU_* als auch für vlk_*, kopion_*, quasigrazer_* NPCs
-            import re
-            match = re.search(r'(.+?)_\d+$', name)
-            if match:
-                clean_name = match.group(1)
-                
-            # Bereinigter Name für die Kategorisierung
-            cleaned = npc_handler.clean_npc_name(name)
-            
-            # Hangar & Unknown Check - als unknown behandeln
-            if "hangar" in cleaned.lower() and "unknown" in cleaned.lower():
-                if entity_filters.get("unknown", True):
-                    # Zu unknown hinzufügen, wenn unknown-Filter aktiv ist
-                    kill_summary[clean_name] = kill_summary.get(clean_name, 0) + count
-                continue  # Skip weitere Checks, da wir die Kategorie bereits kennen
-            
-            # Spezieller Check für NPC_Archetypes - diese NIEMALS als Spieler zeigen
-            if "npc_archetypes" in cleaned.lower():
-                # Auto-Kategorisierung durchführen
-                category = npc_handler.auto_categorize_npc(cleaned)
-                npc_category = f"npc_{category}"
-                if entity_filters.get(npc_category, True):
-                    # Füge zum Summary-Dict hinzu
-                    kill_summary[clean_name] = kill_summary.get(clean_name, 0) + count
-                continue  # Skip weitere Checks
-            
-            # Entity-Kategorie bestimmen und entsprechend filtern
-            elif cleaned.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                if entity_filters.get("npc_animal", True):
-                    # Füge zum Summary-Dict hinzu
-                    kill_summary[clean_name] = kill_summary.get(clean_name, 0) + count
-            elif cleaned.startswith("pu_"):
-                cat = npc_dict.get(cleaned, "uncategorized")
-                if entity_filters.get(f"npc_{cat}", True):
-                    # Füge zum Summary-Dict hinzu
-                    kill_summary[clean_name] = kill_summary.get(clean_name, 0) + count
-            else:
-                if entity_filters.get("players", True):
-                    # Spielernamen hinzufügen (keine Zusammenfassung nötig)
-                    kill_summary[clean_name] = kill_summary.get(clean_name, 0) + count
-
-        # Death-Leaderboard filtern und IDs bei NPCs entfernen
-        for name, count in all_deaths:
-            # Entferne die ID am Ende des Namens (bei bestimmten NPCs)
-            clean_name = name
-            
-            # Entferne ID-Anhänge sowohl für PU_* als auch für vlk_*, kopion_*, quasigrazer_* NPCs
-            import re
-            match = re.search(r'(.+?)_\d+$', name)
-            if match:
-                clean_name = match.group(1)
-            
-            cleaned = npc_handler.clean_npc_name(name)
-            
-            # Hangar & Unknown Check - als unknown behandeln
-            if "hangar" in cleaned.lower() and "unknown" in cleaned.lower():
-                if entity_filters.get("unknown", True):
-                    # Zu unknown hinzufügen, wenn unknown-Filter aktiv ist
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-                continue  # Skip weitere Checks, da wir die Kategorie bereits kennen
-            
-            # Spezieller Check für NPC_Archetypes - diese NIEMALS als Spieler zeigen
-            if "npc_archetypes" in cleaned.lower():
-                # Auto-Kategorisierung durchführen
-                category = npc_handler.auto_categorize_npc(cleaned)
-                npc_category = f"npc_{category}"
-                if entity_filters.get(npc_category, True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-                continue  # Skip weitere Checks
-            
-            # Spezieller Check für Hazard_dungeon NPCs - immer als NPC betrachten
-            elif "hazard" in cleaned.lower() and "dungeon" in cleaned.lower() and not ("hangar" in cleaned.lower() and "unknown" in cleaned.lower()):
-                category = npc_handler.auto_categorize_npc(cleaned)
-                npc_category = f"npc_{category}"
-                if entity_filters.get(npc_category, True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-                continue  # Skip weitere Checks
-            
-            # Spezieller Fall für Unknown-Entities
-            elif cleaned.lower() == "unknown":
-                if entity_filters.get("unknown", True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-            
-            # Spieler-Selbstmorde überspringen
-            elif cleaned.lower() == player_lower:
-                # Selbstmorde nicht anzeigen
-                continue
-                
-            # NPCs mit klassifizierbaren Präfixen
-            elif cleaned.startswith(("vlk_", "kopion_", "quasigrazer_")):
-                if entity_filters.get("npc_animal", True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-                    
-            elif cleaned.startswith("pu_"):
-                cat = npc_dict.get(cleaned, "uncategorized")
-                if entity_filters.get(f"npc_{cat}", True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-                    
-            # WICHTIG: Alle anderen Einträge werden als Spieler betrachtet
-            else:
-                if entity_filters.get("players", True):
-                    death_summary[clean_name] = death_summary.get(clean_name, 0) + count
-
-        # Konvertiere die Zusammenfassungs-Dictionaries zurück in Listen von Tupeln
-        kill_data = [(name, count) for name, count in kill_summary.items()]
-        death_data = [(name, count) for name, count in death_summary.items()]
-        
-        # Sortiere die gefilterten Daten und beschränke auf Top 10
-        kill_data.sort(key=lambda x: x[1], reverse=True)
-        death_data.sort(key=lambda x: x[1], reverse=True)
-        
-        # Debug-Ausgabe
-        logger.debug(f"Kill-Leaderboard: {len(kill_data)} Einträge gefunden")
-        logger.debug(f"Death-Leaderboard: {len(death_data)} Einträge gefunden")
+        # Datumsfilter auf ganze Tage erweitern
+        start_date, end_date = _day_bounds(start_date, end_date)
+        logger.debug(f"Leaderboards - Adjusted date filters - Start: {start_date}, End: {end_date}")
 
-        return kill_data[:10], death_data[:10]
+        # Kopien, damit Aufrufer die zwischengespeicherten Listen nicht verändern
+        kill_data, death_data = _cached_leaderboards(start_date, end_date, limit, offset, *_result_key(entity_filters))
+        return list(kill_data), list(death_data)
         
     except database.DatabaseError as e:
         logger.error(f"Datenbankfehler beim Erstellen der Leaderboards: {str(e)}")
@@ -661,3 +484,26 @@ def get_leaderboards(start_date=None, end_date=None, entity_filters=None):
     except Exception as e:
         logger.error(f"Fehler beim Erstellen der Leaderboards: {str(e)}", exc_info=True)
         return [], []
+
+def _compute_leaderboards(start_date, end_date, entity_filters, limit=LEADERBOARD_SIZE, offset=0):
+    """
+    Berechnet (kill_leaderboard, death_leaderboard) ohne Cache. start_date/end_date sind
+    bereits auf ganze Tage erweitert (siehe _day_bounds()).
+
+    Raises:
+        database.DatabaseError: Bei Datenbankfehlern
+    """
+    # Ganze Tage: die Leaderboards werden aus den Tagessummen gebildet
+    date_filter, date_params, from_rollup = _date_filter(start_date, end_date)
+
+    # Gegner nach bereinigtem Namen (ohne ID) zusammengefasst, deaktivierte Kategorien ausgeschlossen
+    category_filter, category_params = _category_filter(entity_filters)
+    params = category_params + date_params
+    kill_data = _get_leaderboard("kill", category_filter, date_filter, params, from_rollup, limit, offset)
+    death_data = _get_leaderboard("death", category_filter, date_filter, params, from_rollup, limit, offset)
+
+    # Debug-Ausgabe
+    logger.debug(f"Kill-Leaderboard: {len(kill_data)} Einträge gefunden")
+    logger.debug(f"Death-Leaderboard: {len(death_data)} Einträge gefunden")
+
+    return kill_data, death_data
@@ -3,12 +3,16 @@ import sys
 import os
 import sqlite3
 import tempfile
+import threading
+import time
 
 # Pfad zum Projektverzeichnis hinzufügen, damit die Module importiert werden können
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import database
 import config
+import log_processor
+import stats
 
 
 class TestDatabase(unittest.TestCase):
@@ -34,6 +38,9 @@ class TestDatabase(unittest.TestCase):
         config.DB_FOLDER = self.original_db_folder
         config.CURRENT_PLAYER_NAME = self.original_player_name
         
+        # Offene Verbindungen schließen, damit die DB-Dateien gelöscht werden können
+        database.close_db()
+        
         # Temporäres Verzeichnis löschen
         self.temp_dir.cleanup()
     
@@ -122,6 +129,160 @@ class TestDatabase(unittest.TestCase):
         size = database.get_db_size_kb()
         self.assertGreater(size, 0, "Datenbank-Größe sollte größer als 0 sein")
 
+    def test_persistent_connections(self):
+        """Test für die dauerhaften Verbindungen pro Thread"""
+        database.fetch_query("SELECT COUNT(*) FROM kills")
+        conn = database._get_connection("test")
+        database.fetch_query("SELECT COUNT(*) FROM kills")
+        self.assertIs(database._get_connection("test"), conn, "Verbindung wurde nicht wiederverwendet")
+
+        # Ein anderer Thread bekommt eine eigene Verbindung
+        other = []
+        thread = threading.Thread(target=lambda: other.append(database._get_connection("test")))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn, "Threads dürfen sich keine Verbindung teilen")
+
+        # Nach close_db() wird automatisch eine neue Verbindung geöffnet
+        database.close_db()
+        self.assertEqual(len(database._open_connections), 0, "close_db() hat nicht alle Verbindungen geschlossen")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        result = database.fetch_query("SELECT COUNT(*) FROM kills")
+        self.assertEqual(result[0][0], 0)
+        self.assertIsNot(database._get_connection("test"), conn)
+
+    def test_concurrent_reads_during_ingest(self):
+        """Test, dass Statistik-Abfragen während einer laufenden Schreibtransaktion nicht blockieren"""
+        log_processor.commit_ingest_batch(
+            [(f"2025-03-01 12:00:{i:02d}", f"victim{i}", "test_player", "Z", "W", "C", "D") for i in range(50)], []
+        )
+
+        ingest_started = threading.Event()
+        release_ingest = threading.Event()
+
+        def long_ingest():
+            # Simuliert einen großen Backfill-Block, der die Schreibtransaktion lange offen hält
+            with database.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(f"2025-03-02 12:{i // 60 % 60:02d}:{i % 60:02d}.{i}", f"enemy{i}", "test_player", "Z", "W", "C", "D")
+                     for i in range(20000)]
+                )
+                ingest_started.set()
+                release_ingest.wait(5)
+
+        writer = threading.Thread(target=long_ingest)
+        writer.start()
+        try:
+            self.assertTrue(ingest_started.wait(5), "Schreibtransaktion wurde nicht gestartet")
+
+            latencies = []
+            for _ in range(5):
+                start = time.perf_counter()
+                stats_text, _ = stats.get_stats()
+                stats.get_leaderboards()
+                latencies.append(time.perf_counter() - start)
+
+            # Leser sehen nur den zuletzt committeten Stand
+            self.assertIn("Total Kills (filtered): 50", stats_text)
+            self.assertLess(max(latencies), 0.5, f"Leser wurden blockiert: {latencies}")
+        finally:
+            release_ingest.set()
+            writer.join()
+
+        result = database.fetch_query("SELECT COUNT(*) FROM kills")
+        self.assertEqual(result[0][0], 20050, "Schreibtransaktion wurde nicht vollständig gespeichert")
+
+    def test_schema_migrations(self):
+        """Test: Alte DB ohne Schema-Version wird einmalig auf den aktuellen Stand migriert"""
+        config.CURRENT_PLAYER_NAME = "legacy_player"
+        db_path = config.get_db_name()
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE kills (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, killed_player TEXT, killer TEXT,
+                zone TEXT, weapon TEXT, damage_class TEXT, damage_type TEXT,
+                UNIQUE(timestamp, killed_player, killer, zone, weapon, damage_class, damage_type)
+            )
+        """)
+        conn.execute("CREATE TABLE file_positions (file_path TEXT PRIMARY KEY, last_offset INTEGER)")
+        legacy_log_path = os.path.join(self.temp_dir.name, "logs", "..", "Game.log")
+        conn.execute("INSERT INTO file_positions (file_path, last_offset) VALUES (?, 42)", (legacy_log_path,))
+        conn.execute(
+            "INSERT INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type) "
+            "VALUES ('2025-03-01 12:00:00', 'Victim1', 'Legacy_Player', 'Zone', 'Weapon', 'Class', 'Bullet')"
+        )
+        conn.execute(
+            "INSERT INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type) "
+            "VALUES ('2025-03-01 13:00:00', 'Legacy_Player', 'PU_Human-Pirate_42', 'Zone', 'Weapon', 'Class', 'Bullet')"
+        )
+        conn.commit()
+        conn.close()
+
+        database.ensure_db_initialized()
+
+        conn = sqlite3.connect(db_path)
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], database.SCHEMA_VERSION)
+        columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(kills)")}
+        self.assertFalse({"killer_lower", "killed_player_lower"} & columns, "Ungenutzte Namensspalten angelegt")
+        conn.close()
+        result = database.fetch_query("SELECT direction, opponent_name, opponent_category FROM kills ORDER BY id")
+        self.assertEqual(result, [("kill", "Victim1", "players"), ("death", "PU_Human-Pirate", "npc_pirate")],
+                         "Gegnerspalten wurden nicht nachgetragen")
+        result = database.fetch_query(
+            "SELECT day, direction, opponent_name, kill_count FROM daily_opponent_counts WHERE direction = 'kill'"
+        )
+        self.assertEqual(result, [("2025-03-01", "kill", "Victim1", 1)], "Tagessummen wurden nicht nachgetragen")
+        result = database.fetch_query("SELECT npc_name, category FROM npc_categories")
+        self.assertEqual(result, [("pu_human-pirate", "pirate")], "NPC-Kategorien wurden nicht nachgetragen")
+        result = database.fetch_query("SELECT file_path, last_offset FROM file_positions")
+        self.assertEqual(result, [(os.path.normcase(os.path.join(self.temp_dir.name, "Game.log")), 42)],
+                         "Pfade der Dateipositionen wurden nicht normalisiert")
+        result = database.fetch_query(
+            "SELECT event_hash, timestamp, killed_player, killer, zone, weapon, damage_class, damage_type FROM kills ORDER BY id"
+        )
+        self.assertEqual([row[0] for row in result], [database.event_hash(*row[1:]) for row in result],
+                         "Dedup-Schlüssel wurden nicht nachgetragen")
+        schema = {name for (name,) in database.fetch_query("SELECT name FROM sqlite_master WHERE tbl_name = 'kills'")}
+        self.assertFalse(any(name.startswith("sqlite_autoindex") for name in schema), "UNIQUE-Index besteht noch")
+        self.assertTrue({"idx_kills_event_hash", "idx_kills_timestamp", "kills_rollup_insert"} <= schema,
+                        "Indizes oder Trigger fehlen nach dem Neuaufbau der Tabelle")
+
+        # Aktuelles Schema: weder init_db noch ensure_db_initialized führen Migrationen erneut aus
+        calls = []
+        original_migrations = database.MIGRATIONS
+        database.MIGRATIONS = [(v, d, lambda conn, progress: calls.append(v)) for v, d, _ in original_migrations]
+        try:
+            database.init_db()
+            database.ensure_db_initialized()
+        finally:
+            database.MIGRATIONS = original_migrations
+        self.assertEqual(calls, [], "Migrationen wurden für eine aktuelle DB erneut ausgeführt")
+
+    def test_migrate_in_batches(self):
+        """Test: Batch-Migration verarbeitet alle Zeilen und meldet den Fortschritt"""
+        database.execute_many(
+            "INSERT INTO kills (timestamp, killed_player, killer, zone, weapon, damage_class, damage_type) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(f"2025-03-01 12:00:{i:02d}", f"Victim{i}", "test_player", "Zone", "Weapon", "Class", "Bullet")
+             for i in range(25)]
+        )
+        progress = []
+        with database.db_lock:
+            conn = database._get_connection("test migration")
+            conn.execute("BEGIN IMMEDIATE")
+            database.migrate_in_batches(
+                conn, "UPDATE kills SET zone = 'Migrated' WHERE id > :start AND id <= :end",
+                "Test", lambda description, done, total: progress.append((done, total)), batch_size=10
+            )
+            conn.commit()
+
+        self.assertEqual(progress, [(10, 25), (20, 25), (25, 25)])
+        result = database.fetch_query("SELECT COUNT(*) FROM kills WHERE zone = 'Migrated'")
+        self.assertEqual(result[0][0], 25)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
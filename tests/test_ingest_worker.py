@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Pfad zum Projektverzeichnis hinzufügen, damit die Module importiert werden können
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ingest_worker
+
+
+class TestIngestWorker(unittest.TestCase):
+    """Testklasse für den Ingest-Worker"""
+
+    def setUp(self):
+        """Worker mit einer aufzeichnenden Verarbeitungsfunktion anlegen"""
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.worker = ingest_worker.IngestWorker(process=self.process, debounce_ms=50)
+        self.worker.start()
+
+    def tearDown(self):
+        self.worker.stop(timeout=5)
+
+    def process(self, file_path):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+            self.calls.append((file_path, time.monotonic()))
+
+    def wait_until_idle(self):
+        deadline = time.monotonic() + 5
+        while self.worker.get_status()["queue_depth"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+    def test_burst_is_coalesced(self):
+        """Test: Ein Schwall von Meldungen pro Datei führt nach dem Debounce-Fenster zu einem Durchlauf"""
+        start = time.monotonic()
+        for _ in range(50):
+            self.worker.submit("Game.log")
+            self.worker.submit("other.log")
+        self.assertEqual(self.worker.get_status()["queue_depth"], 2)
+        self.wait_until_idle()
+
+        self.assertEqual(sorted(path for path, _ in self.calls), ["Game.log", "other.log"])
+        self.assertGreaterEqual(min(done for _, done in self.calls) - start, 0.05, "Debounce-Fenster nicht abgewartet")
+        status = self.worker.get_status()
+        self.assertEqual(status["processed"], 2)
+        self.assertEqual(status["coalesced"], 98)
+        self.assertGreaterEqual(status["last_lag"], 0.05)
+
+    def test_changes_during_processing_are_read_again(self):
+        """Test: Änderungen während eines Durchlaufs lösen genau einen weiteren aus, nie parallel"""
+        for _ in range(5):
+            self.worker.submit("Game.log")
+            time.sleep(0.04)
+        self.wait_until_idle()
+
+        self.assertEqual(self.max_active, 1, "Datei wurde parallel verarbeitet")
+        self.assertGreaterEqual(len(self.calls), 2)
+        self.assertLess(len(self.calls), 5)
+        self.assertEqual(self.worker.get_status()["queue_depth"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
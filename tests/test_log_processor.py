@@ -3,12 +3,16 @@ import sys
 import os
 import tempfile
 import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 # Pfad zum Projektverzeichnis hinzufügen, damit die Module importiert werden können
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import log_processor
+import log_parser
+import npc_handler
 import config
 import database
 
@@ -44,6 +48,9 @@ class TestLogProcessor(unittest.TestCase):
         config.DB_FOLDER = self.original_db_folder
         config.CURRENT_PLAYER_NAME = self.original_player_name
         
+        # Offene Verbindungen schließen, damit die DB-Dateien gelöscht werden können
+        database.close_db()
+        
         # Temporäres Verzeichnis löschen
         self.temp_dir.cleanup()
     
@@ -56,7 +63,7 @@ class TestLogProcessor(unittest.TestCase):
         invalid_log_line = "<2025-03-01 12:00:00> [SC] Some other log message that doesn't match the pattern"
         
         # Test gültige Zeile
-        result = log_processor.parse_log_line(valid_log_line)
+        result = log_parser.parse_log_line(valid_log_line)
         self.assertIsNotNone(result, "Gültige Log-Zeile wurde nicht erkannt")
         self.assertEqual(result["killed_player"], "victim1", "Falscher killed_player-Wert")
         self.assertEqual(result["killer"], "test_player", "Falscher killer-Wert")
@@ -66,9 +73,31 @@ class TestLogProcessor(unittest.TestCase):
         self.assertEqual(result["damage_type"], "TestDamage", "Falscher Schadenstyp")
         
         # Test ungültige Zeile
-        result = log_processor.parse_log_line(invalid_log_line)
+        result = log_parser.parse_log_line(invalid_log_line)
         self.assertIsNone(result, "Ungültige Log-Zeile wurde fälschlicherweise erkannt")
     
+    def test_log_parser_import_has_no_side_effects(self):
+        """Test, dass die Worker-Prozesse beim Import von log_parser weder Konfiguration noch Datenbank laden"""
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, log_parser; print(sorted({'config', 'database'} & set(sys.modules)))"],
+            cwd=project_dir, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_iter_candidate_lines(self):
+        """Test für den Literal-Vorfilter auf Byte-Blöcken"""
+        chunk = (
+            b"<2025-03-01 12:00:00> [SC] Some irrelevant log message\n"
+            b"<2025-03-01 12:01:00> [SC] <Actor Death> first\r\n"
+            b"<2025-03-01 12:02:00> [SC] Another message\n"
+            b"<2025-03-01 12:03:00> [SC] <actor death> second\n"
+        )
+        candidates = list(log_parser.iter_candidate_lines(chunk))
+        self.assertEqual(len(candidates), 2, "Es sollten genau 2 Kandidaten gefunden werden")
+        self.assertTrue(candidates[0].startswith(b"<2025-03-01 12:01:00>"), "Zeilenanfang falsch ermittelt")
+        self.assertTrue(candidates[1].endswith(b"second"), "Zeilenende falsch ermittelt")
+
     def test_process_log_file(self):
         """Test für die Verarbeitung einer Log-Datei"""
         # Eine Test-Log-Datei erstellen
@@ -89,11 +118,179 @@ class TestLogProcessor(unittest.TestCase):
         # Prüfen, ob die Dateiposition gespeichert wurde
         result = database.fetch_query(
             "SELECT last_offset FROM file_positions WHERE file_path = ?",
-            (test_log_path,)
+            (log_parser.normalize_log_path(test_log_path),)
         )
         self.assertIsNotNone(result, "Dateiposition wurde nicht gespeichert")
         self.assertGreater(result[0][0], 0, "Dateiposition sollte größer als 0 sein")
     
+    def test_process_log_file_partial_line(self):
+        """Test, dass eine unvollständige letzte Zeile erst im nächsten Durchlauf verarbeitet wird"""
+        test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        first_line = "<2025-03-01 12:00:00> [SC] Some irrelevant log message\n"
+        kill_line = "<2025-03-01 12:01:00> [SC] <Actor Death> An Actor died! 'victim1' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n"
+        with open(test_log_path, "wb") as f:
+            f.write(first_line.encode("utf-8"))
+            f.write(kill_line[:60].encode("utf-8"))
+
+        log_processor.process_log_file(test_log_path)
+
+        result = database.fetch_query("SELECT COUNT(*) FROM kills")
+        self.assertEqual(result[0][0], 0, "Halb geschriebene Zeile darf nicht geparst werden")
+        result = database.fetch_query(
+            "SELECT last_offset FROM file_positions WHERE file_path = ?",
+            (log_parser.normalize_log_path(test_log_path),)
+        )
+        self.assertEqual(result[0][0], len(first_line.encode("utf-8")), "Offset muss auf dem Zeilenanfang stehen")
+
+        # Rest der Zeile anhängen
+        with open(test_log_path, "ab") as f:
+            f.write(kill_line[60:].encode("utf-8"))
+
+        log_processor.process_log_file(test_log_path)
+
+        result = database.fetch_query("SELECT COUNT(*) FROM kills")
+        self.assertEqual(result[0][0], 1, "Vervollständigte Zeile wurde nicht verarbeitet")
+        result = database.fetch_query(
+            "SELECT last_offset FROM file_positions WHERE file_path = ?",
+            (log_parser.normalize_log_path(test_log_path),)
+        )
+        self.assertEqual(result[0][0], os.path.getsize(test_log_path), "Offset muss am Dateiende stehen")
+
+    def test_backup_log_unterminated_last_line(self):
+        """Test, dass die letzte Zeile eines Backup-Logs ohne Zeilenende gelesen wird (serieller und paralleler Import)"""
+        kill_line = "<2025-03-0{0} 12:01:00> [SC] <Actor Death> An Actor died! 'victim{1}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'"
+        for i in range(2):
+            with open(os.path.join(self.temp_backup_dir, f"backup{i}.log"), "w") as f:
+                f.write(kill_line.format(i + 1, 1) + "\n" + kill_line.format(i + 1, 2))
+
+        log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 4, "Letzte Zeile nicht gelesen")
+
+        config.CURRENT_PLAYER_NAME = "Test_Player"
+        database.init_db()
+        log_processor.parse_all_backup_logs(workers=2)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 4, "Letzte Zeile nicht gelesen")
+        self.assertEqual(
+            database.fetch_query("SELECT last_offset FROM file_positions ORDER BY file_path"),
+            [(os.path.getsize(os.path.join(self.temp_backup_dir, f"backup{i}.log")),) for i in range(2)]
+        )
+        self.assertFalse(
+            any(path.startswith(log_parser.normalize_log_path(self.temp_backup_dir)) for path in log_parser._pending_fragments),
+            "Fragmente von Backup-Logs werden aufgehoben"
+        )
+
+    def test_path_spellings_share_one_position(self):
+        """Test, dass verschieden geschriebene Pfade derselben Datei nur eine Position haben"""
+        test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        other_spelling = os.path.join(self.temp_logs_dir, "sub", "..", config.GAME_LOG_FILENAME)
+        with open(test_log_path, "w") as f:
+            f.write("<2025-03-01 12:01:00> [SC] <Actor Death> An Actor died! 'victim1' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
+
+        log_processor.process_log_file(test_log_path)
+        with patch.object(log_processor, "parse_log_events", wraps=log_processor.parse_log_events) as mock_parse:
+            log_processor.process_log_file(other_spelling)
+        self.assertEqual(mock_parse.call_args.args[1], os.path.getsize(test_log_path), "Datei wurde erneut gelesen")
+        self.assertEqual(
+            database.fetch_query("SELECT file_path FROM file_positions"),
+            [(log_parser.normalize_log_path(test_log_path),)]
+        )
+
+    def test_rotated_and_truncated_log(self):
+        """Test, dass ein neues oder gekürztes Game.log ab Byte 0 gelesen wird"""
+        test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        kill_line = "<2025-03-0{0} 12:00:00> [SC] <Actor Death> An Actor died! 'victim{1}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n"
+        with open(test_log_path, "w") as f:
+            f.write("<2025-03-01 11:00:00> Log started (session 1)\n")
+            f.write(kill_line.format(1, 1) + kill_line.format(1, 2))
+        log_processor.process_log_file(test_log_path)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 2)
+
+        # Neues Game.log nach einem Spielneustart, bereits länger als der alte Offset
+        with open(test_log_path, "w") as f:
+            f.write("<2025-03-02 11:00:00> Log started (session 2)\n")
+            f.write("".join(kill_line.format(2, i) for i in range(3)))
+        log_processor.process_log_file(test_log_path)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 5, "Anfang des neuen Game.log übersprungen")
+        offset, fingerprint = database.fetch_query("SELECT last_offset, fingerprint FROM file_positions")[0]
+        self.assertEqual(offset, os.path.getsize(test_log_path))
+        self.assertEqual(fingerprint, log_parser.file_fingerprint(test_log_path, offset))
+
+        # Weitergeschriebenes Game.log: nur die neue Zeile wird gelesen
+        with open(test_log_path, "a") as f:
+            f.write(kill_line.format(2, 9))
+        with patch.object(log_processor, "parse_log_events", wraps=log_processor.parse_log_events) as mock_parse:
+            log_processor.process_log_file(test_log_path)
+        self.assertEqual(mock_parse.call_args[0][1], offset)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 6)
+
+        # Neues, noch kürzeres Game.log
+        with open(test_log_path, "w") as f:
+            f.write(kill_line.format(3, 1))
+        log_processor.process_log_file(test_log_path)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 7, "Gekürztes Game.log nicht erkannt")
+
+    def test_ingest_batch_is_atomic(self):
+        """Test, dass Events, NPC-Kategorien und Offset nur gemeinsam gespeichert werden"""
+        test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        with open(test_log_path, "w") as f:
+            f.write("<2025-03-01 12:01:00> [SC] <Actor Death> An Actor died! 'pu_human_enemy_npc_pilot_123' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
+
+        # Offset-Update schlägt fehl -> die gesamte Transaktion muss zurückgerollt werden
+        with patch.object(log_processor, "UPDATE_POSITION_QUERY", "INSERT INTO missing_table VALUES (?, ?, ?)"):
+            log_processor.process_log_file(test_log_path)
+
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 0, "Events ohne Offset gespeichert")
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM npc_categories")[0][0], 0, "NPC ohne Offset gespeichert")
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM file_positions")[0][0], 0, "Offset ohne Events gespeichert")
+
+        # Zweiter Durchlauf ohne Fehler speichert alles genau einmal
+        log_processor.process_log_file(test_log_path)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM npc_categories")[0][0], 1)
+        self.assertEqual(
+            database.fetch_query("SELECT last_offset FROM file_positions")[0][0],
+            os.path.getsize(test_log_path)
+        )
+
+    def test_dedup_key_collisions(self):
+        """Test, dass Duplikate über den Dedup-Schlüssel verworfen werden, Kollisionen aber kein Event verlieren"""
+        events = [(f"2025-03-01 12:00:{i:02d}", f"victim{i}", "test_player", "Z", "W", "C", "D") for i in range(5)]
+        self.assertEqual(log_processor.commit_ingest_batch(events + events[:2], []), 5)
+        self.assertEqual(log_processor.commit_ingest_batch(events, []), 0)
+
+        # Jedes Event erhält denselben Schlüssel: entschieden wird über den Vergleich der Felder
+        more = [(f"2025-03-02 12:00:{i:02d}", f"victim{i}", "test_player", "Z", "W", "C", "D") for i in range(3)]
+        with patch.object(database, "event_hash", return_value=42):
+            self.assertEqual(log_processor.commit_ingest_batch(more + more, []), 3)
+            self.assertEqual(log_processor.commit_ingest_batch(more, []), 0)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 8)
+
+    def test_ingest_notifications(self):
+        """Test, dass nur Commits mit neuen Events eine Benachrichtigung mit deren Anzahl auslösen"""
+        test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        kill_line = "<2025-03-01 12:0{0}:00> [SC] <Actor Death> An Actor died! 'victim{0}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n"
+        with open(test_log_path, "w") as f:
+            f.write(kill_line.format(1) + kill_line.format(2))
+
+        notifications = []
+        log_processor.add_ingest_listener(notifications.append)
+        try:
+            log_processor.process_log_file(test_log_path)
+            log_processor.process_log_file(test_log_path)
+            with open(test_log_path, "a") as f:
+                f.write("<2025-03-01 12:05:00> [SC] Some irrelevant log message\n")
+            log_processor.process_log_file(test_log_path)
+            with open(test_log_path, "a") as f:
+                f.write(kill_line.format(3))
+            log_processor.process_log_file(test_log_path)
+        finally:
+            log_processor.remove_ingest_listener(notifications.append)
+
+        self.assertEqual(notifications, [2, 1])
+        # Bereits gespeicherte Events (z. B. aus einer Backup-Kopie) zählen nicht als neu
+        events, _ = log_parser.parse_log_events(test_log_path, 0, "test_player")
+        self.assertEqual(log_processor.commit_ingest_batch(events, []), 0)
+
     def test_get_backup_log_progress(self):
         """Test für die Fortschrittsberechnung bei Backup-Logs"""
         # Einige Test-Backup-Logs erstellen
@@ -105,11 +302,11 @@ class TestLogProcessor(unittest.TestCase):
         # Für einige Logs Dateiposition speichern
         database.execute_query(
             "INSERT INTO file_positions (file_path, last_offset) VALUES (?, ?)",
-            (os.path.join(self.temp_backup_dir, backup_logs[0]), 10)
+            (log_parser.normalize_log_path(os.path.join(self.temp_backup_dir, backup_logs[0])), 10)
         )
         database.execute_query(
             "INSERT INTO file_positions (file_path, last_offset) VALUES (?, ?)",
-            (os.path.join(self.temp_backup_dir, backup_logs[1]), 20)
+            (log_parser.normalize_log_path(os.path.join(self.temp_backup_dir, backup_logs[1])), 20)
         )
         
         # Fortschritt abrufen
@@ -119,22 +316,189 @@ class TestLogProcessor(unittest.TestCase):
         self.assertEqual(total, 3, "Insgesamt sollten 3 Backup-Logs erkannt werden")
         self.assertEqual(imported, 2, "2 Logs sollten als importiert gezählt werden")
     
-    @patch('npc_handler.save_npc_category')
-    def test_npc_categorization(self, mock_save_category):
+    def test_parallel_backup_import_matches_serial(self):
+        """Test, dass der parallele Backup-Import dieselben Ergebnisse liefert wie der serielle"""
+        for i in range(4):
+            with open(os.path.join(self.temp_backup_dir, f"backup{i}.log"), "w") as f:
+                for j in range(5):
+                    f.write(f"<2025-03-0{i + 1} 12:0{j}:00> [SC] Some irrelevant log message\n")
+                    f.write(f"<2025-03-0{i + 1} 12:0{j}:30> [SC] <Actor Death> An Actor died! 'victim{j}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
+                    f.write(f"<2025-03-0{i + 1} 12:0{j}:45> [SC] <Actor Death> An Actor died! 'test_player' [456] in zone 'TestZone' killed by 'pu_enemy_{j}' [789] using 'EnemyWeapon' [Class EnemyClass] with damage type 'EnemyDamage'\n")
+        # Doppeltes Backup, damit die Deduplizierung mitgeprüft wird
+        shutil.copy(os.path.join(self.temp_backup_dir, "backup0.log"), os.path.join(self.temp_backup_dir, "backup4.log"))
+
+        def snapshot():
+            kills = database.fetch_query(
+                "SELECT timestamp, killed_player, killer, zone, weapon, damage_class, damage_type FROM kills ORDER BY id"
+            )
+            positions = database.fetch_query("SELECT file_path, last_offset FROM file_positions ORDER BY file_path")
+            npcs = database.fetch_query("SELECT npc_name, category FROM npc_categories ORDER BY npc_name")
+            return kills, positions, npcs
+
+        log_processor.parse_all_backup_logs(workers=1)
+        serial = snapshot()
+
+        # Zweite, leere Datenbank für den parallelen Lauf
+        config.CURRENT_PLAYER_NAME = "Test_Player"
+        database.init_db()
+        log_processor.parse_all_backup_logs(workers=3)
+        parallel = snapshot()
+
+        self.assertEqual(len(serial[0]), 40, "Serieller Import sollte 40 eindeutige Events speichern")
+        self.assertEqual(serial, parallel, "Paralleler Import weicht vom seriellen Import ab")
+
+    def test_backup_manifest_skips_unchanged_logs(self):
+        """Test, dass unveränderte, vollständig gelesene Backup-Logs nicht mehr geöffnet werden"""
+        kill_line = "<2025-03-01 12:00:{0:02d}> [SC] <Actor Death> An Actor died! 'victim{0}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n"
+        paths = [os.path.join(self.temp_backup_dir, f"backup{i}.log") for i in range(3)]
+        for i, path in enumerate(paths):
+            with open(path, "w") as f:
+                f.write(kill_line.format(i))
+
+        log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 3)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM backup_manifest WHERE completed = 1")[0][0], 3)
+
+        def opened_backups(mock_open):
+            backup_dir = log_parser.normalize_log_path(self.temp_backup_dir)
+            return [call.args[0] for call in mock_open.call_args_list
+                    if log_parser.normalize_log_path(str(call.args[0])).startswith(backup_dir)]
+
+        # Leerlauf: weder aus dem Speicher noch nach dem Neuladen aus der DB wird ein Backup geöffnet
+        for reload_manifest in (False, True):
+            if reload_manifest:
+                log_processor._backup_manifests.clear()
+            with patch("builtins.open", wraps=open) as mock_open:
+                log_processor.parse_all_backup_logs(workers=1)
+            self.assertEqual(opened_backups(mock_open), [], "Unveränderte Backup-Logs wurden geöffnet")
+
+        # Nur neue und geänderte Backups werden gelesen
+        with open(paths[1], "a") as f:
+            f.write(kill_line.format(10))
+        new_path = os.path.join(self.temp_backup_dir, "backup3.log")
+        with open(new_path, "w") as f:
+            f.write(kill_line.format(11))
+        with patch.object(log_processor, "process_log_file", wraps=log_processor.process_log_file) as mock_process:
+            log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual([call.args[0] for call in mock_process.call_args_list],
+                         [log_parser.normalize_log_path(path) for path in (paths[1], new_path)])
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 5)
+        fingerprint = database.fetch_query("SELECT fingerprint FROM backup_manifest WHERE file_path = ?",
+                                           (log_parser.normalize_log_path(new_path),))[0][0]
+        self.assertEqual(fingerprint, log_parser.file_fingerprint(new_path, os.path.getsize(new_path)))
+
+    def test_rotated_game_log_continues_in_backup(self):
+        """Test, dass ein nach logbackups rotiertes Game.log ab dem live gelesenen Offset weitergelesen wird"""
+        live_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
+        kill_line = "<2025-03-0{0} 12:00:{1:02d}> [SC] <Actor Death> An Actor died! 'victim{0}_{1}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n"
+
+        def play_session(day, backup_name):
+            """Spielsitzung live einlesen, danach schreibt das Spiel weiter und rotiert das Log"""
+            with open(live_path, "w") as f:
+                f.write(f"<2025-03-0{day} 11:00:00> Log started (session {day})\n")
+                f.write("".join(kill_line.format(day, i) for i in range(3)))
+            log_processor.process_log_file(live_path)
+            live_offset = os.path.getsize(live_path)
+            with open(live_path, "a") as f:
+                f.write(kill_line.format(day, 9))
+            backup_path = os.path.join(self.temp_backup_dir, backup_name)
+            os.replace(live_path, backup_path)
+            with open(live_path, "w") as f:
+                f.write(f"<2025-03-0{day + 1} 11:00:00> Log started (session {day + 1})\n")
+            # Positionen und Worker-Aufrufe verwenden den normalisierten Pfad
+            return log_parser.normalize_log_path(backup_path), live_offset
+
+        # Das neue Game.log wird vor dem Backup gelesen: die alte Position wird aufgehoben
+        backup1, offset1 = play_session(1, "Game Build(1).log")
+        log_processor.process_log_file(live_path)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM retired_positions")[0][0], 1)
+        with patch.object(log_processor, "parse_log_events", wraps=log_processor.parse_log_events) as mock_parse:
+            log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(mock_parse.call_args_list[0].args[:2], (backup1, offset1), "Rotiertes Log ab Byte 0 gelesen")
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 4)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM retired_positions")[0][0], 0)
+
+        # Backups werden vor dem neuen Game.log gelesen (paralleler Import): die Live-Position wird übernommen
+        backup2, offset2 = play_session(2, "Game Build(2).log")
+        unrelated = os.path.join(self.temp_backup_dir, "other.log")
+        with open(unrelated, "w") as f:
+            f.write(kill_line.format(5, 1))
+        # Threads statt Prozesse, damit die Aufrufe der Worker mitgeschnitten werden können
+        with patch.object(log_processor, "ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)), \
+                patch.object(log_parser, "parse_log_events", wraps=log_parser.parse_log_events) as mock_parse:
+            log_processor.parse_all_backup_logs(workers=2)
+        started = {call.args[0]: call.args[1] for call in mock_parse.call_args_list}
+        self.assertEqual(started[backup2], offset2)
+        self.assertEqual(started[log_parser.normalize_log_path(unrelated)], 0)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 9)
+
+        # Das neue Game.log wird danach vollständig gelesen, die übernommene Position bleibt nicht liegen
+        self.assertEqual(database.fetch_query("SELECT claimed FROM retired_positions"), [(1,)])
+        log_processor.process_log_file(live_path)
+        self.assertEqual(
+            database.fetch_query("SELECT last_offset FROM file_positions WHERE file_path = ?",
+                                 (log_parser.normalize_log_path(live_path),))[0][0],
+            os.path.getsize(live_path)
+        )
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM retired_positions")[0][0], 0)
+
+    def test_backup_manifest_requires_complete_read(self):
+        """Test, dass ein Backup nur als vollständig gilt, wenn die Position am Dateiende steht"""
+        kill_line = "<2025-03-01 12:00:0{0}> [SC] <Actor Death> An Actor died! 'victim{0}' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'"
+        path = os.path.join(self.temp_backup_dir, "backup0.log")
+        with open(path, "w") as f:
+            f.write(kill_line.format(1) + "\n" + kill_line.format(2))
+
+        # Lesen ohne Dateiende-Modus: die letzte Zeile bleibt ungelesen
+        with patch.object(log_processor, "parse_log_events",
+                          lambda file_path, offset, player, final=False: log_parser.parse_log_events(file_path, offset, player)):
+            log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT completed FROM backup_manifest")[0][0], 0)
+
+        log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 2)
+        self.assertEqual(database.fetch_query("SELECT completed, file_size FROM backup_manifest")[0],
+                         (1, os.path.getsize(path)))
+
+    def test_backups_reimported_after_db_cleared(self):
+        """Test, dass Backups nach dem Löschen der Datenbank (AppData löschen) erneut importiert werden"""
+        path = os.path.join(self.temp_backup_dir, "backup0.log")
+        with open(path, "w") as f:
+            f.write("<2025-03-01 12:00:00> [SC] <Actor Death> An Actor died! 'victim1' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
+        log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 1)
+
+        # Wie GUI.on_clear_appdata() mit anschließendem Neustart im selben Prozess
+        database.close_db()
+        db_path = config.get_db_name()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+        database.init_db()
+
+        log_processor.parse_all_backup_logs(workers=1)
+        self.assertEqual(database.fetch_query("SELECT COUNT(*) FROM kills")[0][0], 1)
+        self.assertEqual(database.fetch_query("SELECT completed FROM backup_manifest"), [(1,)])
+
+    @patch('npc_handler.categorize_npcs', wraps=npc_handler.categorize_npcs)
+    def test_npc_categorization(self, mock_categorize):
         """Test für die automatische NPC-Kategorisierung während der Logverarbeitung"""
         # Eine Test-Log-Datei mit NPC-Ereignissen erstellen
         test_log_path = os.path.join(self.temp_logs_dir, config.GAME_LOG_FILENAME)
         with open(test_log_path, "w") as f:
             f.write("<2025-03-01 12:01:00> [SC] <Actor Death> An Actor died! 'pu_human_enemy_npc_pilot_123' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
             f.write("<2025-03-01 12:02:00> [SC] <Actor Death> An Actor died! 'test_player' [456] in zone 'TestZone' killed by 'vlk_enemy_456' [789] using 'EnemyWeapon' [Class EnemyClass] with damage type 'EnemyDamage'\n")
+            f.write("<2025-03-01 12:03:00> [SC] <Actor Death> An Actor died! 'pu_human_enemy_npc_pilot_124' [123] in zone 'TestZone' killed by 'test_player' [456] using 'TestWeapon' [Class TestClass] with damage type 'TestDamage'\n")
         
         # Log-Datei verarbeiten
         log_processor.process_log_file(test_log_path)
         
-        # Prüfen, ob die NPC-Kategorisierungsfunktion aufgerufen wurde
-        # Dies sollte zweimal aufgerufen werden (für jeden NPC)
-        self.assertEqual(mock_save_category.call_count, 2, "NPC-Kategorisierungsfunktion wurde nicht korrekt aufgerufen")
-
+        # Alle NPCs eines Blocks werden in einem einzigen Aufruf kategorisiert
+        self.assertEqual(mock_categorize.call_count, 1, "NPC-Kategorisierung sollte einmal pro Block laufen")
+        npcs = database.fetch_query("SELECT npc_name, category FROM npc_categories ORDER BY npc_name")
+        self.assertEqual(npcs, [("pu_human_enemy_npc_pilot", "pilot"), ("vlk_enemy", "animal")])
+        result = database.fetch_query("SELECT opponent_category FROM kills ORDER BY id")
+        self.assertEqual(result, [("npc_pilot",), ("npc_animal",), ("npc_pilot",)])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
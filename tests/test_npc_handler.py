@@ -0,0 +1,189 @@
+import unittest
+import sys
+import os
+import random
+import json
+import tempfile
+import threading
+
+# Pfad zum Projektverzeichnis hinzufügen, damit die Module importiert werden können
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+import database
+import log_processor
+import npc_handler
+import stats
+from benchmarks.legacy_npc_categories import legacy_auto_categorize_npc
+
+
+# Namensbausteine: alle Stichwörter der Regeln plus typische Bestandteile echter NPC-Namen
+NAME_PARTS = sorted({kw for rule in npc_handler.CATEGORY_RULES for key in ("all", "any", "none")
+                     for kw in rule.get(key, ())}) + [
+    "pu", "human", "enemy", "npc", "light", "heavy", "xenothreat", "argo", "atls", "geo", "immediate",
+    "populacemed", "lawless", "vlk", "kopion", "quasigrazer", "archetypes", "dungeonhazard", "Pilot",
+]
+
+
+class TestNpcHandler(unittest.TestCase):
+    """Testklasse für die NPC-Kategorisierung"""
+
+    def test_rule_engine_matches_legacy_chain(self):
+        """Test: Die kompilierten Regeln kategorisieren genauso wie die bisherige if-Kette"""
+        rng = random.Random(1234)
+        names = [
+            "PU_Human_Enemy_GroundCombat_NPC_Pilot_12345", "vlk_juvenile_sentry_1", "Kopion_Headhunter",
+            "NPC_Archetypes_Human_Medic", "Hazard_Dungeon_Exec_3", "Hazard_Dungeon_Medic", "Hangar_Unknown_Turret",
+            "ARGO_ATLS_GEO_7", "PU_Populace_Worker", "PU_Populace_Shopper", "pu_thing", "", " PU_Spaced_9 ",
+        ]
+        for _ in range(20000):
+            parts = rng.choices(NAME_PARTS, k=rng.randint(1, 5))
+            separator = rng.choice(["_", "", "-"])
+            name = separator.join(parts)
+            if rng.random() < 0.5:
+                name += f"_{rng.randrange(100000)}"
+            names.append(name)
+
+        expected = {name: legacy_auto_categorize_npc(name) for name in names}
+        self.assertEqual({name: npc_handler.auto_categorize_npc(name) for name in names}, expected)
+        self.assertEqual(npc_handler.categorize_many(names), expected)
+
+    def test_compile_category_rules(self):
+        """Test: Regelbedingungen und Reihenfolge, ungültige Regeln werden abgelehnt"""
+        categorize = npc_handler.compile_category_rules([
+            {"category": "first", "prefixes": ["pu_"], "all": ["medic"]},
+            {"category": "short", "any": ["med"], "none": ["xeno"]},
+            {"category": "pair", "all": ["ab", "bc"]},
+        ])
+        self.assertEqual(categorize("pu_medic"), "first")
+        self.assertEqual(categorize("npc_medic"), "short")
+        self.assertEqual(categorize("xeno_medic"), "uncategorized")
+        self.assertEqual(categorize("abc"), "pair")
+        self.assertEqual(categorize("ab_c"), "uncategorized")
+        self.assertEqual(npc_handler.compile_category_rules([])("anything"), "uncategorized")
+        # Regeln aus der Datei dürfen Großbuchstaben enthalten, verglichen wird in Kleinbuchstaben
+        categorize = npc_handler.compile_category_rules([{"category": "Pirate", "prefixes": ["PU_"], "any": ["Mystery"]}])
+        self.assertEqual(categorize("pu_mystery_being"), "pirate")
+        for rule in ({"category": "x", "any": [1]}, {"category": None}, {"category": "x", "anyof": ["a"]},
+                     {"category": "x", "all": "abc"}, {"category": "x", "any": [""]}, {"category": " "}):
+            with self.assertRaises(ValueError):
+                npc_handler.compile_category_rules([rule])
+
+
+class TestCategoryRuleFile(unittest.TestCase):
+    """Testklasse für die externe Regeldatei"""
+
+    def setUp(self):
+        """Temporäre DB und Regeldatei anlegen"""
+        self.original_db_folder = config.DB_FOLDER
+        self.original_player_name = config.CURRENT_PLAYER_NAME
+        self.original_rules_file = config.NPC_RULES_FILE
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config.DB_FOLDER = self.temp_dir.name
+        config.CURRENT_PLAYER_NAME = "Test_Player"
+        config.NPC_RULES_FILE = os.path.join(self.temp_dir.name, "npc_rules.json")
+        database.init_db()
+
+    def tearDown(self):
+        """Eingebaute Regeln wiederherstellen, Testumgebung bereinigen"""
+        npc_handler.apply_category_rules(npc_handler.CATEGORY_RULES)
+        npc_handler._applied_rules.clear()
+        config.DB_FOLDER = self.original_db_folder
+        config.CURRENT_PLAYER_NAME = self.original_player_name
+        config.NPC_RULES_FILE = self.original_rules_file
+        database.close_db()
+        self.temp_dir.cleanup()
+
+    def write_rules(self, rules):
+        with open(config.NPC_RULES_FILE, "w", encoding="utf-8") as f:
+            json.dump({"rules": rules}, f)
+
+    def test_reload_updates_only_changed_categories(self):
+        """Test: Geänderte Regeln werden übernommen, ohne die kills-Tabelle zu durchsuchen"""
+        log_processor.commit_ingest_batch([
+            ("2025-03-01 12:00:00", "PU_Mystery_Being_7", "Test_Player", "Zone", "Weapon", "Class", "Bullet"),
+            ("2025-03-01 12:00:01", "Test_Player", "PU_Pirate_Gunner_3", "Zone", "Weapon", "Class", "Bullet"),
+            ("2025-03-01 12:00:02", "NPC_Archetypes_Foo_3", "Test_Player", "Zone", "Weapon", "Class", "Bullet"),
+            ("2025-03-01 12:00:03", "PU_Custom_Thing", "Test_Player", "Zone", "Weapon", "Class", "Bullet"),
+            ("2025-03-01 12:00:04", "Enemy_Player", "Test_Player", "Zone", "Weapon", "Class", "Bullet"),
+        ], [])
+        database.execute_query("UPDATE npc_categories SET category='pilot' WHERE npc_name='pu_custom_thing'")
+        npc_handler.update_kill_categories(["pu_custom_thing"])
+
+        # Fehlende Regeldatei wird mit den eingebauten Regeln angelegt, ohne etwas zu ändern:
+        # der Import hat die DB bereits mit den aktiven Regeln abgeglichen
+        self.assertFalse(npc_handler.reload_category_rules(), "Unveränderte Regeln sollten nicht erneut angewendet werden")
+        self.assertEqual(npc_handler.load_category_rules(), npc_handler.CATEGORY_RULES)
+
+        self.write_rules([
+            {"category": "pirate", "any": ["mystery"]},
+            {"category": "technical", "any": ["gunner"]},
+            {"category": "civilian", "all": ["npc_archetypes", "foo"]},
+            {"category": "ground", "any": ["thing"]},
+        ] + npc_handler.CATEGORY_RULES)
+        statements = []
+        conn = database._get_connection("trace")
+        conn.set_trace_callback(statements.append)
+        try:
+            self.assertTrue(npc_handler.reload_category_rules())
+        finally:
+            conn.set_trace_callback(None)
+        self.assertFalse([s for s in statements if "FROM kills" in s or "FROM  kills" in s])
+
+        npcs = dict(database.fetch_query("SELECT npc_name, category FROM npc_categories"))
+        self.assertEqual(npcs["pu_mystery_being"], "pirate")
+        self.assertEqual(npcs["pu_pirate_gunner"], "technical")
+        self.assertEqual(npcs["pu_custom_thing"], "pilot", "Von Hand gesetzte Kategorie wurde überschrieben")
+        categories = dict(database.fetch_query("SELECT opponent_name, opponent_category FROM kills"))
+        self.assertEqual(categories, {
+            "PU_Mystery_Being": "npc_pirate", "PU_Pirate_Gunner": "npc_technical",
+            "NPC_Archetypes_Foo": "npc_civilian", "PU_Custom_Thing": "npc_pilot", "Enemy_Player": "players",
+        })
+        self.assertIn("NPC Pirate Kills: 1", stats.get_stats()[0])
+
+        # Ungültige Regeldatei: Fehler wird protokolliert, die aktiven Regeln bleiben
+        self.write_rules([{"category": "x", "any": "not a list"}])
+        self.assertFalse(npc_handler.reload_category_rules())
+        with open(config.NPC_RULES_FILE, "w", encoding="utf-8") as f:
+            f.write("{ kein json")
+        self.assertFalse(npc_handler.reload_category_rules())
+        self.assertEqual(npc_handler.auto_categorize_npc("PU_Mystery_Being_8"), "pirate")
+
+    def test_ingest_refreshes_categories_after_reload(self):
+        """Test: Nach einem Neuladen für eine andere Spieler-DB gleicht der nächste Import die gespeicherten Kategorien ab"""
+        kill = ("2025-03-01 12:00:00", "PU_Mystery_Being_7", "Test_Player", "Zone", "Weapon", "Class", "Bullet")
+        log_processor.commit_ingest_batch([kill], [])
+        self.assertEqual(npc_handler.get_npc_category("pu_mystery_being"), "uncategorized")
+
+        config.CURRENT_PLAYER_NAME = "Other_Player"
+        database.init_db()
+        self.write_rules([{"category": "pirate", "any": ["mystery"]}] + npc_handler.CATEGORY_RULES)
+        self.assertTrue(npc_handler.reload_category_rules())
+
+        config.CURRENT_PLAYER_NAME = "Test_Player"
+        log_processor.commit_ingest_batch([kill[:1] + ("Enemy_Player",) + kill[2:]], [])
+        self.assertEqual(npc_handler.get_npc_category("pu_mystery_being"), "pirate")
+        self.assertEqual(database.fetch_query("SELECT opponent_category FROM kills WHERE opponent_name = 'PU_Mystery_Being'"),
+                         [("npc_pirate",)])
+
+    def test_reload_during_ingest(self):
+        """Test: Ein Neuladen während eines Imports übernimmt auch die mit den alten Regeln gespeicherten NPCs"""
+        self.assertTrue(npc_handler.reload_category_rules())
+        self.assertEqual(npc_handler.auto_categorize_npc("PU_Mystery_Being"), "uncategorized")
+        self.write_rules([{"category": "pirate", "any": ["MYSTERY"]}] + npc_handler.CATEGORY_RULES)
+
+        with database.transaction() as cursor:
+            reload = threading.Thread(target=npc_handler.reload_category_rules)
+            reload.start()
+            reload.join(0.2)
+            self.assertTrue(reload.is_alive(), "Das Neuladen sollte auf die Schreibsperre des Imports warten")
+            self.assertEqual(npc_handler.categorize_npcs(["PU_Mystery_Being_1"], cursor),
+                             {"pu_mystery_being": "uncategorized"})
+        reload.join()
+
+        self.assertEqual(npc_handler.get_npc_category("pu_mystery_being"), "pirate")
+        self.assertEqual(npc_handler.auto_categorize_npc("PU_Mystery_Being_2"), "pirate")
+
+
+if __name__ == "__main__":
+    unittest.main()
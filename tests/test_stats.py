@@ -0,0 +1,243 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Pfad zum Projektverzeichnis hinzufügen, damit die Module importiert werden können
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+import config
+import log_processor
+import npc_handler
+import stats
+
+
+class TestStats(unittest.TestCase):
+    """Testklasse für die Statistik-Berechnung"""
+
+    def setUp(self):
+        """Temporäre DB anlegen"""
+        self.original_db_folder = config.DB_FOLDER
+        self.original_player_name = config.CURRENT_PLAYER_NAME
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config.DB_FOLDER = self.temp_dir.name
+        config.CURRENT_PLAYER_NAME = "Test_Player"
+        database.init_db()
+
+    def tearDown(self):
+        """Testumgebung bereinigen"""
+        config.DB_FOLDER = self.original_db_folder
+        config.CURRENT_PLAYER_NAME = self.original_player_name
+        database.close_db()
+        self.temp_dir.cleanup()
+
+    def ingest(self, rows):
+        """Speichert (timestamp, killed_player, killer) über den normalen Importweg."""
+        log_processor.commit_ingest_batch(
+            [(ts, victim, killer, "Zone", "Weapon", "Class", f"Bullet{n}") for n, (ts, victim, killer) in enumerate(rows)],
+            []
+        )
+        return rows
+
+    def test_category_counts_match_row_classification(self):
+        """Test: Die Aggregation in SQL liefert dieselben Zahlen wie die Einordnung pro Zeile"""
+        opponents = [
+            "Enemy_Player", "Player123", "player_2024", "Unknown", "unknown_42",
+            "PU_Human_Enemy_GroundCombat_NPC_Pilot_12345", "PU_Human_Enemy_GroundCombat_NPC_Pilot_99",
+            "PU_Pilots_Human_Criminal_Gunner_Light_777", "PU_Some_New_NPC_1_2", "Hangar_Unknown_Turret_3",
+            "NPC_Archetypes_Soldier_5", "vlk_juvenile_sentry_123", "Kopion_Headhunter_8", " PU_Spaced_Name_12 ",
+        ]
+        rows = []
+        for i, opponent in enumerate(opponents):
+            rows += [(f"2025-03-01 12:00:{i:02d}", opponent, "Test_Player")] * (i + 1)
+            rows += [(f"2025-03-02 12:00:{i:02d}", "test_player", opponent)] * (i % 3 + 1)
+        rows += [("2025-03-03 12:00:00", "TEST_PLAYER", "Test_Player")] * 4
+        rows += [("2025-03-03 12:00:01", "Someone", "Else")] * 2
+        self.ingest(rows)
+
+        counts, suicides = stats._get_category_counts("", [])
+        result = {(direction, category): count for direction, category, count in counts}
+
+        npc_dict = npc_handler.load_all_npc_categories()
+        expected = {}
+        for _, victim, killer in rows:
+            direction, _, category = npc_handler.resolve_opponent(killer, victim, "test_player", npc_dict)
+            if direction in ("kill", "death"):
+                expected[(direction, category)] = expected.get((direction, category), 0) + 1
+        self.assertEqual(result, expected)
+        self.assertEqual(suicides, 4)
+        self.assertEqual(result[("kill", "npc_pilot")], 6 + 7 + 8)
+        self.assertEqual(result[("death", "unknown")], 1 + 2 + 1)
+        self.assertEqual(result[("kill", "npc_ground")], 11)
+
+        stats_text, recent_events = stats.get_stats()
+        self.assertIn(f"Total Kills (filtered): {sum(c for (d, _), c in result.items() if d == 'kill')}", stats_text)
+        self.assertIn("Suicides: 4", stats_text)
+        # Der Kills Breakdown ergibt die Summe, auch mit Kills an "unknown"
+        self.assertEqual(result[("kill", "unknown")], 4 + 5 + 10)
+        breakdown = stats_text.split("Kills Breakdown:\n")[1].split("\n\n")[0]
+        self.assertEqual(sum(int(line.rsplit(": ", 1)[1]) for line in breakdown.splitlines()),
+                         sum(c for (d, _), c in result.items() if d == 'kill'))
+        self.assertTrue(recent_events)
+        self.assertNotIn("Someone", {name for ev in recent_events for name in (ev.killer, ev.killed_player)})
+
+    def test_leaderboards_and_filters(self):
+        """Test: Leaderboards fassen NPC-IDs zusammen und beachten die Entity-Filter"""
+        rows = [(f"2025-03-01 12:00:{i:02d}", f"PU_Pilots_Human_Criminal_Pilot_Light_{i}", "Test_Player") for i in range(5)]
+        rows += [(f"2025-03-01 12:01:{i:02d}", "Enemy_Player", "Test_Player") for i in range(3)]
+        rows += [(f"2025-03-01 12:02:{i:02d}", "Test_Player", "Enemy_Player") for i in range(2)]
+        self.ingest(rows)
+
+        kills, deaths = stats.get_leaderboards()
+        self.assertEqual(kills, [("PU_Pilots_Human_Criminal_Pilot_Light", 5), ("Enemy_Player", 3)])
+        self.assertEqual(deaths, [("Enemy_Player", 2)])
+
+        kills, _ = stats.get_leaderboards(entity_filters={"npc_pilot": False})
+        self.assertEqual(kills, [("Enemy_Player", 3)])
+        recent = stats.get_recent_kill_events(entity_filters={"players": False})
+        self.assertNotIn("Enemy_Player", recent)
+        self.assertEqual(recent.count("Killed: PU_Pilots_Human_Criminal_Pilot_Light\n"), 5)
+
+    def test_leaderboard_pages(self):
+        """Test: Leaderboards liefern Top-K und blättern über offset ohne Überschneidungen"""
+        rows = [(f"2025-03-01 12:{i:02d}:{j:02d}", f"Player_{chr(65 + i)}", "Test_Player")
+                for i in range(25) for j in range(i % 4 + 1)]
+        self.ingest(rows)
+
+        full, _ = stats.get_leaderboards(limit=-1)
+        self.assertEqual(len(full), 25)
+        self.assertEqual(len(stats.get_leaderboards()[0]), stats.LEADERBOARD_SIZE)
+        pages = [stats.get_leaderboards(limit=7, offset=offset)[0] for offset in range(0, 25, 7)]
+        self.assertEqual([entry for page in pages for entry in page], full)
+        self.assertEqual(full[0][1], 4)
+        self.assertEqual(stats.get_leaderboards(limit=7, offset=25), ([], []))
+
+    def test_recent_events_keyset_pages(self):
+        """Test: Recent Events blättern über (timestamp, id) lückenlos, Filter wirken in der Abfrage"""
+        # Gleiche Zeitstempel über Seitengrenzen hinweg, dazwischen ausgefilterte Spieler-Events
+        rows = [(f"2025-03-01 12:00:{i // 3:02d}", f"PU_Pilots_Human_Criminal_Pilot_Light_{i}", "Test_Player") for i in range(30)]
+        rows += [(f"2025-03-01 12:00:{i:02d}", "Enemy_Player", "Test_Player") for i in range(10)]
+        self.ingest(rows)
+        filters = {"players": False}
+
+        pages, before = [], None
+        while True:
+            page = stats.get_recent_events(entity_filters=filters, limit=7, before=before)
+            if not page:
+                break
+            self.assertTrue(all(isinstance(ev, stats.KillEvent) for ev in page))
+            pages.append(page)
+            before = page[-1].key
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 7, 2])
+
+        events = [ev for page in pages for ev in page]
+        self.assertEqual(len({ev.id for ev in events}), 30)
+        self.assertEqual([ev.key for ev in events], sorted((ev.key for ev in events), reverse=True))
+        self.assertEqual({ev.killed_player for ev in events}, {"PU_Pilots_Human_Criminal_Pilot_Light"})
+        self.assertEqual(events[:7], stats.get_stats(entity_filters=filters)[1][:7])
+
+        # Nur Events nach dem neuesten angezeigten, auch bei gleichem Zeitstempel
+        newest = events[0]
+        self.assertEqual(stats.get_recent_events(entity_filters=filters, after=newest.key), [])
+        self.ingest([(newest.timestamp, "PU_Pilots_Human_Criminal_Pilot_Light_99", "Test_Player"),
+                     ("2025-03-01 11:00:00", "PU_Pilots_Human_Criminal_Pilot_Light_98", "Test_Player")])
+        new_events = stats.get_recent_events(entity_filters=filters, after=newest.key)
+        self.assertEqual([ev.timestamp for ev in new_events], [newest.timestamp])
+        self.assertGreater(new_events[0].id, newest.id)
+
+        # Die Textdarstellung bleibt erhalten
+        recent = stats.get_recent_kill_events(entity_filters=filters)
+        self.assertEqual(recent, "".join(
+            stats.format_kill_event(ev) for ev in stats.get_recent_events(entity_filters=filters)
+        ))
+
+    def test_category_change_updates_kills(self):
+        """Test: Eine geänderte NPC-Kategorie wird auf gespeicherte Kills übertragen"""
+        self.ingest([("2025-03-01 12:00:00", "PU_Mystery_Being_7", "Test_Player")])
+        self.assertEqual(stats._get_category_counts("", [])[0], [("kill", "npc_uncategorized", 1)])
+
+        database.execute_query("UPDATE npc_categories SET category='pirate' WHERE npc_name='pu_mystery_being'")
+        npc_handler.update_kill_categories(["pu_mystery_being"])
+        self.assertEqual(stats._get_category_counts("", [])[0], [("kill", "npc_pirate", 1)])
+
+    def test_rollups_match_raw_counts(self):
+        """Test: Tagessummen liefern für ganze Tage dieselben Zahlen wie die kills-Zeilen"""
+        rows = []
+        for day in range(1, 6):
+            for i in range(day * 3):
+                rows.append((f"2025-03-{day:02d}T{i:02d}:00:00.000Z", f"Enemy_{i % 4}", "Test_Player"))
+                rows.append((f"2025-03-{day:02d} {i:02d}:30:00", "Test_Player", f"PU_Pirate_Gunner_{i}"))
+            rows.append((f"2025-03-{day:02d} 23:59:59", "Test_Player", "Test_Player"))
+        self.ingest(rows)
+        # Erneut importierte Events werden ignoriert und dürfen nicht doppelt zählen
+        self.ingest(rows[:10])
+
+        start, end = datetime(2025, 3, 2), datetime(2025, 3, 5)
+        for bounds in ((None, None), (start, None), (None, end), (start, end)):
+            date_filter, params, from_rollup = stats._date_filter(*bounds)
+            self.assertTrue(from_rollup)
+            # Gleicher Zeitraum als Filter auf die Zeitstempel der kills-Zeilen
+            raw_filter = date_filter.replace("day", "timestamp")
+            raw_params = [p + " 00:00:00" for p in params]
+            raw = stats._get_category_counts(raw_filter, raw_params, from_rollup=False)
+            self.assertEqual(sorted(stats._get_category_counts(date_filter, params)[0]), sorted(raw[0]))
+            self.assertEqual(stats._get_category_counts(date_filter, params)[1], raw[1])
+            self.assertEqual(stats._get_leaderboard("kill", "", date_filter, params),
+                             stats._get_leaderboard("kill", "", raw_filter, raw_params, from_rollup=False))
+
+        # Ein Zeitpunkt innerhalb eines Tages fällt auf die kills-Zeilen zurück
+        self.assertFalse(stats._date_filter(datetime(2025, 3, 2, 12), None)[2])
+
+        # Kategorieänderungen und gelöschte Events werden in die Tagessummen übernommen
+        database.execute_query("UPDATE npc_categories SET category='ground' WHERE npc_name='pu_pirate_gunner'")
+        npc_handler.update_kill_categories(["pu_pirate_gunner"])
+        database.execute_query("DELETE FROM kills WHERE killed_player = 'Enemy_0'")
+        counts = dict(((d, c), n) for d, c, n in stats._get_category_counts("", [])[0])
+        raw = dict(((d, c), n) for d, c, n in stats._get_category_counts("", [], from_rollup=False)[0])
+        self.assertEqual(counts, raw)
+        self.assertEqual(counts[("death", "npc_ground")], 45)
+        self.assertNotIn(("death", "npc_gunner"), counts)
+
+        # Das Nachtragen der Migration ergibt dieselben Tagessummen wie die Trigger
+        self.ingest([("2025-03-01 08:00:00", "ENEMY_1", "Test_Player"), ("2025-03-01 09:00:00", "enemy_1", "Test_Player")])
+        query = ("SELECT day, direction, LOWER(opponent_name), opponent_category, kill_count FROM daily_opponent_counts "
+                 "ORDER BY day, direction, opponent_name, opponent_category")
+        expected = database.fetch_query(query)
+        with database.db_lock:
+            conn = database._get_connection("test migration")
+            conn.execute("BEGIN IMMEDIATE")
+            database._migrate_kill_rollups(conn, lambda *args: None)
+            conn.commit()
+        self.assertEqual(database.fetch_query(query), expected)
+
+    def test_result_cache(self):
+        """Test: Unveränderte Refreshes kommen aus dem Cache, neue Events werden sofort sichtbar"""
+        stats.clear_cache()
+        self.ingest([("2025-03-01 12:00:00", "Enemy_Player", "Test_Player")])
+        filters = {"players": True, "npc_pilot": False}
+        day = datetime(2025, 3, 1, 15, 30)
+
+        first = stats.get_stats(day, day, filters)
+        self.assertIn("Total Kills (filtered): 1", first[0])
+        # Gleicher Tag mit anderer Uhrzeit und neu erzeugtes Filter-Dict treffen denselben Eintrag
+        self.assertEqual(stats.get_stats(datetime(2025, 3, 1), day, dict(filters)), first)
+        info = stats.get_cache_info()["stats"]
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+        stats.get_leaderboards(day, day, filters)
+        kills, _ = stats.get_leaderboards(day, day, filters)
+        kills.append(("Modified", 1))
+        self.assertEqual(stats.get_leaderboards(day, day, filters)[0], [("Enemy_Player", 1)])
+        self.assertGreaterEqual(stats.get_cache_info()["leaderboards"].hits, 1)
+
+        # Ein Commit beim Import ändert den Datenstand und damit den Cache-Schlüssel
+        self.ingest([("2025-03-01 13:00:00", "Enemy_Player", "Test_Player")])
+        self.assertIn("Total Kills (filtered): 2", stats.get_stats(day, day, filters)[0])
+        self.assertEqual(stats.get_leaderboards(day, day, filters)[0], [("Enemy_Player", 2)])
+        self.assertEqual(stats.get_cache_info()["stats"].misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,8 +19,10 @@ class RefreshSettings:
     DEFAULT_INTERVAL = 30  # Geändert von 10 auf 30 Sekunden
     MIN_INTERVAL = 1
     MAX_INTERVAL = 10000
+    INGEST_POLL_MS = 200  # Abstand, in dem die GUI Benachrichtigungen über neue Events abholt
 
 class BoardSettings:
     KILL_BOARD_WIDTH = 400  # Standardbreite für das Kill Leaderboard
     RECENT_KILLS_WIDTH = 400  # Standardbreite für die Recent Kills-Anzeige
     STATISTICS_WIDTH = 400  # Standardbreite für die Statistiken
+    RECENT_EVENTS_CAP = 500  # Maximale Anzahl angezeigter Recent Kill Events nach neuen Events
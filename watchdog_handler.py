@@ -1,31 +1,73 @@
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import config
-import log_processor
+import ingest_worker
+import npc_handler
 import os
 
 class GameLogHandler(FileSystemEventHandler):
-    """Watches the Game.log for modifications or creation."""
+    """
+    Watches the Game.log for modifications or creation. The observer thread only hands the
+    path to the ingest worker, which coalesces bursts of events into one read.
+    """
+
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
 
     def on_modified(self, event):
         if event.is_directory:
             return
         if os.path.basename(event.src_path).lower() == config.GAME_LOG_FILENAME.lower():
-            log_processor.process_log_file(event.src_path)
+            self.worker.submit(event.src_path)
 
     def on_created(self, event):
         if event.is_directory:
             return
         if os.path.basename(event.src_path).lower() == config.GAME_LOG_FILENAME.lower():
-            log_processor.process_log_file(event.src_path)
+            self.worker.submit(event.src_path)
+
+class NpcRulesHandler(FileSystemEventHandler):
+    """Watches the NPC rule file (config.NPC_RULES_FILE) and reloads it on changes."""
+
+    def _reload_if_rules_file(self, path):
+        if os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(config.NPC_RULES_FILE)):
+            npc_handler.reload_category_rules()
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._reload_if_rules_file(event.src_path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._reload_if_rules_file(event.src_path)
+
+    def on_moved(self, event):
+        # Viele Editoren speichern über eine temporäre Datei, die anschließend umbenannt wird
+        if not event.is_directory:
+            self._reload_if_rules_file(event.dest_path)
+
+def start_rules_watchdog():
+    """Starts a watchdog observer on the folder of the NPC rule file and returns it."""
+    rules_folder = os.path.dirname(config.NPC_RULES_FILE)
+    if not os.path.isdir(rules_folder):
+        print("[WARNING] Folder of the NPC rule file does not exist.")
+        return None
+    observer = Observer()
+    observer.schedule(NpcRulesHandler(), rules_folder, recursive=False)
+    observer.start()
+    return observer
 
-def start_watchdog():
-    """Starts a watchdog observer on LIVE_FOLDER and returns it."""
+def start_watchdog(worker=None):
+    """
+    Starts a watchdog observer on LIVE_FOLDER and returns it. Changes are read by worker
+    (default: the shared ingest_worker.get_worker()).
+    """
     if not os.path.isdir(config.LIVE_FOLDER):
         print("[WARNING] LIVE_FOLDER does not exist.")
         return None
     observer = Observer()
-    handler = GameLogHandler()
+    handler = GameLogHandler(worker or ingest_worker.get_worker())
     observer.schedule(handler, config.LIVE_FOLDER, recursive=False)
     observer.start()
     return observer